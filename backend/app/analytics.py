@@ -0,0 +1,123 @@
+"""
+Skill-Gap Analytics
+
+Every resume analysis bumps pre-aggregated counters
+(role x month bucket x missing skill), so cohort questions such as
+"which skills are most often missing for Data Analysts this month" are
+answered from a handful of keyed rows instead of re-running analyses.
+
+A synthetic "all" bucket is maintained alongside the monthly ones.
+"""
+from datetime import datetime
+from typing import Iterable, Optional
+
+from fastapi import APIRouter, Query
+
+from db.database import get_connection
+
+ALL_BUCKETS = "all"
+DEFAULT_ROLE = "General"
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+def time_bucket(ts: Optional[datetime] = None) -> str:
+    return (ts or datetime.utcnow()).strftime("%Y-%m")
+
+
+def normalize_role(role: Optional[str]) -> str:
+    role = (role or "").strip()
+    return role or DEFAULT_ROLE
+
+
+# ---------------- UPDATE ----------------
+def record_analysis(role: str, missing: Iterable[str], ts: Optional[datetime] = None):
+    """Fold one analysis into the aggregates."""
+    role = normalize_role(role)
+    buckets = (time_bucket(ts), ALL_BUCKETS)
+    missing = list(missing)
+
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.executemany(
+            """
+            INSERT INTO analysis_counts (role, bucket, total) VALUES (?, ?, 1)
+            ON CONFLICT (role, bucket) DO UPDATE SET total = total + 1
+            """,
+            [(role, b) for b in buckets],
+        )
+        cur.executemany(
+            """
+            INSERT INTO skill_gap_counts (role, bucket, skill, missing) VALUES (?, ?, ?, 1)
+            ON CONFLICT (role, bucket, skill) DO UPDATE SET missing = missing + 1
+            """,
+            [(role, b, skill) for b in buckets for skill in missing],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# ---------------- QUERIES ----------------
+def cohort_gaps(role: str, bucket: str = ALL_BUCKETS, limit: int = 10) -> dict:
+    role = normalize_role(role)
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT total FROM analysis_counts WHERE role = ? AND bucket = ?",
+            (role, bucket),
+        )
+        row = cur.fetchone()
+        total = row["total"] if row else 0
+
+        cur.execute(
+            """
+            SELECT skill, missing FROM skill_gap_counts
+            WHERE role = ? AND bucket = ?
+            ORDER BY missing DESC, skill
+            LIMIT ?
+            """,
+            (role, bucket, limit),
+        )
+        gaps = [
+            {
+                "skill": r["skill"],
+                "missing": r["missing"],
+                "rate": round(r["missing"] / total, 4) if total else 0.0
+            }
+            for r in cur.fetchall()
+        ]
+    finally:
+        conn.close()
+
+    return {"role": role, "bucket": bucket, "analyses": total, "gaps": gaps}
+
+
+def list_roles(bucket: str = ALL_BUCKETS) -> list:
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT role, total FROM analysis_counts WHERE bucket = ? ORDER BY total DESC, role",
+            (bucket,),
+        )
+        return [{"role": r["role"], "analyses": r["total"]} for r in cur.fetchall()]
+    finally:
+        conn.close()
+
+
+# ---------------- ROUTES ----------------
+@router.get("/gaps")
+def gaps(
+    role: str = Query(DEFAULT_ROLE),
+    bucket: str = Query(ALL_BUCKETS, description="YYYY-MM or 'all'"),
+    limit: int = Query(10, ge=1, le=100)
+):
+    return cohort_gaps(role, bucket, limit)
+
+
+@router.get("/roles")
+def roles(bucket: str = Query(ALL_BUCKETS)):
+    return {"bucket": bucket, "roles": list_roles(bucket)}
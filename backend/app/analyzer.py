@@ -1,7 +1,9 @@
-from fastapi import APIRouter, UploadFile, File, Form
-from .resume_parser import parse_resume, save_uploaded_file
-from .jd_parser import extract_jd_skills
-from .scorer import compute_score
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from .resume_parser import parse_resume_structured, save_uploaded_stream
+from .jd_profiles import register_jd, get_profile
+from .rescoring import extract_features, score_features, record_result
+from .analytics import record_analysis, DEFAULT_ROLE
 
 router = APIRouter(prefix="/analyze", tags=["Resume Analysis"])
 
@@ -9,38 +11,46 @@ router = APIRouter(prefix="/analyze", tags=["Resume Analysis"])
 @router.post("/resume/analyze")
 async def analyze_resume(
     file: UploadFile = File(...),
-    job_description: str = Form(...)
+    job_description: str = Form(None),
+    jd_id: str = Form(None),
+    role: str = Form(DEFAULT_ROLE),
+    semantic_budget_ms: float = Form(0)
 ):
+    # 0️⃣ Resolve the JD profile (registered id, or ad-hoc text, which is
+    #    registered too so the analysis can be re-scored later)
+    if jd_id:
+        profile = await run_in_threadpool(get_profile, jd_id)
+        if profile is None:
+            raise HTTPException(status_code=404, detail="Unknown jd_id")
+    elif job_description:
+        profile = await run_in_threadpool(register_jd, job_description)
+    else:
+        raise HTTPException(status_code=400, detail="Provide job_description or jd_id")
+
     # 1️⃣ Save uploaded resume
-    contents = await file.read()
-    saved_filename = save_uploaded_file(contents, file.filename)
-
-    # 2️⃣ Parse saved resume (CORRECT usage)
-    parsed = parse_resume(saved_filename)
-
-    resume_text = parsed.get("text", "")
-    resume_skills = set(parsed.get("skills", []))
-
-    # 3️⃣ Parse JD
-    jd_skills = extract_jd_skills(job_description)
-    jd_skill_names = {s["skill"] for s in jd_skills}
-
-    matched = sorted(resume_skills & jd_skill_names)
-    missing = sorted(jd_skill_names - resume_skills)
-
-    # 4️⃣ Score
-    breakdown, total_score = compute_score(
-        jd_skills=jd_skills,
-        matched=matched,
-        missing=missing,
-        resume_text=resume_text,
-        jd_text=job_description
-        )
-
-
-    return {
-        "total_score": total_score,
-        "breakdown": breakdown,
-        "matched_skills": matched,
-        "missing_skills": missing
-    }
+    saved_filename = await run_in_threadpool(save_uploaded_stream, file.file, file.filename)
+
+    # 2️⃣ Parse saved resume into its compact form (off the event loop, so
+    #    concurrent uploads of the same file coalesce on one extraction)
+    parsed = await run_in_threadpool(parse_resume_structured, saved_filename, semantic_budget_ms)
+
+    # 3️⃣-5️⃣ Score and persist; these hit SQLite, so also off the loop
+    return await run_in_threadpool(_score_and_record, saved_filename, parsed, profile, role)
+
+
+def _score_and_record(resume_id: str, parsed, profile, role: str) -> dict:
+    # 3️⃣ Reduce to weight-independent features, then 4️⃣ score them
+    features = extract_features(parsed.skills, parsed.raw_text, profile)
+    result = score_features(parsed.skills, features, profile, parsed.spans)
+
+    # 5️⃣ Persist the features (for re-scoring) and fold the gaps into
+    #    cohort analytics
+    result["analysis_id"] = record_result(resume_id, profile.jd_id, role, features, result)
+    record_analysis(role, result["missing_skills"])
+
+    return result
+
+
+def score_resume(resume_skills, resume_text, profile) -> dict:
+    """Match and score one parsed resume against a JD profile."""
+    return score_features(resume_skills, extract_features(resume_skills, resume_text, profile), profile)
@@ -1,5 +1,12 @@
-from fastapi import APIRouter, Form
-from app.llm_client import generate_aptitude_questions
+from fastapi import APIRouter, Depends, Form, HTTPException
+from app.auth import get_current_user, optional_user
+from app.llm_client import generate_aptitude_questions, evaluate_answer, evaluate_answers_batch
+from app.grading import grade_submission, public_question, topic_stats
+from app.models import BatchEvaluateRequest, MCQSubmission, QuizSessionStart, QuizAnswer
+from app.quiz_sessions import start_session, get_session, answer_question, SessionConflict, SessionGone
+
+MAX_BATCH_ITEMS = 100
+MAX_SUBMISSION_ANSWERS = 200
 
 router = APIRouter(prefix="/aptitude", tags=["Aptitude"])
 @router.post("/questions")
@@ -7,4 +14,77 @@ def aptitude_questions(
     topic: str = Form("ALL"),
     count: int = Form(25)
 ):
-    return generate_aptitude_questions(topic, count)
+    result = generate_aptitude_questions(topic, count)
+    # Answer keys stay server-side; clients grade through /submit
+    return {**result, "questions": [public_question(q) for q in result.get("questions", [])]}
+
+
+@router.post("/evaluate")
+def aptitude_evaluate(
+    question: str = Form(...),
+    answer: str = Form(...)
+):
+    return evaluate_answer(answer, question)
+
+
+@router.post("/evaluate/batch")
+def aptitude_evaluate_batch(req: BatchEvaluateRequest):
+    if len(req.items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_ITEMS} items per batch")
+    return evaluate_answers_batch([item.model_dump() for item in req.items])
+
+
+@router.post("/submit")
+def aptitude_submit(submission: MCQSubmission, user: str = Depends(optional_user)):
+    """Grade an MCQ quiz locally against the served answer keys."""
+    if len(submission.answers) > MAX_SUBMISSION_ANSWERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SUBMISSION_ANSWERS} answers per submission")
+    return grade_submission(
+        [a.model_dump() for a in submission.answers],
+        user=user
+    )
+
+
+@router.get("/stats")
+def aptitude_stats(user: str = Depends(get_current_user)):
+    """The signed-in user's per-topic accuracy."""
+    return {"user": user, "topics": topic_stats(user)}
+
+
+@router.get("/stats/overall")
+def aptitude_stats_overall():
+    """Per-topic accuracy across all users (aggregates only)."""
+    return {"topics": topic_stats()}
+
+
+@router.post("/session")
+def aptitude_session_start(req: QuizSessionStart, user: str = Depends(optional_user)):
+    """Start a server-side adaptive quiz; the response carries the first question."""
+    try:
+        return start_session(user, req.topic, req.length, req.level)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No questions for topic {req.topic!r}")
+
+
+@router.get("/session/{session_id}")
+def aptitude_session(session_id: str):
+    try:
+        session = get_session(session_id)
+    except SessionGone as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown session")
+    return session
+
+
+@router.post("/session/{session_id}/answer")
+def aptitude_session_answer(session_id: str, req: QuizAnswer):
+    try:
+        session = answer_question(session_id, req.selected_index)
+    except SessionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except SessionGone as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown session")
+    return session
@@ -0,0 +1,217 @@
+"""
+Bulk Cohort Screening
+
+Screens a ZIP of resumes against one or more JDs in a single request.
+
+- The archive is read entry by entry from the spooled upload; each entry
+  is streamed into the blob store, so nothing is unpacked into memory
+- Entries are deduplicated by content hash within the archive
+- Text extraction runs in a process pool (existing resume_parser
+  extractors) with a bounded number of files in flight
+- Results stream back as NDJSON (default) or CSV rows as soon as each
+  resume is scored; an entry that cannot be read becomes an error row
+- Archives with more than BULK_MAX_FILES resumes are rejected up front
+"""
+import csv
+import io
+import json
+import logging
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.responses import StreamingResponse
+
+from . import extractors, storage
+from .analytics import record_analysis, DEFAULT_ROLE
+from .jd_profiles import register_jd
+from .rescoring import extract_features, record_result, score_features
+from .resume_parser import parse_resume
+from .skill_registry import SkillSet
+
+logger = logging.getLogger(__name__)
+
+# ---------------- CONFIG ----------------
+BULK_WORKERS = int(os.getenv("BULK_WORKERS", str(os.cpu_count() or 2)))
+BULK_MAX_FILES = int(os.getenv("BULK_MAX_FILES", "2000"))
+BULK_MAX_FILE_BYTES = int(os.getenv("BULK_MAX_FILE_BYTES", str(10 * 1024 * 1024)))
+SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".doc", ".txt"}
+
+CSV_COLUMNS = [
+    "file", "resume_id", "jd_id", "title", "total_score",
+    "matched_skills", "missing_skills", "duplicate_of", "error"
+]
+
+router = APIRouter(prefix="/bulk", tags=["Bulk Screening"])
+
+_pool = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # Forking a threaded server can copy held locks into the child
+        _pool = ProcessPoolExecutor(
+            max_workers=BULK_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=extractors.mark_pool_worker,
+        )
+    return _pool
+
+
+def _parse_worker(resume_id: str):
+    """Runs in a pool process; returns plain data for the parent to score."""
+    parsed = parse_resume(resume_id)
+    return parsed["text"], parsed["skills"]
+
+
+# ---------------- INPUTS ----------------
+def _read_jds(jds_file, job_description, role):
+    """[(profile, role)] from the CSV (title, job_description[, role]) or one JD."""
+    jds = []
+    if jds_file is not None:
+        reader = csv.DictReader(io.TextIOWrapper(jds_file, encoding="utf-8-sig", errors="ignore"))
+        for row in reader:
+            text = (row.get("job_description") or row.get("description") or "").strip()
+            if text:
+                jds.append((register_jd(text, row.get("title") or None), row.get("role") or role))
+    elif job_description:
+        jds.append((register_jd(job_description), role))
+    return jds
+
+
+def _archive_entries(zf: zipfile.ZipFile):
+    for info in zf.infolist():
+        name = info.filename
+        base = Path(name).name
+        if info.is_dir() or not base or base.startswith(".") or name.startswith("__MACOSX/"):
+            continue
+        if Path(base).suffix.lower() not in SUPPORTED_EXTENSIONS:
+            continue
+        yield info
+
+
+def count_resumes(archive_file) -> int:
+    with zipfile.ZipFile(archive_file) as zf:
+        return sum(1 for _ in _archive_entries(zf))
+
+
+# ---------------- PIPELINE ----------------
+def screen_archive(archive_file, jds):
+    """Yield one result dict per (resume, JD), plus duplicate/error rows."""
+    pool = _get_pool()
+    window = BULK_WORKERS * 2
+    pending = {}
+    seen = {}
+
+    def drain(block_until_one: bool):
+        if not pending:
+            return
+        done, _ = wait(pending, return_when=FIRST_COMPLETED) if block_until_one else (
+            [f for f in pending if f.done()], None
+        )
+        for future in done:
+            name, resume_id = pending.pop(future)
+            try:
+                text, skills = future.result()
+            except Exception as e:
+                yield {"file": name, "resume_id": resume_id, "error": str(e) or type(e).__name__}
+                continue
+            skill_set = SkillSet.from_names(skills)
+            for profile, role in jds:
+                features = extract_features(skill_set, text, profile)
+                result = score_features(skill_set, features, profile)
+                # Stored like /analyze results, so rescoring covers them too
+                result["analysis_id"] = record_result(resume_id, profile.jd_id, role, features, result)
+                record_analysis(role, result["missing_skills"])
+                yield {
+                    "file": name,
+                    "resume_id": resume_id,
+                    "jd_id": profile.jd_id,
+                    "title": profile.title,
+                    **result
+                }
+
+    with zipfile.ZipFile(archive_file) as zf:
+        for info in _archive_entries(zf):
+            if info.file_size > BULK_MAX_FILE_BYTES:
+                yield {"file": info.filename, "error": "file too large"}
+                continue
+
+            try:
+                with zf.open(info) as entry:
+                    resume_id = storage.put_stream(entry, Path(info.filename).name)
+            except Exception as e:
+                # Corrupt, encrypted or unsupported entry: report it, keep going
+                logger.warning("bulk: unreadable archive entry %s", info.filename)
+                yield {"file": info.filename, "error": f"unreadable entry: {e or type(e).__name__}"}
+                continue
+
+            digest, _ = storage.split_resume_id(resume_id)
+            if digest in seen:
+                yield {"file": info.filename, "duplicate_of": seen[digest]}
+                continue
+            seen[digest] = info.filename
+
+            pending[pool.submit(_parse_worker, resume_id)] = (info.filename, resume_id)
+            yield from drain(block_until_one=len(pending) >= window)
+
+    while pending:
+        yield from drain(block_until_one=True)
+
+
+# ---------------- OUTPUT ----------------
+def _ndjson_rows(rows):
+    for row in rows:
+        yield json.dumps(row) + "\n"
+
+
+def _csv_rows(rows):
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    for row in rows:
+        row = dict(row)
+        for key in ("matched_skills", "missing_skills"):
+            if key in row:
+                row[key] = ";".join(row[key])
+        writer.writerow(row)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+
+
+# ---------------- ROUTES ----------------
+@router.post("/screen")
+def bulk_screen(
+    archive: UploadFile = File(...),
+    jds: UploadFile = File(None),
+    job_description: str = Form(None),
+    role: str = Form(DEFAULT_ROLE),
+    format: str = Form("ndjson")
+):
+    """
+    Screen every resume in `archive` (ZIP) against each JD in `jds`
+    (CSV with title, job_description[, role] columns) or `job_description`.
+    """
+    profiles = _read_jds(jds.file if jds is not None else None, job_description, role)
+    if not profiles:
+        raise HTTPException(status_code=400, detail="Provide a JD CSV or job_description")
+    if not zipfile.is_zipfile(archive.file):
+        raise HTTPException(status_code=400, detail="archive must be a ZIP file")
+    archive.file.seek(0)
+    total = count_resumes(archive.file)
+    if total > BULK_MAX_FILES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"archive holds {total} resumes; at most {BULK_MAX_FILES} per request"
+        )
+    archive.file.seek(0)
+
+    rows = screen_archive(archive.file, profiles)
+    if format == "csv":
+        return StreamingResponse(_csv_rows(rows), media_type="text/csv")
+    return StreamingResponse(_ndjson_rows(rows), media_type="application/x-ndjson")
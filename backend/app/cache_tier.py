@@ -0,0 +1,239 @@
+"""
+Shared Cache Tier
+
+Two-level cache for values that are expensive to recompute and identical
+in every worker process: a small in-process LRU in front of one WAL-mode
+SQLite file shared by every uvicorn/gunicorn worker on the host.
+
+- Keys are namespaced SHA-256 digests of the canonical JSON of their
+  parts, so every process derives the same key (unlike hash())
+- Values are stored as JSON; entries may carry a TTL
+- The shared file is capped at CACHE_MAX_BYTES; least recently used
+  entries are evicted first
+- warm() preloads each namespace's most recently used entries into the
+  local LRU, so a restarted worker starts hot
+- CACHE_ENABLED=0 (or an unusable file) leaves just the local LRU
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# ---------------- CONFIG ----------------
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "1") == "1"
+CACHE_SQLITE_PATH = Path(os.getenv(
+    "CACHE_SQLITE_PATH",
+    Path(__file__).resolve().parent.parent / "db" / "cache.db"
+))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(256 << 20)))
+CACHE_MAX_ENTRY_BYTES = int(os.getenv("CACHE_MAX_ENTRY_BYTES", str(1 << 20)))
+CACHE_WARM_ENTRIES = int(os.getenv("CACHE_WARM_ENTRIES", "256"))
+
+# Shared-tier maintenance cadence
+_EVICT_EVERY_PUTS = 128
+_TOUCH_INTERVAL_SECONDS = 60.0
+_EVICT_TARGET = 0.9
+
+_MISSING = object()
+
+_tiers = {}
+
+
+def cache_key(namespace: str, *parts) -> str:
+    blob = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return f"{namespace}:{hashlib.sha256(blob.encode('utf-8')).hexdigest()}"
+
+
+# ---------------- SHARED TIER ----------------
+class SharedStore:
+    """Size-capped key/value table in one SQLite file, shared across processes."""
+
+    def __init__(self, path: Path = CACHE_SQLITE_PATH, max_bytes: int = CACHE_MAX_BYTES, clock=time.time):
+        self._clock = clock
+        self._path = str(path)
+        self._max_bytes = max_bytes
+        self._local = threading.local()
+        self._puts = 0
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires REAL,
+                last_access REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_access ON cache (last_access)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_namespace ON cache (namespace, last_access)")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=1.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str):
+        """Return (value, expires) or _MISSING."""
+        now = self._clock()
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT value, expires, last_access FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return _MISSING
+        value, expires, last_access = row
+        if expires is not None and expires <= now:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            return _MISSING
+        # Recency only needs to be coarse; skip a write on most hits
+        if now - last_access > _TOUCH_INTERVAL_SECONDS:
+            conn.execute("UPDATE cache SET last_access = ? WHERE key = ?", (now, key))
+        return json.loads(value), expires
+
+    def put(self, key: str, namespace: str, value, expires: Optional[float] = None):
+        encoded = json.dumps(value, separators=(",", ":"))
+        size = len(encoded)
+        if size > CACHE_MAX_ENTRY_BYTES:
+            return
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache (key, namespace, value, size, expires, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, namespace, encoded, size, expires, self._clock()),
+        )
+        self._puts += 1
+        if self._puts % _EVICT_EVERY_PUTS == 0:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then the least recently used down to 90% of the cap."""
+        conn = self._conn()
+        conn.execute("DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?", (self._clock(),))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        excess = total - int(self._max_bytes * _EVICT_TARGET)
+        freed = 0
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM cache ORDER BY last_access"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM cache WHERE key = ?", victims)
+
+    def recent(self, namespace: str, limit: int):
+        now = self._clock()
+        return [
+            (key, json.loads(value), expires)
+            for key, value, expires in self._conn().execute(
+                """
+                SELECT key, value, expires FROM cache
+                WHERE namespace = ? AND (expires IS NULL OR expires > ?)
+                ORDER BY last_access DESC LIMIT ?
+                """,
+                (namespace, now, limit),
+            )
+        ]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def _shared_store() -> Optional[SharedStore]:
+    global _store, CACHE_ENABLED
+    if not CACHE_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = SharedStore()
+            except sqlite3.Error:
+                logger.exception("shared cache unavailable; using in-process caches only")
+                CACHE_ENABLED = False
+        return _store
+
+
+# ---------------- TWO-LEVEL CACHE ----------------
+class TieredCache:
+    """In-process LRU of `local_size` entries backed by the shared store."""
+
+    def __init__(self, namespace: str, local_size: int, ttl: Optional[float] = None):
+        self.namespace = namespace
+        self.local_size = local_size
+        self.ttl = ttl
+        self._local: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        _tiers[namespace] = self
+
+    def key(self, *parts) -> str:
+        return cache_key(self.namespace, *parts)
+
+    def _remember(self, key: str, value, expires: Optional[float]):
+        with self._lock:
+            self._local[key] = (value, expires)
+            self._local.move_to_end(key)
+            if len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                if entry[1] is None or entry[1] > time.time():
+                    self._local.move_to_end(key)
+                    return entry[0]
+                del self._local[key]
+
+        store = _shared_store()
+        if store is not None:
+            try:
+                entry = store.get(key)
+            except sqlite3.Error:
+                entry = _MISSING
+            if entry is not _MISSING:
+                self._remember(key, *entry)
+                return entry[0]
+        return default
+
+    def put(self, key: str, value):
+        expires = time.time() + self.ttl if self.ttl else None
+        self._remember(key, value, expires)
+        store = _shared_store()
+        if store is not None:
+            try:
+                store.put(key, self.namespace, value, expires)
+            except sqlite3.Error:
+                logger.warning("shared cache write failed for %s", self.namespace)
+
+    def warm(self, limit: int = CACHE_WARM_ENTRIES) -> int:
+        store = _shared_store()
+        if store is None:
+            return 0
+        entries = store.recent(self.namespace, min(limit, self.local_size))
+        for key, value, expires in reversed(entries):
+            self._remember(key, value, expires)
+        return len(entries)
+
+
+def warm_all() -> dict:
+    """Preload every registered namespace from the shared tier."""
+    counts = {}
+    for namespace, tier in _tiers.items():
+        try:
+            counts[namespace] = tier.warm()
+        except sqlite3.Error:
+            counts[namespace] = 0
+    return counts
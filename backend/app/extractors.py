@@ -0,0 +1,267 @@
+"""
+Resume Text Extractors
+
+Pluggable registry of text extractors keyed by MIME type. The type is
+sniffed from the file's leading bytes, and the filename extension is only
+a fallback, so a renamed upload still goes to the right extractor.
+
+- application/pdf: pdfplumber; pages without a text layer are sent to
+  Tesseract OCR (when installed) in a process pool private to the
+  request, under one overall deadline; if a page overruns, only that
+  request's pool is killed, since a running task cannot be cancelled.
+  One request OCRs at a time, so at most OCR_WORKERS processes run
+- DOCX: python-docx
+- application/msword (.doc): antiword when installed, else a heuristic
+  scan of the Word binary for text runs
+- text/plain: decoded straight from the mapped bytes
+
+Register more with @register_extractor("<mime>"); an extractor takes
+(buf, path) and returns text.
+"""
+import codecs
+import io
+import logging
+import mimetypes
+import multiprocessing
+import os
+import re
+import shutil
+import subprocess
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict
+
+import pdfplumber
+from docx import Document
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # optional; ships with recent pdfplumber
+    pdfium = None
+
+logger = logging.getLogger(__name__)
+
+# ---------------- CONFIG ----------------
+OCR_ENABLED = os.getenv("OCR_ENABLED", "1") == "1"
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", "2"))
+OCR_PAGE_TIMEOUT_SECONDS = float(os.getenv("OCR_PAGE_TIMEOUT_SECONDS", "20"))
+OCR_MAX_PAGES = int(os.getenv("OCR_MAX_PAGES", "10"))
+OCR_DPI = int(os.getenv("OCR_DPI", "300"))
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+
+TESSERACT_BIN = shutil.which("tesseract")
+ANTIWORD_BIN = shutil.which("antiword")
+
+PDF = "application/pdf"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+DOC = "application/msword"
+TEXT = "text/plain"
+
+_OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+# Word 97+ stores body text as UTF-16LE or 8-bit runs inside the binary
+_UTF16_RUN_RE = re.compile(rb"(?:[\x20-\x7e\t\r\n]\x00){6,}")
+_BYTE_RUN_RE = re.compile(rb"[\x20-\x7e\t\r\n]{8,}")
+
+EXTRACTORS: Dict[str, Callable] = {}
+
+_ocr_lock = threading.Lock()
+
+# Set by mark_pool_worker() in processes started by our executors
+_in_pool_worker = False
+
+
+def register_extractor(mime: str):
+    def decorator(fn):
+        EXTRACTORS[mime] = fn
+        return fn
+    return decorator
+
+
+# ---------------- SNIFFING ----------------
+def sniff_mime(buf, filename: str = "") -> str:
+    head = bytes(buf[:8])
+    if head.startswith(b"%PDF-"):
+        return PDF
+    if head.startswith(_OLE_MAGIC):
+        return DOC
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(_MappedFile(buf)) as zf:
+                if "word/document.xml" in zf.namelist():
+                    return DOCX
+        except zipfile.BadZipFile:
+            pass
+
+    # Extension only picks among extractors registered without a sniffer;
+    # a ".pdf" or ".doc" that fails the checks above is read as text
+    guessed, _ = mimetypes.guess_type(filename or "")
+    if guessed in EXTRACTORS and guessed not in (PDF, DOCX, DOC):
+        return guessed
+    return TEXT
+
+
+def extract(buf, path: Path, filename: str = "") -> str:
+    """Extract text from an upload's bytes (`buf`, usually an mmap) at `path`."""
+    if not len(buf):
+        return ""
+    mime = sniff_mime(buf, filename or str(path))
+    return EXTRACTORS.get(mime, extract_plain_text)(buf, path)
+
+
+# ---------------- EXTRACTORS ----------------
+class _MappedFile:
+    """mmap view for readers (zipfile) that also want seekable()."""
+    __slots__ = ("_buf",)
+
+    def __init__(self, buf):
+        self._buf = buf if hasattr(buf, "seek") else io.BytesIO(buf)
+
+    def __getattr__(self, name):
+        return getattr(self._buf, name)
+
+    def seekable(self):
+        return True
+
+
+@register_extractor(TEXT)
+def extract_plain_text(buf, path=None) -> str:
+    # Decodes straight out of the mapped pages; no intermediate bytes copy
+    return codecs.decode(memoryview(buf), "utf-8", "ignore")
+
+
+@register_extractor(DOCX)
+def extract_docx(buf, path=None) -> str:
+    if hasattr(buf, "seek"):
+        buf.seek(0)
+    doc = Document(_MappedFile(buf))
+    return "\n".join(p.text for p in doc.paragraphs if p.text)
+
+
+@register_extractor(DOC)
+def extract_doc(buf, path=None) -> str:
+    if ANTIWORD_BIN and path is not None:
+        try:
+            out = subprocess.run(
+                [ANTIWORD_BIN, "-w", "0", str(path)],
+                capture_output=True, timeout=OCR_PAGE_TIMEOUT_SECONDS, check=True,
+            )
+            return out.stdout.decode("utf-8", "ignore")
+        except (subprocess.SubprocessError, OSError):
+            logger.warning("antiword failed on %s; using heuristic .doc text scan", path)
+    return _doc_text_runs(bytes(buf))
+
+
+def _doc_text_runs(data: bytes) -> str:
+    wide = [m.group().decode("utf-16-le") for m in _UTF16_RUN_RE.finditer(data)]
+    if sum(map(len, wide)) >= 64:
+        runs = wide
+    else:
+        runs = [m.group().decode("latin-1") for m in _BYTE_RUN_RE.finditer(data)]
+    return "\n".join(run.strip() for run in runs if run.strip())
+
+
+@register_extractor(PDF)
+def extract_pdf(buf, path=None) -> str:
+    """`buf` is a path or a seekable buffer (e.g. the storage mmap)."""
+    pages = []
+    with pdfplumber.open(buf) as pdf:
+        for p in pdf.pages:
+            pages.append(p.extract_text() or "")
+
+    blank = [i for i, text in enumerate(pages) if not text.strip()]
+    if blank and path is not None and ocr_available():
+        for i, text in ocr_pages(path, blank[:OCR_MAX_PAGES]).items():
+            pages[i] = text
+
+    return "\n".join(text for text in pages if text)
+
+
+# ---------------- OCR ----------------
+def ocr_available() -> bool:
+    return OCR_ENABLED and TESSERACT_BIN is not None and pdfium is not None
+
+
+def _ocr_page(path: str, index: int) -> str:
+    """Render one PDF page and run Tesseract on it (runs in a pool worker)."""
+    pdf = pdfium.PdfDocument(path)
+    try:
+        image = pdf[index].render(scale=OCR_DPI / 72).to_pil()
+    finally:
+        pdf.close()
+
+    png = io.BytesIO()
+    image.save(png, format="PNG")
+    out = subprocess.run(
+        [TESSERACT_BIN, "stdin", "stdout", "-l", OCR_LANG],
+        input=png.getvalue(), capture_output=True,
+        timeout=OCR_PAGE_TIMEOUT_SECONDS, check=True,
+    )
+    return out.stdout.decode("utf-8", "ignore")
+
+
+def mark_pool_worker():
+    """ProcessPoolExecutor initializer: OCR runs inline in this process."""
+    global _in_pool_worker
+    _in_pool_worker = True
+
+
+def _run_with_deadline(fn, jobs, seconds_per_job) -> Dict:
+    """
+    Run fn(*args) for each {key: args} in a fresh spawn pool and return
+    {key: result} for the jobs that finished in time. The whole batch gets
+    one deadline: seconds_per_job for each round of OCR_WORKERS jobs.
+    Stragglers are killed with the pool, which no other caller shares.
+    """
+    workers = max(1, min(OCR_WORKERS, len(jobs)))
+    rounds = -(-len(jobs) // workers)
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=mark_pool_worker,
+    )
+    futures = {pool.submit(fn, *args): key for key, args in jobs.items()}
+    done, pending = wait(futures, timeout=seconds_per_job * rounds)
+
+    results = {}
+    for future in done:
+        try:
+            results[futures[future]] = future.result()
+        except Exception:
+            logger.warning("OCR failed on %s", futures[future])
+    if pending:
+        logger.warning("OCR timed out on %s", sorted(futures[f] for f in pending))
+        for proc in list((getattr(pool, "_processes", None) or {}).values()):
+            proc.kill()
+    pool.shutdown(wait=not pending, cancel_futures=True)
+    return results
+
+
+def ocr_pages(path: Path, indices) -> Dict[int, str]:
+    """
+    OCR the given page indices in parallel. Pages that fail or time out
+    are left out, so one bad scan never holds up the rest of the resume.
+    """
+    results = {}
+    if not indices:
+        return results
+
+    # Already inside one of our pool workers (e.g. bulk screening): OCR
+    # inline rather than nesting another pool per worker
+    if _in_pool_worker:
+        for i in indices:
+            try:
+                results[i] = _ocr_page(str(path), i)
+            except Exception:
+                logger.warning("OCR failed on page %d of %s", i, path)
+        return results
+
+    with _ocr_lock:
+        # Rendering gets the same allowance again on top of Tesseract's
+        pages = _run_with_deadline(
+            _ocr_page, {i: (str(path), i) for i in indices},
+            OCR_PAGE_TIMEOUT_SECONDS * 2,
+        )
+    return {i: pages[i] for i in indices if i in pages}
@@ -0,0 +1,221 @@
+"""
+MCQ Grading Engine
+
+Every question served by generate_aptitude_questions gets a stable id
+(hash of its topic and normalized stem) and its answer key is remembered
+here, so whole quiz submissions are graded locally without the LLM.
+
+- Answer keys: in-process dict, backed by SQLite for other workers/restarts
+- The full question is stored too, so served questions grow the bank the
+  quiz session engine draws from; a stem seen before is served with its
+  stored options, so the stored key always matches what the user sees
+- Answer keys never leave the server: routes serve public_question()
+- Per-topic accuracy: running counters per signed-in user ("" = anonymous)
+"""
+import hashlib
+import json
+from typing import Dict, List, Optional
+
+from db.database import get_connection
+
+# question_id -> (topic, correct_index, explanation)
+_answer_keys: Dict[str, tuple] = {}
+
+ANSWER_KEY_FIELDS = ("correct_index", "explanation")
+
+# Keeps each IN (...) lookup well under SQLite's bound-parameter limit
+_LOOKUP_CHUNK = 500
+
+
+def public_question(question: dict) -> dict:
+    """The question as served to clients, without its answer key."""
+    return {k: v for k, v in question.items() if k not in ANSWER_KEY_FIELDS}
+
+
+def question_id(question: dict) -> str:
+    raw = "\x1f".join([
+        question.get("topic", "").strip().lower(),
+        " ".join(question.get("question", "").lower().split())
+    ])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+# ---------------- ANSWER KEYS ----------------
+def register_questions(questions: List[dict]) -> List[dict]:
+    """
+    Stamp each question with its id and remember its answer key. A stem
+    that is already stored is rewritten to the stored options and key.
+    """
+    by_id: Dict[str, List[dict]] = {}
+    new_rows = []
+    for q in questions:
+        if not isinstance(q, dict) or "correct_index" not in q:
+            continue
+        try:
+            correct_index = int(q["correct_index"])
+        except (TypeError, ValueError):
+            continue
+        qid = question_id(q)
+        q["id"] = qid
+        if qid not in by_id:
+            body = {k: v for k, v in q.items() if k != "id"}
+            new_rows.append((qid, q.get("topic", ""), correct_index, q.get("explanation", ""),
+                             q.get("difficulty"), json.dumps(body)))
+        by_id.setdefault(qid, []).append(q)
+
+    if not new_rows:
+        return questions
+
+    stored = []
+    conn = get_connection()
+    try:
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO aptitude_questions
+                (question_id, topic, correct_index, explanation, difficulty, body)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            new_rows,
+        )
+        conn.commit()
+        ids = list(by_id)
+        for start in range(0, len(ids), _LOOKUP_CHUNK):
+            chunk = ids[start:start + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            stored += conn.execute(
+                f"SELECT question_id, topic, correct_index, explanation, body FROM aptitude_questions "
+                f"WHERE question_id IN ({placeholders})",
+                chunk,
+            ).fetchall()
+    finally:
+        conn.close()
+
+    for r in stored:
+        _answer_keys[r["question_id"]] = (r["topic"], r["correct_index"], r["explanation"])
+        if r["body"] is None:
+            continue
+        canonical = json.loads(r["body"])
+        for q in by_id[r["question_id"]]:
+            q.update(canonical)
+    return questions
+
+
+def _load_keys(question_ids: List[str]):
+    missing = [qid for qid in question_ids if qid not in _answer_keys]
+    if not missing:
+        return
+
+    rows = []
+    conn = get_connection()
+    try:
+        for start in range(0, len(missing), _LOOKUP_CHUNK):
+            chunk = missing[start:start + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows += conn.execute(
+                f"SELECT question_id, topic, correct_index, explanation FROM aptitude_questions "
+                f"WHERE question_id IN ({placeholders})",
+                chunk,
+            ).fetchall()
+    finally:
+        conn.close()
+
+    for r in rows:
+        _answer_keys[r["question_id"]] = (r["topic"], r["correct_index"], r["explanation"])
+
+
+# ---------------- GRADING ----------------
+def grade_submission(answers: List[dict], user: Optional[str] = None, record: bool = True) -> dict:
+    """
+    Grade [{"question_id", "selected_index"}] against the stored keys.
+    Unknown question ids are reported but not counted. With record=False
+    the caller writes the per-topic stats itself via record_topic_stats.
+    """
+    _load_keys([a["question_id"] for a in answers])
+
+    results = []
+    topics: Dict[str, list] = {}
+    correct_count = 0
+
+    for a in answers:
+        key = _answer_keys.get(a["question_id"])
+        if key is None:
+            results.append({"question_id": a["question_id"], "unknown": True})
+            continue
+
+        topic, correct_index, explanation = key
+        correct = a.get("selected_index") == correct_index
+        correct_count += correct
+
+        tally = topics.setdefault(topic, [0, 0])
+        tally[0] += correct
+        tally[1] += 1
+
+        results.append({
+            "question_id": a["question_id"],
+            "selected_index": a.get("selected_index"),
+            "correct_index": correct_index,
+            "correct": correct,
+            "explanation": explanation
+        })
+
+    graded = sum(t[1] for t in topics.values())
+    result = {
+        "total": graded,
+        "correct": correct_count,
+        "score": round(correct_count / graded * 100.0, 2) if graded else 0.0,
+        "results": results,
+        "topics": {
+            topic: {"correct": c, "attempted": n, "accuracy": round(c / n * 100.0, 2)}
+            for topic, (c, n) in topics.items()
+        }
+    }
+    if record and graded:
+        conn = get_connection()
+        try:
+            record_topic_stats(conn, user, result["topics"])
+            conn.commit()
+        finally:
+            conn.close()
+    return result
+
+
+# ---------------- TOPIC STATS ----------------
+def record_topic_stats(conn, user: Optional[str], topics: Dict[str, dict]):
+    """Add a graded submission's "topics" tallies on conn; the caller commits."""
+    conn.executemany(
+        """
+        INSERT INTO aptitude_topic_stats (user, topic, attempted, correct) VALUES (?, ?, ?, ?)
+        ON CONFLICT (user, topic) DO UPDATE SET
+            attempted = attempted + excluded.attempted,
+            correct = correct + excluded.correct
+        """,
+        [(user or "", topic, t["attempted"], t["correct"]) for topic, t in topics.items()],
+    )
+
+
+def topic_stats(user: Optional[str] = None) -> dict:
+    conn = get_connection()
+    try:
+        if user is None:
+            rows = conn.execute(
+                """
+                SELECT topic, SUM(attempted) AS attempted, SUM(correct) AS correct
+                FROM aptitude_topic_stats GROUP BY topic ORDER BY topic
+                """
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT topic, attempted, correct FROM aptitude_topic_stats WHERE user = ? ORDER BY topic",
+                (user,),
+            ).fetchall()
+    finally:
+        conn.close()
+
+    return {
+        r["topic"]: {
+            "attempted": r["attempted"],
+            "correct": r["correct"],
+            "accuracy": round(r["correct"] / r["attempted"] * 100.0, 2) if r["attempted"] else 0.0
+        }
+        for r in rows
+    }
@@ -0,0 +1,76 @@
+"""
+Self-Intro Template Engine (offline path)
+
+Intro templates live in data/intro_templates.json. They are loaded once
+and every role x length x tone combination is pre-joined into a single
+format string, so a render is one dict lookup plus str.format_map.
+
+Template fields: {name}, {role}, {years}.
+"""
+import json
+import os
+import random
+from pathlib import Path
+from typing import Dict, Tuple
+
+INTRO_TEMPLATES_PATH = Path(os.getenv(
+    "INTRO_TEMPLATES_PATH",
+    Path(__file__).resolve().parent.parent / "data" / "intro_templates.json"
+))
+
+DEFAULT_ROLE_KEY = ""
+
+# (role, length, tone) -> format string; role "" is the generic template
+# and tone "" the unprefixed variant
+_compiled: Dict[Tuple[str, str, str], str] = {}
+_roles = set()
+_lengths = set()
+_default_length = "60s"
+
+
+def _select(sentences, indices):
+    if indices is None:
+        return list(sentences)
+    return [sentences[i] for i in indices if i < len(sentences)]
+
+
+def _compile_role(role_key, sentences, lengths, tones):
+    for length, indices in lengths.items():
+        selected = _select(sentences, indices)
+        for tone, prefix in {**tones, "": ""}.items():
+            text = list(selected)
+            if text and prefix:
+                text[0] = prefix + text[0]
+            _compiled[(role_key, length, tone)] = " ".join(text)
+
+
+def load_templates(path: Path = INTRO_TEMPLATES_PATH):
+    """(Re)load and precompile all templates from `path`."""
+    global _default_length
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    lengths = data["lengths"]
+    tones = data["tones"]
+    _default_length = data.get("default_length", "60s")
+
+    _compiled.clear()
+    _roles.clear()
+    _roles.update(data["roles"])
+    _lengths.clear()
+    _lengths.update(lengths)
+    _compile_role(DEFAULT_ROLE_KEY, data["default"], lengths, tones)
+    for role, sentences in data["roles"].items():
+        _compile_role(role, sentences, lengths, tones)
+
+
+def render_intro(name: str, role: str, length: str, tone: str) -> str:
+    role_key = role if role in _roles else DEFAULT_ROLE_KEY
+    if length not in _lengths:
+        length = _default_length
+
+    template = _compiled.get((role_key, length, tone)) or _compiled[(role_key, length, "")]
+    return template.format_map({"name": name, "role": role, "years": random.randint(3, 8)})
+
+
+load_templates()
@@ -1,13 +1,170 @@
-from typing import List, Dict
+import os
+import re
+from typing import List, Dict, Optional
 from rapidfuzz import fuzz
 
-# Keep this aligned with resume_parser for now
-CANONICAL_SKILLS = [
-    "Python", "JavaScript", "React", "Node.js", "TypeScript", "SQL",
-    "Machine Learning", "Data Analysis", "Communication",
-    "Git", "Docker", "AWS"
+from .cache_tier import TieredCache
+from .skill_registry import CANONICAL_SKILLS, TAXONOMY_VERSION, SkillSet
+
+# ---------------- CONFIG ----------------
+JD_CACHE_SIZE = int(os.getenv("JD_CACHE_SIZE", "256"))
+
+PRIORITY_RANK = {"nice-to-have": 0, "preferred": 1, "must": 2}
+DEFAULT_PRIORITY = "preferred"
+DEFAULT_LEVEL = "intermediate"
+
+# Section headings switch the priority for the lines that follow them
+SECTION_CUES = [
+    (re.compile(r"^(nice[\s-]to[\s-]haves?|good[\s-]to[\s-]have|bonus( points)?|pluses)\b"), "nice-to-have"),
+    (re.compile(r"^(preferred|desired|desirable|preferred qualifications|additional qualifications)\b"), "preferred"),
+    (re.compile(r"^(requirements?|required|must[\s-]haves?|(minimum |basic |key )?qualifications|what you need|mandatory)\b"), "must"),
+    (re.compile(r"^(responsibilities|about (us|the role|the company)|benefits|what we offer|perks|who we are)\b"), None),
 ]
 
+# Cue phrases inside a line override the current section
+LINE_CUES = [
+    (re.compile(r"\b(nice[\s-]to[\s-]have|good[\s-]to[\s-]have|bonus|a plus|is a plus|familiarity with|exposure to)\b"), "nice-to-have"),
+    (re.compile(r"\b(must|required|mandatory|essential|strong (knowledge|experience|proficiency)|proficien(t|cy) in)\b"), "must"),
+    (re.compile(r"\b(preferred|desired|ideally|should have)\b"), "preferred"),
+]
+
+YEARS_RE = re.compile(r"\b(\d{1,2})\s*\+?\s*(?:(?:-|to)\s*\d{1,2}\s*\+?\s*)?(?:years?|yrs?)\b")
+
+SENIORITY_CUES = [
+    (re.compile(r"\b(principal|staff|architect|head of|director)\b"), "expert"),
+    (re.compile(r"\b(senior|sr\.?|lead)\b"), "senior"),
+    (re.compile(r"\b(mid[\s-]level|intermediate)\b"), "intermediate"),
+    (re.compile(r"\b(intern|internship|fresher|entry[\s-]level|graduate|junior|jr\.?)\b"), "beginner"),
+]
+
+LEVEL_RANK = {"beginner": 1, "intermediate": 2, "senior": 3, "expert": 4}
+
+_BULLET_RE = re.compile(r"^\s*(?:[-*•●]+|\d{1,2}[.)])\s*")
+
+# Parsed JDs, shared with the other workers through the cache tier;
+# _PARSE_FORMAT changes whenever the cached dict's shape does
+_jd_cache = TieredCache("jd_parse", JD_CACHE_SIZE)
+_PARSE_FORMAT = 2
+
+
+def _level_for_years(years: int) -> str:
+    if years <= 1:
+        return "beginner"
+    elif years <= 4:
+        return "intermediate"
+    elif years <= 7:
+        return "senior"
+    return "expert"
+
+
+def _line_matches(skill_lower: str, line: str, threshold: int) -> bool:
+    # partial_ratio aligns the shorter string inside the longer one, so a
+    # short line would otherwise "contain" any long skill name
+    if len(line) < len(skill_lower):
+        return fuzz.ratio(skill_lower, line) >= threshold
+    return fuzz.partial_ratio(skill_lower, line) >= threshold
+
+
+# ---------------- SINGLE-PASS PARSER ----------------
+def _parse(jd_text: str, threshold: int) -> dict:
+    section = None
+    # The largest years-of-experience figure anywhere in the posting
+    required_years: Optional[int] = None
+    seniority: Optional[str] = None
+    found: Dict[str, dict] = {}
+
+    for raw_line in jd_text.lower().splitlines():
+        line = _BULLET_RE.sub("", raw_line).strip()
+        if not line:
+            continue
+
+        for pattern, priority in SECTION_CUES:
+            if pattern.match(line):
+                section = priority
+                break
+
+        line_priority = section or DEFAULT_PRIORITY
+        for pattern, priority in LINE_CUES:
+            if pattern.search(line):
+                line_priority = priority
+                break
+
+        line_level = None
+        years_match = YEARS_RE.search(line)
+        if years_match:
+            years = int(years_match.group(1))
+            line_level = _level_for_years(years)
+            if required_years is None or years > required_years:
+                required_years = years
+
+        for pattern, level in SENIORITY_CUES:
+            if pattern.search(line):
+                if seniority is None or LEVEL_RANK[level] > LEVEL_RANK[seniority]:
+                    seniority = level
+                break
+
+        for skill in CANONICAL_SKILLS:
+            if not _line_matches(skill.lower(), line, threshold):
+                continue
+            entry = found.get(skill)
+            if entry is None:
+                found[skill] = {"priority": line_priority, "level": line_level}
+                continue
+            if PRIORITY_RANK[line_priority] > PRIORITY_RANK[entry["priority"]]:
+                entry["priority"] = line_priority
+            if line_level and (entry["level"] is None or LEVEL_RANK[line_level] > LEVEL_RANK[entry["level"]]):
+                entry["level"] = line_level
+
+    # Years stated anywhere outrank a bare title cue for the overall level
+    if required_years is not None:
+        overall = _level_for_years(required_years)
+    else:
+        overall = seniority or DEFAULT_LEVEL
+
+    skills = [
+        {
+            "skill": skill,
+            "priority": found[skill]["priority"],
+            "level": found[skill]["level"] or overall
+        }
+        for skill in CANONICAL_SKILLS if skill in found
+    ]
+
+    return {"skills": skills, "required_years": required_years, "level": overall}
+
+
+def parse_jd(jd_text: str, threshold: int = 75) -> dict:
+    """
+    Parse a Job Description in a single scan over its lines.
+
+    Results are cached by a hash of the text (in-process and in the shared
+    cache tier), so screening many resumes against the same posting only
+    parses it once per host.
+
+    Returns:
+    {
+      "skills": [{"skill": "Python", "priority": "must", "level": "senior"}],
+      "required_years": 5,
+      "level": "senior"
+    }
+
+    required_years is the highest experience requirement stated anywhere
+    (e.g. 5 for "3+ years SQL ... 5+ years Python").
+    """
+    key = _jd_cache.key(_PARSE_FORMAT, TAXONOMY_VERSION, threshold, jd_text)
+
+    parsed = _jd_cache.get(key)
+    if parsed is None:
+        parsed = _parse(jd_text, threshold)
+        _jd_cache.put(key, parsed)
+
+    return {
+        "skills": [dict(s) for s in parsed["skills"]],
+        "required_years": parsed["required_years"],
+        "level": parsed["level"]
+    }
+
+
 def extract_jd_skills(
     jd_text: str,
     threshold: int = 75
@@ -15,25 +172,21 @@ def extract_jd_skills(
     """
     Extract skills from a Job Description.
 
+    Priority comes from requirement sections ("Requirements", "Preferred",
+    "Nice to have") and cue phrases on the line; level from years of
+    experience or seniority words.
+
     Returns:
     [
       {
         "skill": "Python",
-        "priority": "preferred",
+        "priority": "must",
         "level": "intermediate"
       }
     ]
     """
-    jd_lower = jd_text.lower()
-    skills = []
-
-    for skill in CANONICAL_SKILLS:
-        score = fuzz.partial_ratio(skill.lower(), jd_lower)
-        if score >= threshold:
-            skills.append({
-                "skill": skill,
-                "priority": "preferred",     # can be upgraded later
-                "level": "intermediate"
-            })
-
-    return skills
+    return parse_jd(jd_text, threshold)["skills"]
+
+
+def jd_skill_set(jd_skills: List[Dict]) -> SkillSet:
+    return SkillSet.from_names(s["skill"] for s in jd_skills)
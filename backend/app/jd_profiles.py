@@ -0,0 +1,195 @@
+"""
+JD Profiles
+
+A job description is parsed once into a profile (weighted skills, token
+set, normalization factors) and stored behind a stable id. Screening a
+candidate against a registered JD then only does resume-side work.
+Profiles live in SQLite; a bounded LRU keeps the recently used ones parsed.
+"""
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Form, HTTPException
+
+from db.database import get_connection
+from .jd_parser import parse_jd, jd_skill_set
+from .scorer import priority_weight, skill_weight, tokenize
+
+router = APIRouter(prefix="/jd", tags=["Job Descriptions"])
+
+# ---------------- CONFIG ----------------
+JD_PROFILE_CACHE_SIZE = int(os.getenv("JD_PROFILE_CACHE_SIZE", "512"))
+
+# jd_id -> JDProfile, most recently used last
+_profiles: "OrderedDict[str, JDProfile]" = OrderedDict()
+
+
+def _remember(profile: "JDProfile") -> None:
+    _profiles[profile.jd_id] = profile
+    _profiles.move_to_end(profile.jd_id)
+    while len(_profiles) > JD_PROFILE_CACHE_SIZE:
+        _profiles.popitem(last=False)
+
+
+class JDProfile:
+    __slots__ = (
+        "jd_id", "title", "skills", "skill_set", "tokens",
+        "total_weight", "token_count", "required_years", "level"
+    )
+
+    def __init__(self, jd_id, title, skills, tokens, required_years=None, level=None):
+        self.jd_id = jd_id
+        self.title = title
+        self.skills = skills
+        self.skill_set = jd_skill_set(skills)
+        self.tokens = frozenset(tokens)
+        self.total_weight = sum(s["weight"] for s in skills)
+        self.token_count = len(self.tokens)
+        self.required_years = required_years
+        self.level = level
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "skills": self.skills,
+            "tokens": sorted(self.tokens),
+            "required_years": self.required_years,
+            "level": self.level
+        })
+
+    def summary(self) -> dict:
+        return {
+            "jd_id": self.jd_id,
+            "title": self.title,
+            "skills": self.skills,
+            "required_years": self.required_years,
+            "level": self.level,
+            "token_count": self.token_count,
+            "total_weight": self.total_weight
+        }
+
+
+def jd_id_for(jd_text: str) -> str:
+    return hashlib.sha1(jd_text.encode("utf-8")).hexdigest()[:16]
+
+
+def build_profile(jd_text: str, title: Optional[str] = None) -> JDProfile:
+    """Build an (unregistered) profile for a raw JD text."""
+    parsed = parse_jd(jd_text)
+    skills = parsed["skills"]
+    for entry in skills:
+        entry["weight"] = skill_weight(entry)
+
+    return JDProfile(
+        jd_id=jd_id_for(jd_text),
+        title=title,
+        skills=skills,
+        tokens=tokenize(jd_text),
+        required_years=parsed["required_years"],
+        level=parsed["level"]
+    )
+
+
+# ---------------- STORE ----------------
+def register_jd(jd_text: str, title: Optional[str] = None) -> JDProfile:
+    """Parse and persist a JD; registering the same text again is a no-op."""
+    jd_id = jd_id_for(jd_text)
+    existing = get_profile(jd_id)
+    if existing is not None:
+        return existing
+
+    profile = build_profile(jd_text, title)
+
+    conn = get_connection()
+    try:
+        conn.execute(
+            "INSERT OR IGNORE INTO jd_profiles (jd_id, title, profile, jd_text, created_at) VALUES (?, ?, ?, ?, ?)",
+            (jd_id, title, profile.to_json(), jd_text, datetime.utcnow().isoformat()),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    _remember(profile)
+    return profile
+
+
+def get_profile(jd_id: str) -> Optional[JDProfile]:
+    profile = _profiles.get(jd_id)
+    if profile is not None:
+        _profiles.move_to_end(jd_id)
+        return profile
+
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            "SELECT title, profile FROM jd_profiles WHERE jd_id = ?", (jd_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+
+    if row is None:
+        return None
+
+    data = json.loads(row["profile"])
+    # Stored weights are a cache; re-derive them under the current config
+    for entry in data["skills"]:
+        entry["weight"] = priority_weight(entry.get("priority"))
+    profile = JDProfile(
+        jd_id=jd_id,
+        title=row["title"],
+        skills=data["skills"],
+        tokens=data["tokens"],
+        required_years=data.get("required_years", data.get("min_years")),
+        level=data.get("level")
+    )
+    _remember(profile)
+    return profile
+
+
+def reparse_profile(jd_id: str) -> Optional[JDProfile]:
+    """
+    Rebuild a registered profile from its stored text (after a taxonomy
+    change). Returns None when the text was never stored.
+    """
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            "SELECT title, jd_text FROM jd_profiles WHERE jd_id = ?", (jd_id,)
+        ).fetchone()
+        if row is None or row["jd_text"] is None:
+            return None
+
+        profile = build_profile(row["jd_text"], row["title"])
+        profile.jd_id = jd_id
+        conn.execute(
+            "UPDATE jd_profiles SET profile = ? WHERE jd_id = ?", (profile.to_json(), jd_id)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    _remember(profile)
+    return profile
+
+
+# ---------------- ROUTES ----------------
+@router.post("/register")
+def register(
+    job_description: str = Form(...),
+    title: str = Form(None)
+):
+    if not job_description.strip():
+        raise HTTPException(status_code=400, detail="Job description is empty")
+    return register_jd(job_description, title).summary()
+
+
+@router.get("/{jd_id}")
+def get_jd(jd_id: str):
+    profile = get_profile(jd_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Unknown jd_id")
+    return profile.summary()
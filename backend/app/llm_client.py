@@ -1,19 +1,64 @@
 import os
 import json
 import random
+import threading
 import requests
 from copy import deepcopy
+from requests.adapters import HTTPAdapter
+
+from .cache_tier import TieredCache
+from .grading import register_questions
+from .intro_templates import render_intro
+from .load_control import controller, LLMUnavailable, MODE_LLM, MODE_OFFLINE
+from .singleflight import SingleFlight
 
 
 # ================= CONFIG =================
 
 GROK_API_KEY = os.getenv("GROK_API_KEY")
-GROK_ENDPOINT = "https://api.x.ai/v1/chat/completions"
-MODEL = "grok-2-latest"
+# Any OpenAI-compatible base URL works, e.g. tools/mock_llm.py for load tests
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://api.x.ai/v1")
+GROK_ENDPOINT = f"{LLM_BASE_URL.rstrip('/')}/chat/completions"
+MODEL = os.getenv("LLM_MODEL", "grok-2-latest")
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "10"))
+LLM_STREAM = os.getenv("LLM_STREAM", "0") == "1"
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+LLM_CACHE_LOCAL_SIZE = int(os.getenv("LLM_CACHE_LOCAL_SIZE", "512"))
+
+# Keep-alive connections to the provider, shared by all request threads
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_maxsize=LLM_POOL_SIZE))
+_session.mount("https://", HTTPAdapter(pool_maxsize=LLM_POOL_SIZE))
+
+# Identical concurrent requests share one provider call
+_flights = SingleFlight()
+
+# Replies to deterministic prompts (intros, evaluations), shared by workers
+_llm_cache = TieredCache("llm", LLM_CACHE_LOCAL_SIZE, ttl=LLM_CACHE_TTL_SECONDS)
 
 # ================= GROK CALL =================
 
-def _call_grok(prompt: str) -> str:
+def _call_grok(prompt: str, cache: bool = False) -> str:
+    key = _llm_cache.key(MODEL, prompt) if cache else None
+    if key is not None:
+        cached = _llm_cache.get(key)
+        if cached is not None:
+            return cached
+
+    # Skip the provider entirely while it is degraded or we are saturated
+    if not controller.allow():
+        raise LLMUnavailable("LLM provider degraded; serving offline")
+
+    with controller.track():
+        reply = _post_grok(prompt)
+
+    if key is not None:
+        _llm_cache.put(key, reply)
+    return reply
+
+
+def _post_grok(prompt: str) -> str:
     headers = {
         "Authorization": f"Bearer {GROK_API_KEY}",
         "Content-Type": "application/json",
@@ -26,23 +71,49 @@ def _call_grok(prompt: str) -> str:
             {"role": "user", "content": prompt},
         ],
         "temperature": 0.4,
+        "stream": LLM_STREAM,
     }
 
-    response = requests.post(
+    response = _session.post(
         GROK_ENDPOINT,
         headers=headers,
         json=payload,
-        timeout=30
+        timeout=LLM_TIMEOUT_SECONDS,
+        stream=LLM_STREAM
     )
 
     if response.status_code != 200:
         raise RuntimeError(response.text)
 
+    if LLM_STREAM:
+        return _read_stream(response)
     return response.json()["choices"][0]["message"]["content"]
 
+
+def _read_stream(response) -> str:
+    """Join the content deltas of a server-sent-events completion."""
+    response.encoding = "utf-8"
+    parts = []
+    with response:
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            delta = json.loads(data)["choices"][0].get("delta", {})
+            parts.append(delta.get("content") or "")
+    return "".join(parts)
+
 # ================= SELF INTRO =================
 
 def generate_self_intro(name: str, role: str, length: str, tone: str):
+    # Only byte-identical requests (same name included) share a generation
+    key = ("selfintro", name, role.strip(), length, tone)
+    return _flights.do(key, _generate_self_intro, name, role.strip(), length, tone)
+
+
+def _generate_self_intro(name: str, role: str, length: str, tone: str):
     prompt = f"""
 Create a highly professional self-introduction for an interview setting.
 
@@ -63,110 +134,338 @@ Requirements:
 """
 
     try:
-        return {"result": _call_grok(prompt)}
+        # Not cached: the reply is personal, and asking again should give a new one
+        return {"result": _call_grok(prompt), "mode": MODE_LLM}
 
     except Exception:
         notice = (
             "⚠️ Note: AI service unavailable. Showing system-generated response.\n\n"
         )
 
-        # Professional industry-specific introductions
-        intro_templates = {
-            "Data Analyst": [
-                f"Good [morning/afternoon], I'm {name}, a results-driven Data Analyst with expertise in transforming complex datasets into actionable business insights.",
-                "My technical toolkit includes advanced SQL, Python for data manipulation, and visualization tools like Tableau and Power BI.",
-                "I recently optimized a client's reporting system, reducing data processing time by 65% while improving accuracy to 99.8%.",
-                "I'm particularly skilled at identifying key performance indicators that align with business objectives and tracking them through automated dashboards.",
-                "What distinguishes my approach is combining technical rigor with strong business acumen, ensuring analytics deliver measurable ROI.",
-                "I'm eager to contribute my analytical expertise to drive data-informed decision-making."
+        return {"result": notice + render_intro(name, role, length, tone), "mode": MODE_OFFLINE}
+    
+# ================= APTITUDE QUESTIONS =================
+
+# Offline bank, spread over the quiz staircase levels; treat as read-only
+# and serve it through offline_bank()
+OFFLINE_QUESTION_BANK = {
+    "Data Analysis": [
+        {
+            "topic": "Data Analysis",
+            "difficulty": "Easy",
+            "question": "Which summary statistic is LEAST affected by a few extreme outliers?",
+            "options": [
+                "Mean",
+                "Median",
+                "Range",
+                "Standard deviation"
+            ],
+            "correct_index": 1,
+            "explanation": "The median depends only on the middle of the sorted data, so a handful of extreme values barely moves it."
+        },
+        {
+            "topic": "Data Analysis",
+            "difficulty": "Expert",
+            "question": "You're analyzing customer churn for a subscription service with 95% retention rate. Which statistical test is MOST appropriate for determining if a new onboarding feature reduces churn, given you expect an effect size of 0.5%?",
+            "options": [
+                "Chi-square test for independence with Yates' correction",
+                "Two-sample proportion test with sequential testing adjustment",
+                "Logistic regression with Firth's correction for rare events",
+                "Survival analysis with Cox proportional hazards model"
             ],
-            
-            "Data Scientist": [
-                f"Hello, I'm {name}, a strategic Data Scientist specializing in building machine learning models that solve complex business challenges.",
-                "I have extensive experience across the full ML lifecycle, from problem framing and feature engineering to model deployment and monitoring.",
-                "Recently, I developed a predictive model that reduced customer churn by 42% for a SaaS company, generating $2.3M in annual retention.",
-                "My expertise spans supervised and unsupervised learning, NLP, and deep learning frameworks like TensorFlow and PyTorch.",
-                "I excel at translating business problems into technical solutions and communicating complex concepts to diverse stakeholders.",
-                "I'm excited about opportunities to leverage data science for transformative business impact."
+            "correct_index": 2,
+            "explanation": "Logistic regression with Firth's correction handles rare event bias in imbalanced datasets and allows for covariate adjustment."
+        },
+        {
+            "topic": "Data Analysis",
+            "difficulty": "Medium",
+            "question": "When conducting A/B testing for a feature with multiple variants (A, B, C, D) and sequential monitoring, which multiple comparison correction method minimizes Type I error while maintaining reasonable power?",
+            "options": [
+                "Bonferroni correction with alpha = 0.05/k",
+                "Holm-Bonferroni sequential procedure",
+                "Benjamini-Hochberg FDR control",
+                "Tukey's HSD for all pairwise comparisons"
             ],
-            
-            "Software Engineer": [
-                f"Good day, I'm {name}, a software engineer with {random.randint(3, 8)}+ years of experience building scalable, high-performance applications.",
-                "My technical stack includes [Java/Python/Go], cloud platforms like AWS, and modern frameworks such as React and Spring Boot.",
-                "I recently led the architecture redesign of a critical microservice, improving system throughput by 300% and reducing latency by 75%.",
-                "I'm proficient in full-stack development, distributed systems, and implementing robust CI/CD pipelines with comprehensive testing coverage.",
-                "My approach emphasizes clean code, system reliability, and delivering user-centric solutions that exceed performance expectations.",
-                "I'm seeking to apply my technical expertise to challenging engineering problems."
+            "correct_index": 1,
+            "explanation": "Holm-Bonferroni provides more power than standard Bonferroni while controlling family-wise error rate in sequential testing scenarios."
+        },
+        {
+            "topic": "Data Analysis",
+            "difficulty": "Advanced",
+            "question": "You have time-series data with hourly observations showing strong weekly seasonality and a trend. The residuals exhibit heteroscedasticity and autocorrelation. Which modeling approach is MOST robust?",
+            "options": [
+                "SARIMA with Box-Cox transformation",
+                "Prophet with added regressors for special events",
+                "LSTM neural network with attention mechanism",
+                "GARCH model for volatility clustering"
             ],
-            
-            "Business Analyst": [
-                f"Hello, I'm {name}, a Business Analyst with expertise in bridging the gap between technical teams and business stakeholders.",
-                "I specialize in requirements gathering, process optimization, and delivering solutions that enhance operational efficiency.",
-                "Recently, I streamlined a client's order processing workflow, reducing turnaround time by 50% and saving approximately 200 person-hours monthly.",
-                "My toolkit includes Agile methodologies, user story mapping, and data analysis to drive evidence-based decision making.",
-                "I excel at translating complex business needs into clear technical specifications and ensuring project alignment with strategic goals.",
-                "I'm keen to leverage my analytical skills to optimize business processes and drive organizational success."
-            ]
+            "correct_index": 0,
+            "explanation": "SARIMA with Box-Cox transformation handles seasonality, trend, and can address heteroscedasticity while modeling autocorrelation structure explicitly."
         }
-        
-        # Fallback for unspecified roles
-        default_intro = [
-            f"Good day, I'm {name}, a dedicated professional with comprehensive expertise in {role}.",
-            f"My experience spans [key area 1], [key area 2], and [key area 3], with a track record of delivering measurable results.",
-            f"Recently, I [achieved significant accomplishment] that resulted in [quantifiable benefit].",
-            f"I'm particularly skilled at [unique skill or approach] that differentiates my contributions.",
-            f"My methodology emphasizes [professional principle] while maintaining focus on [business outcome].",
-            f"I'm enthusiastic about opportunities to apply my expertise to challenging {role} responsibilities."
-        ]
-        
-        # Select appropriate template
-        if role in intro_templates:
-            base_intro = intro_templates[role]
-        else:
-            base_intro = default_intro
-        
-        # Adjust length
-        if length == "15s":
-            text = [base_intro[0]] + base_intro[2:3]  # Name + one key achievement
-        elif length == "30s":
-            text = base_intro[:4]  # Name + 3 key points
-        else:  # 60s
-            text = base_intro
-        
-        # Add tone-specific adjustments
-        tone_adjustments = {
-            "Formal": "",
-            "Neutral": "",
-            "Confident": "[With confidence in my abilities,] " + text[0] if len(text) > 0 else "",
-            "Friendly": "[It's a pleasure to be here today.] " + text[0] if len(text) > 0 else ""
+    ],
+
+    "Data Science": [
+        {
+            "topic": "Data Science",
+            "difficulty": "Easy",
+            "question": "A model scores 99% on its training data but 60% on unseen test data. What is the MOST likely problem?",
+            "options": [
+                "Underfitting",
+                "Overfitting",
+                "Class imbalance in the test set",
+                "A learning rate that is too low"
+            ],
+            "correct_index": 1,
+            "explanation": "A large gap between training and test performance means the model memorized the training data instead of generalizing."
+        },
+        {
+            "topic": "Data Science",
+            "difficulty": "Medium",
+            "question": "You're building a binary classifier for fraud detection where false negatives cost 100x more than false positives. The dataset has 99.9% legitimate transactions. After training, your model has 99.8% accuracy but misses 40% of fraud cases. What's your FIRST strategic adjustment?",
+            "options": [
+                "Apply Synthetic Minority Oversampling (SMOTE)",
+                "Use cost-sensitive learning with asymmetric misclassification costs",
+                "Implement ensemble methods with bagging",
+                "Collect more features through feature engineering"
+            ],
+            "correct_index": 1,
+            "explanation": "Cost-sensitive learning directly addresses asymmetric business costs by assigning higher penalty to false negatives during optimization."
+        },
+        {
+            "topic": "Data Science",
+            "difficulty": "Advanced",
+            "question": "When deploying an ML model for real-time inference, you observe prediction drift over 6 months despite retraining. The feature distributions remain stable. What's the MOST likely cause and remediation?",
+            "options": [
+                "Concept drift: Implement continuous monitoring and adaptive learning",
+                "Covariate shift: Re-weight training samples using importance sampling",
+                "Label noise: Implement robust loss functions",
+                "Sample selection bias: Collect more diverse training data"
+            ],
+            "correct_index": 0,
+            "explanation": "Concept drift occurs when relationships between features and target change despite stable feature distributions, requiring adaptive approaches."
+        },
+        {
+            "topic": "Data Science",
+            "difficulty": "Expert",
+            "question": "You're optimizing a recommendation system's diversity while maintaining relevance. Which approach BEST balances exploration-exploitation for new users with limited interaction history?",
+            "options": [
+                "Thompson sampling with contextual bandits",
+                "Upper Confidence Bound (UCB) algorithm",
+                "ε-greedy with decaying exploration rate",
+                "LinUCB with feature-based context"
+            ],
+            "correct_index": 3,
+            "explanation": "LinUCB incorporates user features to make personalized exploration decisions, efficiently balancing personalization and discovery for new users."
         }
-        
-        if tone in tone_adjustments and tone_adjustments[tone]:
-            text[0] = tone_adjustments[tone] + text[0]
-        
-        return {"result": notice + " ".join(text)}
-    
-# ================= APTITUDE QUESTIONS =================
+    ],
+
+    "Software Engineering": [
+        {
+            "topic": "Software Engineering",
+            "difficulty": "Easy",
+            "question": "Which data structure gives average O(1) lookup by key?",
+            "options": [
+                "Sorted array",
+                "Linked list",
+                "Hash table",
+                "Binary heap"
+            ],
+            "correct_index": 2,
+            "explanation": "A hash table maps a key straight to its bucket, so lookups take constant time on average."
+        },
+        {
+            "topic": "Software Engineering",
+            "difficulty": "Expert",
+            "question": "You're designing a distributed session management system supporting 10M concurrent users with <100ms latency. Which consistency-availability trade-off is OPTIMAL for session data?",
+            "options": [
+                "Strong consistency with leader-based replication (CP system)",
+                "Eventual consistency with conflict-free replicated data types (AP system)",
+                "Causal consistency with version vectors",
+                "Read-your-writes consistency with sticky sessions"
+            ],
+            "correct_index": 1,
+            "explanation": "Session data tolerates temporary inconsistencies. CRDTs provide conflict resolution in AP systems, ensuring availability while handling partition tolerance."
+        },
+        {
+            "topic": "Software Engineering",
+            "difficulty": "Medium",
+            "question": "When implementing a circuit breaker pattern for microservices, which metric provides the EARLIEST indication of upstream service degradation?",
+            "options": [
+                "95th percentile latency increase by 50%",
+                "Error rate exceeding 5% over 1 minute",
+                "Request volume dropping by 30%",
+                "Connection pool exhaustion frequency"
+            ],
+            "correct_index": 1,
+            "explanation": "Error rate is the most direct signal of service health degradation and triggers circuit breakers before latency metrics show significant impact."
+        },
+        {
+            "topic": "Software Engineering",
+            "difficulty": "Advanced",
+            "question": "You're refactoring a monolith to microservices. The original code has tight coupling through global state. Which decomposition strategy MINIMIZES integration complexity while maximizing team autonomy?",
+            "options": [
+                "Domain-driven design with bounded contexts",
+                "Strangler pattern with feature-based extraction",
+                "Database-per-service with event sourcing",
+                "API gateway with backend-for-frontend pattern"
+            ],
+            "correct_index": 0,
+            "explanation": "DDD's bounded contexts align services with business capabilities, minimizing cross-service dependencies while providing clear ownership boundaries."
+        }
+    ],
+
+    "Business Analysis": [
+        {
+            "topic": "Business Analysis",
+            "difficulty": "Easy",
+            "question": "Which artifact describes a requirement from the user's point of view, in the form 'As a ..., I want ..., so that ...'?",
+            "options": [
+                "User story",
+                "Gantt chart",
+                "Balance sheet",
+                "Network diagram"
+            ],
+            "correct_index": 0,
+            "explanation": "User stories capture who needs a capability, what they need and why, in the user's own terms."
+        },
+        {
+            "topic": "Business Analysis",
+            "difficulty": "Expert",
+            "question": "When calculating ROI for a digital transformation project with intangible benefits (improved employee satisfaction, brand perception), which valuation method is MOST defensible to executive stakeholders?",
+            "options": [
+                "Conjoint analysis to quantify willingness-to-pay for features",
+                "Real options analysis accounting for strategic flexibility",
+                "Multi-criteria decision analysis with weighted scoring",
+                "Monte Carlo simulation with sensitivity analysis on intangible factors"
+            ],
+            "correct_index": 2,
+            "explanation": "MCDA transparently incorporates both quantitative and qualitative factors through weighted scoring, making trade-offs explicit to stakeholders."
+        },
+        {
+            "topic": "Business Analysis",
+            "difficulty": "Advanced",
+            "question": "You're facilitating requirements gathering for a cross-functional system with conflicting stakeholder priorities. Which technique BEST surfaces hidden constraints and unstated needs?",
+            "options": [
+                "Job stories with situation-specific acceptance criteria",
+                "Contextual inquiry with apprenticeship model",
+                "MoSCoW prioritization with Kano analysis",
+                "Design thinking workshops with empathy mapping"
+            ],
+            "correct_index": 1,
+            "explanation": "Contextual inquiry observes users in their natural environment, revealing workarounds and unarticulated needs that traditional interviews miss."
+        },
+        {
+            "topic": "Business Analysis",
+            "difficulty": "Medium",
+            "question": "When managing scope creep in an Agile project with fixed deadline and budget, which approach MAINTAINS stakeholder trust while controlling scope?",
+            "options": [
+                "Implement strict change control board with weekly reviews",
+                "Use weighted shortest job first (WSJF) for backlog prioritization",
+                "Establish innovation accounting with validated learning metrics",
+                "Create a 'parking lot' for future iterations with clear trade-offs"
+            ],
+            "correct_index": 3,
+            "explanation": "The parking lot technique acknowledges valuable ideas while deferring them transparently, maintaining stakeholder engagement without compromising current sprint commitments."
+        }
+    ],
+
+    "Logical Reasoning": [
+        {
+            "topic": "Logical Reasoning",
+            "difficulty": "Easy",
+            "question": "What number comes next: 3, 6, 12, 24, ?",
+            "options": [
+                "30",
+                "36",
+                "48",
+                "60"
+            ],
+            "correct_index": 2,
+            "explanation": "Each term doubles the previous one, so 24 x 2 = 48."
+        },
+        {
+            "topic": "Logical Reasoning",
+            "difficulty": "Advanced",
+            "question": "If all A are B, some B are C, no C are D, and all D are E, which conclusion is NECESSARILY true?",
+            "options": [
+                "Some A are not D",
+                "No B are E",
+                "Some E are not C",
+                "All D are not B"
+            ],
+            "correct_index": 0,
+            "explanation": "Since no C are D and some A are C (through B), those A that are C cannot be D. Therefore, some A are not D."
+        },
+        {
+            "topic": "Logical Reasoning",
+            "difficulty": "Expert",
+            "question": "In a round-robin tournament with 8 teams where each team plays every other team exactly once, what is the MINIMUM number of games that must be analyzed to guarantee finding the tournament winner if ties are possible?",
+            "options": [
+                "7",
+                "14",
+                "21",
+                "28"
+            ],
+            "correct_index": 0,
+            "explanation": "The tournament winner must have beaten or tied with all other teams. By analyzing just the games involving one team against all others (7 games), you can determine if that team is undefeated/untied."
+        },
+        {
+            "topic": "Logical Reasoning",
+            "difficulty": "Medium",
+            "question": "Which pattern completes the sequence: 2, 3, 10, 15, 26, 35, 50, ?",
+            "options": [
+                "63",
+                "65",
+                "67",
+                "69"
+            ],
+            "correct_index": 0,
+            "explanation": "Pattern: n² + 1 for odd positions (2, 10, 26, 50 = 1²+1, 3²+1, 5²+1, 7²+1) and n² - 1 for even positions (3, 15, 35, 63 = 2²-1, 4²-1, 6²-1, 8²-1)"
+        }
+    ]
+}
+
+
+_offline_bank = None
+_offline_lock = threading.Lock()
+
+
+def offline_bank() -> dict:
+    """OFFLINE_QUESTION_BANK with ids stamped and answer keys registered, once."""
+    global _offline_bank
+    with _offline_lock:
+        if _offline_bank is None:
+            bank = deepcopy(OFFLINE_QUESTION_BANK)
+            register_questions([q for qs in bank.values() for q in qs])
+            _offline_bank = bank
+        return _offline_bank
+
 
 def generate_aptitude_questions(topic: str, count: int):
     """
-    Advanced MCQ-based aptitude questions with difficulty levels.
+    MCQ-based aptitude questions across difficulty levels.
     Supports ALL-topics mode with unique questions.
     """
+    key = ("questions", topic.strip(), count)
+    return _flights.do(key, _generate_aptitude_questions, topic, count)
+
+
+def _generate_aptitude_questions(topic: str, count: int):
 
     # ---------- AI FIRST (Enhanced) ----------
     try:
         prompt = f"""
-Generate {count} ADVANCED multiple-choice aptitude questions for topic: {topic}
-These should be interview-level difficult questions suitable for senior roles.
+Generate {count} multiple-choice aptitude questions for topic: {topic}
+These should be interview-level questions, spread across the difficulty
+levels Easy, Medium, Advanced and Expert (Advanced and Expert suit senior roles).
 
 Each question MUST be in this JSON format:
 {{
   "questions": [
     {{
       "topic": "{topic}",
-      "difficulty": "Advanced",
-      "question": "Challenging technical/professional question",
+      "difficulty": "Easy | Medium | Advanced | Expert",
+      "question": "Technical/professional question",
       "options": ["Complex option A", "Detailed option B", "Sophisticated option C", "Nuanced option D"],
       "correct_index": 0-3,
       "explanation": "Brief technical explanation of correct answer"
@@ -193,284 +492,31 @@ JSON ONLY, no explanations outside the structure.
 """
 
         ai_response = _call_grok(prompt)
-        return json.loads(ai_response)
+        result = json.loads(ai_response)
+        register_questions(result.get("questions", []))
+        result["mode"] = MODE_LLM
+        return result
 
     except Exception:
         pass  # fallback continues below
 
-    # ---------- ADVANCED OFFLINE QUESTION BANK ----------
-    ADVANCED_QUESTION_BANK = {
-        "Data Analysis": [
-            {
-                "topic": "Data Analysis",
-                "difficulty": "Advanced",
-                "question": "You're analyzing customer churn for a subscription service with 95% retention rate. Which statistical test is MOST appropriate for determining if a new onboarding feature reduces churn, given you expect an effect size of 0.5%?",
-                "options": [
-                    "Chi-square test for independence with Yates' correction",
-                    "Two-sample proportion test with sequential testing adjustment",
-                    "Logistic regression with Firth's correction for rare events",
-                    "Survival analysis with Cox proportional hazards model"
-                ],
-                "correct_index": 2,
-                "explanation": "Logistic regression with Firth's correction handles rare event bias in imbalanced datasets and allows for covariate adjustment."
-            },
-            {
-                "topic": "Data Analysis",
-                "difficulty": "Advanced",
-                "question": "When conducting A/B testing for a feature with multiple variants (A, B, C, D) and sequential monitoring, which multiple comparison correction method minimizes Type I error while maintaining reasonable power?",
-                "options": [
-                    "Bonferroni correction with alpha = 0.05/k",
-                    "Holm-Bonferroni sequential procedure",
-                    "Benjamini-Hochberg FDR control",
-                    "Tukey's HSD for all pairwise comparisons"
-                ],
-                "correct_index": 1,
-                "explanation": "Holm-Bonferroni provides more power than standard Bonferroni while controlling family-wise error rate in sequential testing scenarios."
-            },
-            {
-                "topic": "Data Analysis",
-                "difficulty": "Advanced",
-                "question": "You have time-series data with hourly observations showing strong weekly seasonality and a trend. The residuals exhibit heteroscedasticity and autocorrelation. Which modeling approach is MOST robust?",
-                "options": [
-                    "SARIMA with Box-Cox transformation",
-                    "Prophet with added regressors for special events",
-                    "LSTM neural network with attention mechanism",
-                    "GARCH model for volatility clustering"
-                ],
-                "correct_index": 0,
-                "explanation": "SARIMA with Box-Cox transformation handles seasonality, trend, and can address heteroscedasticity while modeling autocorrelation structure explicitly."
-            }
-        ],
-
-        "Data Science": [
-            {
-                "topic": "Data Science",
-                "difficulty": "Advanced",
-                "question": "You're building a binary classifier for fraud detection where false negatives cost 100x more than false positives. The dataset has 99.9% legitimate transactions. After training, your model has 99.8% accuracy but misses 40% of fraud cases. What's your FIRST strategic adjustment?",
-                "options": [
-                    "Apply Synthetic Minority Oversampling (SMOTE)",
-                    "Use cost-sensitive learning with asymmetric misclassification costs",
-                    "Implement ensemble methods with bagging",
-                    "Collect more features through feature engineering"
-                ],
-                "correct_index": 1,
-                "explanation": "Cost-sensitive learning directly addresses asymmetric business costs by assigning higher penalty to false negatives during optimization."
-            },
-            {
-                "topic": "Data Science",
-                "difficulty": "Advanced",
-                "question": "When deploying an ML model for real-time inference, you observe prediction drift over 6 months despite retraining. The feature distributions remain stable. What's the MOST likely cause and remediation?",
-                "options": [
-                    "Concept drift: Implement continuous monitoring and adaptive learning",
-                    "Covariate shift: Re-weight training samples using importance sampling",
-                    "Label noise: Implement robust loss functions",
-                    "Sample selection bias: Collect more diverse training data"
-                ],
-                "correct_index": 0,
-                "explanation": "Concept drift occurs when relationships between features and target change despite stable feature distributions, requiring adaptive approaches."
-            },
-            {
-                "topic": "Data Science",
-                "difficulty": "Advanced",
-                "question": "You're optimizing a recommendation system's diversity while maintaining relevance. Which approach BEST balances exploration-exploitation for new users with limited interaction history?",
-                "options": [
-                    "Thompson sampling with contextual bandits",
-                    "Upper Confidence Bound (UCB) algorithm",
-                    "ε-greedy with decaying exploration rate",
-                    "LinUCB with feature-based context"
-                ],
-                "correct_index": 3,
-                "explanation": "LinUCB incorporates user features to make personalized exploration decisions, efficiently balancing personalization and discovery for new users."
-            }
-        ],
-
-        "Software Engineering": [
-            {
-                "topic": "Software Engineering",
-                "difficulty": "Advanced",
-                "question": "You're designing a distributed session management system supporting 10M concurrent users with <100ms latency. Which consistency-availability trade-off is OPTIMAL for session data?",
-                "options": [
-                    "Strong consistency with leader-based replication (CP system)",
-                    "Eventual consistency with conflict-free replicated data types (AP system)",
-                    "Causal consistency with version vectors",
-                    "Read-your-writes consistency with sticky sessions"
-                ],
-                "correct_index": 1,
-                "explanation": "Session data tolerates temporary inconsistencies. CRDTs provide conflict resolution in AP systems, ensuring availability while handling partition tolerance."
-            },
-            {
-                "topic": "Software Engineering",
-                "difficulty": "Advanced",
-                "question": "When implementing a circuit breaker pattern for microservices, which metric provides the EARLIEST indication of upstream service degradation?",
-                "options": [
-                    "95th percentile latency increase by 50%",
-                    "Error rate exceeding 5% over 1 minute",
-                    "Request volume dropping by 30%",
-                    "Connection pool exhaustion frequency"
-                ],
-                "correct_index": 1,
-                "explanation": "Error rate is the most direct signal of service health degradation and triggers circuit breakers before latency metrics show significant impact."
-            },
-            {
-                "topic": "Software Engineering",
-                "difficulty": "Advanced",
-                "question": "You're refactoring a monolith to microservices. The original code has tight coupling through global state. Which decomposition strategy MINIMIZES integration complexity while maximizing team autonomy?",
-                "options": [
-                    "Domain-driven design with bounded contexts",
-                    "Strangler pattern with feature-based extraction",
-                    "Database-per-service with event sourcing",
-                    "API gateway with backend-for-frontend pattern"
-                ],
-                "correct_index": 0,
-                "explanation": "DDD's bounded contexts align services with business capabilities, minimizing cross-service dependencies while providing clear ownership boundaries."
-            }
-        ],
-
-        "Business Analysis": [
-            {
-                "topic": "Business Analysis",
-                "difficulty": "Advanced",
-                "question": "When calculating ROI for a digital transformation project with intangible benefits (improved employee satisfaction, brand perception), which valuation method is MOST defensible to executive stakeholders?",
-                "options": [
-                    "Conjoint analysis to quantify willingness-to-pay for features",
-                    "Real options analysis accounting for strategic flexibility",
-                    "Multi-criteria decision analysis with weighted scoring",
-                    "Monte Carlo simulation with sensitivity analysis on intangible factors"
-                ],
-                "correct_index": 2,
-                "explanation": "MCDA transparently incorporates both quantitative and qualitative factors through weighted scoring, making trade-offs explicit to stakeholders."
-            },
-            {
-                "topic": "Business Analysis",
-                "difficulty": "Advanced",
-                "question": "You're facilitating requirements gathering for a cross-functional system with conflicting stakeholder priorities. Which technique BEST surfaces hidden constraints and unstated needs?",
-                "options": [
-                    "Job stories with situation-specific acceptance criteria",
-                    "Contextual inquiry with apprenticeship model",
-                    "MoSCoW prioritization with Kano analysis",
-                    "Design thinking workshops with empathy mapping"
-                ],
-                "correct_index": 1,
-                "explanation": "Contextual inquiry observes users in their natural environment, revealing workarounds and unarticulated needs that traditional interviews miss."
-            },
-            {
-                "topic": "Business Analysis",
-                "difficulty": "Advanced",
-                "question": "When managing scope creep in an Agile project with fixed deadline and budget, which approach MAINTAINS stakeholder trust while controlling scope?",
-                "options": [
-                    "Implement strict change control board with weekly reviews",
-                    "Use weighted shortest job first (WSJF) for backlog prioritization",
-                    "Establish innovation accounting with validated learning metrics",
-                    "Create a 'parking lot' for future iterations with clear trade-offs"
-                ],
-                "correct_index": 3,
-                "explanation": "The parking lot technique acknowledges valuable ideas while deferring them transparently, maintaining stakeholder engagement without compromising current sprint commitments."
-            }
-        ],
-
-        "Logical Reasoning": [
-            {
-                "topic": "Logical Reasoning",
-                "difficulty": "Advanced",
-                "question": "If all A are B, some B are C, no C are D, and all D are E, which conclusion is NECESSARILY true?",
-                "options": [
-                    "Some A are not D",
-                    "No B are E",
-                    "Some E are not C",
-                    "All D are not B"
-                ],
-                "correct_index": 0,
-                "explanation": "Since no C are D and some A are C (through B), those A that are C cannot be D. Therefore, some A are not D."
-            },
-            {
-                "topic": "Logical Reasoning",
-                "difficulty": "Advanced",
-                "question": "In a round-robin tournament with 8 teams where each team plays every other team exactly once, what is the MINIMUM number of games that must be analyzed to guarantee finding the tournament winner if ties are possible?",
-                "options": [
-                    "7",
-                    "14",
-                    "21",
-                    "28"
-                ],
-                "correct_index": 0,
-                "explanation": "The tournament winner must have beaten or tied with all other teams. By analyzing just the games involving one team against all others (7 games), you can determine if that team is undefeated/untied."
-            },
-            {
-                "topic": "Logical Reasoning",
-                "difficulty": "Advanced",
-                "question": "Which pattern completes the sequence: 2, 3, 10, 15, 26, 35, 50, ?",
-                "options": [
-                    "63",
-                    "65",
-                    "67",
-                    "69"
-                ],
-                "correct_index": 0,
-                "explanation": "Pattern: n² + 1 for odd positions (2, 10, 26, 50 = 1²+1, 3²+1, 5²+1, 7²+1) and n² - 1 for even positions (3, 15, 35, 63 = 2²-1, 4²-1, 6²-1, 8²-1)"
-            }
-        ]
-    }
-
+    # ---------- OFFLINE QUESTION BANK ----------
     normalized_topic = topic.strip()
+    bank = offline_bank()
 
     # ---------- POOL SELECTION ----------
     if normalized_topic.upper() == "ALL":
-        pool = []
-        for qs in ADVANCED_QUESTION_BANK.values():
-            pool.extend(qs)
+        pool = [q for qs in bank.values() for q in qs]
     else:
-        pool = ADVANCED_QUESTION_BANK.get(normalized_topic, [])
-    
-    # Fallback to basic topics if advanced not found
-  
-        # Use original QUESTION_BANK as fallback but enhance
-        
+        pool = bank.get(normalized_topic, [])
+
+    # Each stem is served at most once, as stored (the answer key is per
+    # stem), so a small bank returns fewer than `count` questions
+    selected = random.sample(pool, min(count, len(pool)))
 
-    
-    # ---------- ENSURE UNIQUENESS ----------
-    # Generate unique questions by adding variations
-    final_questions = []
-    selected_indices = set()
-    
-    # Try to select unique questions first
-    if len(pool) >= count:
-        selected_indices = set(random.sample(range(len(pool)), min(count, len(pool))))
-    else:
-        selected_indices = set(range(len(pool)))
-        # Need to create variations for remaining questions
-        remaining = count - len(pool)
-        for i in range(remaining):
-            base_idx = i % len(pool)
-            # Create variation by modifying base question
-            base_q = deepcopy(pool[base_idx])
-            base_q["question"] = f"VARIATION {i+1}: " + base_q["question"]
-            # Randomize options and correct index
-            options = base_q["options"]
-            correct_idx = base_q["correct_index"]
-            shuffled = list(enumerate(options))
-            random.shuffle(shuffled)
-            new_indices = [idx for idx, _ in shuffled]
-            base_q["options"] = [opt for _, opt in shuffled]
-            base_q["correct_index"] = new_indices.index(correct_idx)
-            pool.append(base_q)
-            selected_indices.add(len(pool) - 1)
-    
-    # Select final questions
-    selected = [pool[i] for i in selected_indices if i < len(pool)]
-    
-    # Shuffle options for additional uniqueness
-    for q in selected:
-        if random.random() > 0.5:  # 50% chance to shuffle
-            options = q["options"]
-            correct_idx = q["correct_index"]
-            shuffled = list(enumerate(options))
-            random.shuffle(shuffled)
-            new_indices = [idx for idx, _ in shuffled]
-            q["options"] = [opt for _, opt in shuffled]
-            q["correct_index"] = new_indices.index(correct_idx)
-    
     return {
-        "questions": selected[:count]
+        "questions": deepcopy(selected),
+        "mode": MODE_OFFLINE
     }
 
     # ---------- POOL SELECTION ----------
@@ -539,59 +585,177 @@ Evaluation criteria:
 Be rigorous - this is for senior technical role evaluation.
 """
 
-        return {"evaluation": _call_grok(prompt)}
+        return {"evaluation": _call_grok(prompt, cache=True), "mode": MODE_LLM}
 
     except Exception:
-        # Enhanced offline evaluation
-        return {
-            "score": random.randint(6, 9),
-            "technical_accuracy": random.choice(["High", "Medium", "Medium-High"]),
-            "completeness": random.choice(["Comprehensive", "Partial", "Substantial"]),
-            "clarity": random.choice(["Excellent", "Good", "Clear"]),
-            "key_strengths": [
-                "Demonstrates solid understanding of core concepts",
-                "Provides structured response with logical flow",
-                "Uses appropriate technical terminology"
-            ],
-            "areas_for_improvement": [
-                "Could include more specific examples or case studies",
-                "Consider addressing edge cases or limitations",
-                "Opportunity to demonstrate deeper analytical thinking"
-            ],
-            "detailed_feedback": "The response addresses the question adequately with reasonable technical accuracy. To elevate the answer, consider incorporating industry-specific examples, discussing trade-offs, and demonstrating deeper analytical reasoning. For senior roles, showing awareness of implementation complexities and business implications is valuable.",
-            "suggested_improvement": "Enhance your answer by: 1) Citing specific industry applications, 2) Discussing alternative approaches and their trade-offs, 3) Addressing scalability or maintenance considerations, 4) Relating to measurable business outcomes."
-        }
+        return _offline_evaluation()
 
-# ================= VOCABULARY (OFFLINE) =================
 
-def evaluate_vocabulary_stub():
+def _offline_evaluation():
+    # Enhanced offline evaluation
     return {
-        "score": random.randint(70, 90),
-        "verdict": random.choice(["Strong", "Professional", "Articulate", "Advanced"]),
-        "strengths": [
-            "Precise use of industry-specific terminology",
-            "Sophisticated sentence structure with varied syntax",
-            "Effective use of technical jargon appropriately",
-            "Clear logical progression in argument development",
-            "Professional tone maintained throughout response"
+        "mode": MODE_OFFLINE,
+        "score": random.randint(6, 9),
+        "technical_accuracy": random.choice(["High", "Medium", "Medium-High"]),
+        "completeness": random.choice(["Comprehensive", "Partial", "Substantial"]),
+        "clarity": random.choice(["Excellent", "Good", "Clear"]),
+        "key_strengths": [
+            "Demonstrates solid understanding of core concepts",
+            "Provides structured response with logical flow",
+            "Uses appropriate technical terminology"
         ],
-        "improvements": [
-            "Incorporate more domain-specific vocabulary nuances",
-            "Vary transitional phrases for enhanced flow",
-            "Use more concise technical descriptions",
-            "Include strategic pauses for emphasis",
-            "Balance technical depth with accessibility"
+        "areas_for_improvement": [
+            "Could include more specific examples or case studies",
+            "Consider addressing edge cases or limitations",
+            "Opportunity to demonstrate deeper analytical thinking"
         ],
-        "interviewer_feedback": (
-            "The candidate demonstrates strong verbal proficiency with appropriate technical vocabulary. "
-            "Communication is structured and professional, though could benefit from more dynamic delivery "
-            "and strategic emphasis on key points. Overall, verbal communication meets professional standards "
-            "for senior technical roles."
-        ),
-        "word_cloud": ["analytical", "methodology", "optimization", "implementation", "strategy", "quantifiable", "framework", "scalability"],
-        "fluency_score": random.randint(75, 95),
-        "vocabulary_score": random.randint(75, 95),
-        "coherence_score": random.randint(75, 95),
-        "pronunciation_score": random.randint(80, 95),
-        "pace_score": random.randint(70, 90)
+        "detailed_feedback": "The response addresses the question adequately with reasonable technical accuracy. To elevate the answer, consider incorporating industry-specific examples, discussing trade-offs, and demonstrating deeper analytical reasoning. For senior roles, showing awareness of implementation complexities and business implications is valuable.",
+        "suggested_improvement": "Enhance your answer by: 1) Citing specific industry applications, 2) Discussing alternative approaches and their trade-offs, 3) Addressing scalability or maintenance considerations, 4) Relating to measurable business outcomes."
     }
+
+# ================= BATCH ANSWER EVALUATION =================
+
+BATCH_TOKEN_BUDGET = int(os.getenv("LLM_BATCH_TOKEN_BUDGET", "6000"))
+BATCH_MAX_ITEMS = int(os.getenv("LLM_BATCH_MAX_ITEMS", "10"))
+CHARS_PER_TOKEN = 4
+OUTPUT_TOKENS_PER_ITEM = 250
+
+BATCH_EVALUATION_PROMPT = """
+Critically evaluate each of the following technical answers against professional standards.
+Be rigorous - this is for senior technical role evaluation.
+
+Criteria: technical correctness, depth of understanding, structure, industry terminology,
+practical application, edge cases, communication effectiveness.
+
+Return JSON ONLY in this format, with exactly one entry per item id:
+{{
+  "evaluations": [
+    {{
+      "id": <item id>,
+      "score": 0-10,
+      "technical_accuracy": "High/Medium/Low",
+      "completeness": "Comprehensive/Partial/Minimal",
+      "clarity": "Excellent/Good/Fair/Poor",
+      "key_strengths": ["strength1", "strength2"],
+      "areas_for_improvement": ["improvement1", "improvement2"],
+      "detailed_feedback": "Concise technical feedback",
+      "suggested_improvement": "Specific suggestion for better answer"
+    }}
+  ]
+}}
+
+Items:
+{items}
+"""
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _format_batch_item(idx: int, question: str, answer: str) -> str:
+    return f"\n[Item {idx}]\nQuestion:\n{question}\nAnswer:\n{answer}\n"
+
+
+def _pack_batches(items):
+    """Greedily group item indices so each prompt fits the token budget."""
+    base = _estimate_tokens(BATCH_EVALUATION_PROMPT)
+    batches, current, used = [], [], base
+
+    for idx, item in enumerate(items):
+        cost = _estimate_tokens(_format_batch_item(idx, item["question"], item["answer"])) + OUTPUT_TOKENS_PER_ITEM
+        if current and (used + cost > BATCH_TOKEN_BUDGET or len(current) >= BATCH_MAX_ITEMS):
+            batches.append(current)
+            current, used = [], base
+        current.append(idx)
+        used += cost
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _extract_json(text: str):
+    """Parse a JSON object out of a model reply that may carry code fences."""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError("no JSON object in response")
+    return json.loads(text[start:end + 1])
+
+
+EVALUATION_FIELDS = {
+    "score": None,
+    "technical_accuracy": None,
+    "completeness": None,
+    "clarity": None,
+    "key_strengths": [],
+    "areas_for_improvement": [],
+    "detailed_feedback": "",
+    "suggested_improvement": "",
+}
+
+
+def _normalize_evaluation(entry: dict, mode: str) -> dict:
+    """Same keys for every path (batch, single, offline); missing ones get defaults."""
+    result = {key: entry.get(key, deepcopy(default)) for key, default in EVALUATION_FIELDS.items()}
+    result["mode"] = mode
+    return result
+
+
+def _evaluate_single(item):
+    result = evaluate_answer(item["answer"], item["question"])
+    if "evaluation" not in result:
+        return _normalize_evaluation(result, result.get("mode", MODE_OFFLINE))
+    try:
+        return _normalize_evaluation(_extract_json(result["evaluation"]), MODE_LLM)
+    except ValueError:
+        # Unstructured reply: keep the model's text as the feedback
+        return _normalize_evaluation({"detailed_feedback": result["evaluation"]}, MODE_LLM)
+
+
+def evaluate_answers_batch(items):
+    """
+    Evaluate many {"question", "answer"} items with as few provider calls as
+    the token budget allows.
+
+    Items the model leaves out (or returns malformed) are re-evaluated one by
+    one, as is a whole batch whose reply does not parse. Only when the
+    provider call itself fails do its items get the offline evaluation.
+    """
+    results = [None] * len(items)
+
+    for batch in _pack_batches(items):
+        prompt = BATCH_EVALUATION_PROMPT.format(items="".join(
+            _format_batch_item(idx, items[idx]["question"], items[idx]["answer"])
+            for idx in batch
+        ))
+
+        try:
+            reply = _call_grok(prompt, cache=True)
+        except Exception:
+            for idx in batch:
+                results[idx] = _normalize_evaluation(_offline_evaluation(), MODE_OFFLINE)
+            continue
+
+        try:
+            parsed = _extract_json(reply)
+        except ValueError:
+            for idx in batch:
+                results[idx] = _evaluate_single(items[idx])
+            continue
+
+        by_id = {}
+        for entry in parsed.get("evaluations", []):
+            try:
+                by_id[int(entry.get("id"))] = entry
+            except (TypeError, ValueError, AttributeError):
+                continue
+
+        for idx in batch:
+            entry = by_id.get(idx)
+            if isinstance(entry, dict) and "score" in entry:
+                results[idx] = _normalize_evaluation(entry, MODE_LLM)
+            else:
+                results[idx] = _evaluate_single(items[idx])
+
+    return {"evaluations": results}
@@ -0,0 +1,127 @@
+"""
+LLM Load Control
+
+Watches provider latency, error rate and local in-flight calls, and
+decides per request whether the LLM should be tried at all. When the
+provider is slow or failing, routes go straight to their offline
+generators instead of waiting for a timeout.
+
+- "llm" -> "offline" when the windowed error rate or latency EWMA crosses
+  its ENTER threshold
+- while offline, one probe call is let through every PROBE_INTERVAL;
+  PROBE_SUCCESSES fast successes in a row switch back (hysteresis)
+- independent of mode, calls beyond MAX_INFLIGHT are shed to offline
+"""
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# ---------------- CONFIG ----------------
+WINDOW = int(os.getenv("LLM_HEALTH_WINDOW", "20"))
+MIN_SAMPLES = int(os.getenv("LLM_HEALTH_MIN_SAMPLES", "5"))
+ENTER_ERROR_RATE = float(os.getenv("LLM_ENTER_ERROR_RATE", "0.5"))
+ENTER_LATENCY_S = float(os.getenv("LLM_ENTER_LATENCY_SECONDS", "8"))
+EXIT_LATENCY_S = float(os.getenv("LLM_EXIT_LATENCY_SECONDS", "3"))
+PROBE_INTERVAL_S = float(os.getenv("LLM_PROBE_INTERVAL_SECONDS", "15"))
+PROBE_SUCCESSES = int(os.getenv("LLM_PROBE_SUCCESSES", "2"))
+MAX_INFLIGHT = int(os.getenv("LLM_MAX_INFLIGHT", "16"))
+EWMA_ALPHA = 0.3
+
+MODE_LLM = "llm"
+MODE_OFFLINE = "offline"
+
+
+class LLMUnavailable(RuntimeError):
+    """Raised instead of calling the provider while degraded."""
+
+
+class DegradationController:
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.mode = MODE_LLM
+        self._outcomes = deque(maxlen=WINDOW)   # True = error
+        self._latency = None
+        self._inflight = 0
+        self._next_probe = 0.0
+        self._probe_streak = 0
+        self._probing = False
+
+    # ---------- decisions ----------
+    def allow(self) -> bool:
+        """Reserve a slot for an LLM call, or return False to go offline."""
+        with self._lock:
+            if self._inflight >= MAX_INFLIGHT:
+                return False
+            if self.mode == MODE_OFFLINE:
+                now = self._clock()
+                if self._probing or now < self._next_probe:
+                    return False
+                self._probing = True
+                self._next_probe = now + PROBE_INTERVAL_S
+            self._inflight += 1
+            return True
+
+    @contextmanager
+    def track(self):
+        """Wrap an LLM call allowed by allow(); records its outcome."""
+        start = self._clock()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self._record(self._clock() - start, ok)
+
+    # ---------- bookkeeping ----------
+    def _record(self, latency: float, ok: bool):
+        with self._lock:
+            self._inflight -= 1
+            self._latency = latency if self._latency is None else (
+                EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self._latency
+            )
+
+            if self.mode == MODE_OFFLINE:
+                self._probing = False
+                if ok and latency <= EXIT_LATENCY_S:
+                    self._probe_streak += 1
+                    if self._probe_streak >= PROBE_SUCCESSES:
+                        self._switch(MODE_LLM)
+                    else:
+                        # Follow a good probe up quickly
+                        self._next_probe = self._clock()
+                else:
+                    self._probe_streak = 0
+                return
+
+            self._outcomes.append(not ok)
+            if len(self._outcomes) < MIN_SAMPLES:
+                return
+            error_rate = sum(self._outcomes) / len(self._outcomes)
+            if error_rate >= ENTER_ERROR_RATE or self._latency >= ENTER_LATENCY_S:
+                self._switch(MODE_OFFLINE)
+
+    def _switch(self, mode: str):
+        self.mode = mode
+        self._outcomes.clear()
+        self._probe_streak = 0
+        self._probing = False
+        if mode == MODE_OFFLINE:
+            self._next_probe = self._clock() + PROBE_INTERVAL_S
+        else:
+            self._latency = None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "inflight": self._inflight,
+                "latency_ewma_s": round(self._latency, 3) if self._latency is not None else None,
+                "error_rate": round(sum(self._outcomes) / len(self._outcomes), 3) if self._outcomes else 0.0,
+                "window": len(self._outcomes)
+            }
+
+
+controller = DegradationController()
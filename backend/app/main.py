@@ -1,51 +1,40 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, Depends, FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
-from app import auth, resume_parser, llm_client, models
+from app import auth, cache_tier, resume_parser, llm_client, models, rescoring, semantic, storage, vocabulary
+from app.load_control import controller as llm_controller
+from app.middleware import TimingMiddleware
+from app.ratelimit import RateLimitMiddleware, RATE_LIMIT_ENABLED
 from app.analyzer import router as analyzer_router
 from app.aptitude import router as aptitude_router
+from app.analytics import router as analytics_router
+from app.jd_profiles import router as jd_router
+from app.bulk import router as bulk_router
 from db.database import init_db
 
-# 1️⃣ CREATE APP FIRST
-app = FastAPI(title="Career Readiness API (local prototype)")
-
-# 2️⃣ CORS (if you already had it, keep it here)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# 3️⃣ INIT DB (if used)
-init_db()
-
-# 4️⃣ REGISTER ROUTERS
-app.include_router(analyzer_router)
-app.include_router(aptitude_router)
-
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # optional dependency
+    BrotliMiddleware = None
 
 # -----------------------------
-# Startup
+# Config
 # -----------------------------
-init_db()
+CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "http://localhost:5173").split(",") if o.strip()]
+COMPRESSION = os.getenv("COMPRESSION", "gzip")          # gzip | br | none
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+TIMING_HEADER = os.getenv("TIMING_HEADER", "1") == "1"
 
-# -----------------------------
-# Middleware
-# -----------------------------
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+router = APIRouter()
 
 # -----------------------------
 # Auth
 # -----------------------------
-@app.post("/auth/signup")
+@router.post("/auth/signup")
 def signup(
     email: str = Form(...),
     password: str = Form(...),
@@ -59,7 +48,7 @@ def signup(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@app.post("/auth/login")
+@router.post("/auth/login")
 def login(
     email: str = Form(...),
     password: str = Form(...)
@@ -74,21 +63,31 @@ def login(
 # -----------------------------
 # Resume
 # -----------------------------
-@app.post("/resume/upload", response_model=models.ResumeUploadResponse)
-async def upload_resume(file: UploadFile = File(...)):
-    contents = await file.read()
-    saved = resume_parser.save_uploaded_file(contents, file.filename)
+@router.post("/resume/upload", response_model=models.ResumeUploadResponse)
+def upload_resume(file: UploadFile = File(...), user: str = Depends(auth.optional_user)):
+    saved = resume_parser.save_uploaded_stream(file.file, file.filename, owner=user)
     return {"resume_id": saved, "filename": file.filename}
 
 
-@app.post("/resume/parse")
+@router.post("/resume/parse")
 def parse_resume(resume_id: str = Form(...)):
-    return resume_parser.parse_resume(resume_id)
+    try:
+        return resume_parser.parse_resume(resume_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Unknown resume_id")
+
+
+@router.delete("/resume/{resume_id}")
+def delete_resume(resume_id: str, user: str = Depends(auth.get_current_user)):
+    # Unknown ids and other users' uploads look the same to the caller
+    if not storage.release(resume_id, owner=user):
+        raise HTTPException(status_code=404, detail="Unknown resume_id")
+    return {"resume_id": resume_id, "released": True}
 
 # -----------------------------
 # Self Intro
 # -----------------------------
-@app.post("/selfintro/generate")
+@router.post("/selfintro/generate")
 def selfintro(
     name: str = Form(...),
     role: str = Form(...),
@@ -98,26 +97,86 @@ def selfintro(
     return llm_client.generate_self_intro(name, role, length, tone)
 
 # -----------------------------
-# Aptitude
+# Health
 # -----------------------------
-@app.post("/aptitude/questions")
-def aptitude_questions(
-    topic: str = Form(...),
-    count: int = Form(5)
-):
-    return llm_client.generate_aptitude_questions(topic, count)
+@router.get("/health/llm")
+def llm_health():
+    return llm_controller.snapshot()
 
-
-@app.post("/aptitude/evaluate")
-def aptitude_evaluate(
-    question: str = Form(...),
-    answer: str = Form(...)
+# -----------------------------
+# Vocabulary
+# -----------------------------
+@router.post("/vocab/evaluate")
+def vocab_evaluate(
+    transcript: str = Form(...),
+    role: str = Form(None),
+    duration_seconds: float = Form(None, gt=0)
 ):
-    return llm_client.evaluate_answer(answer, question)
+    try:
+        return vocabulary.evaluate_vocabulary(transcript, role, duration_seconds)
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
 
 # -----------------------------
-# Vocabulary (Demo Mode)
+# App factory
 # -----------------------------
-@app.post("/vocab/evaluate")
-def vocab_evaluate():
-    return llm_client.evaluate_vocabulary_stub()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    cache_tier.warm_all()
+    storage.start_gc_thread()
+    rescoring.start_rescore_thread()
+    if semantic.SEMANTIC_WARMUP:
+        semantic.start_warmup()
+    yield
+
+
+def create_app(
+    cors_origins=None,
+    compression: str = None,
+    timing: bool = None,
+    rate_limit: bool = None
+) -> FastAPI:
+    """
+    Build the API with its middleware stack, outermost first:
+    timing -> CORS -> compression -> rate limit -> routes.
+    Arguments default to the environment config above.
+    """
+    cors_origins = CORS_ORIGINS if cors_origins is None else cors_origins
+    compression = COMPRESSION if compression is None else compression
+    timing = TIMING_HEADER if timing is None else timing
+    rate_limit = RATE_LIMIT_ENABLED if rate_limit is None else rate_limit
+
+    init_db()
+
+    app = FastAPI(title="Career Readiness API (local prototype)", lifespan=lifespan)
+
+    app.include_router(router)
+    app.include_router(analyzer_router)
+    app.include_router(aptitude_router)
+    app.include_router(analytics_router)
+    app.include_router(jd_router)
+    app.include_router(bulk_router)
+
+    # add_middleware wraps, so the last one added runs first
+    if rate_limit:
+        app.add_middleware(RateLimitMiddleware)
+    if compression == "br" and BrotliMiddleware is not None:
+        app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MIN_SIZE, gzip_fallback=True)
+    elif compression in ("gzip", "br"):
+        app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+    if cors_origins:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=cors_origins,
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+    if timing:
+        app.add_middleware(TimingMiddleware)
+
+    return app
+
+
+app = create_app()
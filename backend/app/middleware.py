@@ -0,0 +1,28 @@
+"""
+Lightweight ASGI middleware used by the app factory.
+"""
+import time
+
+
+class TimingMiddleware:
+    """Adds a `Server-Timing: app;dur=<ms>` header measured around the app."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                dur = (time.perf_counter() - start) * 1000.0
+                headers = list(message.get("headers", ()))
+                headers.append((b"server-timing", f"app;dur={dur:.2f}".encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
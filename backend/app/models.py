@@ -21,3 +21,25 @@ class ResumeUploadResponse(BaseModel):
 class AnalyzeRequest(BaseModel):
     resume_id: str
     job_text: str
+
+class AnswerItem(BaseModel):
+    question: str
+    answer: str
+
+class BatchEvaluateRequest(BaseModel):
+    items: List[AnswerItem]
+
+class MCQAnswer(BaseModel):
+    question_id: str
+    selected_index: Optional[int] = None
+
+class MCQSubmission(BaseModel):
+    answers: List[MCQAnswer]
+
+class QuizSessionStart(BaseModel):
+    topic: str = "ALL"
+    length: int = 10
+    level: Optional[str] = None
+
+class QuizAnswer(BaseModel):
+    selected_index: Optional[int] = None
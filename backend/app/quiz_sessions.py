@@ -0,0 +1,375 @@
+"""
+Aptitude Quiz Sessions
+
+Server-side quiz sessions over an indexed question bank, so repeat
+sessions show new questions and the client only holds a session id.
+
+- Bank: every stored question (the offline bank plus LLM-generated ones
+  registered by grading) indexed by (topic, difficulty level); a
+  question's bit position is its dense index within its topic, in storage
+  order, so bitmaps stay small and valid across workers and restarts
+- Seen sets: per-session and per-user int bitmaps per topic, persisted as
+  bytes
+- Next question: each (topic, level) bucket is walked in a per-session
+  pseudo-random order (an affine permutation, so only a cursor is stored);
+  skipping seen questions is amortized O(1)
+- Adaptive difficulty: a staircase, two correct answers in a row step the
+  level up and a wrong answer steps it down
+- State: one small JSON row per session, written once per answer with an
+  optimistic version check; the user's seen bits and topic stats are
+  written in the same write transaction, only once the check passes
+"""
+import json
+import math
+import random
+import secrets
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from db.database import get_connection
+from .grading import grade_submission, record_topic_stats
+from .llm_client import offline_bank
+
+# ---------------- CONFIG ----------------
+LEVELS = ["Easy", "Medium", "Advanced", "Expert"]
+DEFAULT_LEVEL = 1
+# Where questions with a missing or unrecognised difficulty are indexed
+UNKNOWN_LEVEL = 1
+STEP_UP_STREAK = 2
+MAX_SESSION_LENGTH = 100
+ALL_TOPICS = "ALL"
+
+_LEVEL_ALIASES = {
+    "easy": 0, "beginner": 0, "basic": 0,
+    "medium": 1, "intermediate": 1,
+    "advanced": 2, "hard": 2,
+    "expert": 3,
+}
+
+PUBLIC_FIELDS = ("id", "topic", "difficulty", "question", "options")
+
+
+class SessionConflict(Exception):
+    """The session changed underneath us (concurrent answer) or is finished."""
+
+
+class SessionGone(Exception):
+    """The session's current question is no longer in the bank."""
+
+
+def level_of(difficulty: Optional[str]) -> int:
+    return _LEVEL_ALIASES.get((difficulty or "").strip().lower(), UNKNOWN_LEVEL)
+
+
+# ---------------- BANK ----------------
+class QuestionBank:
+    """Append-only in-process index over aptitude_questions."""
+
+    def __init__(self):
+        self.questions: Dict[str, dict] = {}
+        # question_id -> (topic, bit position within the topic)
+        self.positions: Dict[str, Tuple[str, int]] = {}
+        self.buckets: Dict[Tuple[str, int], List[str]] = {}
+        self.topic_sizes: Dict[str, int] = {}
+        self._max_seq = 0
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Index questions stored since the last refresh."""
+        offline_bank()
+        with self._lock:
+
+            conn = get_connection()
+            try:
+                rows = conn.execute(
+                    """
+                    SELECT rowid, question_id, topic, difficulty, body FROM aptitude_questions
+                    WHERE rowid > ? AND body IS NOT NULL ORDER BY rowid
+                    """,
+                    (self._max_seq,),
+                ).fetchall()
+            finally:
+                conn.close()
+
+            for row in rows:
+                qid = row["question_id"]
+                question = json.loads(row["body"])
+                question["id"] = qid
+                topic = row["topic"] or ""
+                level = level_of(row["difficulty"])
+                self.questions[qid] = {k: question[k] for k in PUBLIC_FIELDS if k in question}
+                self.positions[qid] = (topic, self.topic_sizes.get(topic, 0))
+                self.topic_sizes[topic] = self.topic_sizes.get(topic, 0) + 1
+                self.buckets.setdefault((topic, level), []).append(qid)
+                self.buckets.setdefault((ALL_TOPICS, level), []).append(qid)
+                self._max_seq = row["rowid"]
+
+    def has_topic(self, topic: str) -> bool:
+        return topic == ALL_TOPICS and bool(self.questions) or topic in self.topic_sizes
+
+
+bank = QuestionBank()
+
+
+# ---------------- SELECTION ----------------
+def _level_order(level: int):
+    """Current level first, then the nearest ones (lower before higher)."""
+    yield level
+    for d in range(1, len(LEVELS)):
+        if level - d >= 0:
+            yield level - d
+        if level + d < len(LEVELS):
+            yield level + d
+
+
+def _permutation(seed: int, key: str, n: int) -> Tuple[int, int]:
+    rng = random.Random(f"{seed}:{key}")
+    offset = rng.randrange(n)
+    stride = rng.randrange(1, n) if n > 1 else 1
+    while math.gcd(stride, n) != 1:
+        stride += 1
+    return offset, stride
+
+
+def _is_set(bitmaps: Dict[str, int], qid: str) -> bool:
+    topic, bit = bank.positions[qid]
+    return bool(bitmaps.get(topic, 0) >> bit & 1)
+
+
+def _decode(bitmaps: Dict[str, str]) -> Dict[str, int]:
+    return {topic: int(bits, 16) for topic, bits in bitmaps.items()}
+
+
+def _advance(state: dict, level: int, blocked: Dict[str, int]) -> Optional[str]:
+    items = bank.buckets.get((state["topic"], level))
+    if not items:
+        return None
+
+    key = f"{state['topic']}|{level}"
+    # The bucket size is pinned on first use; questions added later are
+    # left to the next session
+    cursor = state["cursors"].setdefault(key, [0, len(items)])
+    step, n = cursor
+    offset, stride = _permutation(state["seed"], key, n)
+
+    while step < n:
+        qid = items[(offset + step * stride) % n]
+        step += 1
+        if not _is_set(blocked, qid):
+            cursor[0] = step
+            return qid
+    cursor[0] = step
+    return None
+
+
+def _pick_next(state: dict) -> Optional[str]:
+    seen = _decode(state["seen"])
+    user_seen = _decode(state["user_seen"])
+    blocked = {t: seen.get(t, 0) | user_seen.get(t, 0) for t in seen.keys() | user_seen.keys()}
+    for level in _level_order(state["level"]):
+        qid = _advance(state, level, blocked)
+        if qid is not None:
+            return qid
+
+    # Everything unseen is used up: allow questions from earlier sessions
+    for level in _level_order(state["level"]):
+        for qid in bank.buckets.get((state["topic"], level), ()):
+            if not _is_set(seen, qid):
+                return qid
+    return None
+
+
+def _serve(state: dict):
+    qid = None
+    if state["asked"] < state["length"]:
+        qid = _pick_next(state)
+    state["current"] = qid
+    if qid is not None:
+        topic, bit = bank.positions[qid]
+        state["seen"][topic] = format(int(state["seen"].get(topic, "0"), 16) | 1 << bit, "x")
+
+
+# ---------------- PERSISTENCE ----------------
+def _to_bytes(bitmap: int) -> bytes:
+    return bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+
+
+def _load_user_seen(conn, user: str, topic: str = ALL_TOPICS) -> Dict[str, int]:
+    if not user:
+        return {}
+    if topic == ALL_TOPICS:
+        rows = conn.execute("SELECT topic, seen FROM aptitude_seen WHERE user = ?", (user,)).fetchall()
+    else:
+        rows = conn.execute(
+            "SELECT topic, seen FROM aptitude_seen WHERE user = ? AND topic = ?", (user, topic)
+        ).fetchall()
+    return {row["topic"]: int.from_bytes(row["seen"], "little") for row in rows}
+
+
+def _load(session_id: str) -> Optional[dict]:
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            "SELECT state FROM aptitude_sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+    return json.loads(row["state"]) if row else None
+
+
+def _save(session_id: str, state: dict, expected_version: Optional[int],
+          stats: Optional[dict] = None):
+    """
+    Write the session under SQLite's write lock, then merge its seen bits
+    into the user's and add the graded topic stats. Raises SessionConflict
+    (writing nothing) if another answer saved first.
+    """
+    now = datetime.utcnow().isoformat()
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        state["version"] = (expected_version or 0) + 1
+        encoded = json.dumps(state, separators=(",", ":"))
+        if expected_version is None:
+            conn.execute(
+                "INSERT INTO aptitude_sessions (session_id, user, state, updated_at) VALUES (?, ?, ?, ?)",
+                (session_id, state["user"], encoded, now),
+            )
+        else:
+            cur = conn.execute(
+                """
+                UPDATE aptitude_sessions SET state = ?, updated_at = ?
+                WHERE session_id = ? AND json_extract(state, '$.version') = ?
+                """,
+                (encoded, now, session_id, expected_version),
+            )
+            if cur.rowcount == 0:
+                conn.rollback()
+                raise SessionConflict("Session was updated concurrently; reload it")
+
+        if state["user"]:
+            # Re-read under the lock so another session's bits are kept
+            stored = _load_user_seen(conn, state["user"], state["topic"])
+            conn.executemany(
+                "INSERT OR REPLACE INTO aptitude_seen (user, topic, seen) VALUES (?, ?, ?)",
+                [
+                    (state["user"], topic, _to_bytes(stored.get(topic, 0) | bits))
+                    for topic, bits in _decode(state["seen"]).items()
+                ],
+            )
+        if stats:
+            record_topic_stats(conn, state["user"], stats)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+# ---------------- API ----------------
+def _view(session_id: str, state: dict) -> dict:
+    current = state["current"]
+    return {
+        "session_id": session_id,
+        "topic": state["topic"],
+        "level": LEVELS[state["level"]],
+        "asked": state["asked"],
+        "correct": state["correct"],
+        "length": state["length"],
+        "finished": current is None,
+        "question": bank.questions.get(current) if current is not None else None
+    }
+
+
+def start_session(user: Optional[str], topic: str = ALL_TOPICS, length: int = 10,
+                  level: Optional[str] = None) -> dict:
+    """Open a session and serve its first question; raises KeyError for an empty topic."""
+    bank.refresh()
+    topic = (topic or ALL_TOPICS).strip()
+    if topic.upper() == ALL_TOPICS:
+        topic = ALL_TOPICS
+    if not bank.has_topic(topic):
+        raise KeyError(topic)
+
+    user = (user or "").strip()
+    conn = get_connection()
+    try:
+        user_seen = _load_user_seen(conn, user, topic)
+    finally:
+        conn.close()
+
+    state = {
+        "user": user,
+        "topic": topic,
+        "length": max(1, min(length, MAX_SESSION_LENGTH)),
+        "level": level_of(level) if level else DEFAULT_LEVEL,
+        "streak": 0,
+        "asked": 0,
+        "correct": 0,
+        "seed": secrets.randbits(32),
+        "cursors": {},
+        "seen": {},
+        "user_seen": {t: format(bits, "x") for t, bits in user_seen.items()},
+        "current": None
+    }
+    _serve(state)
+
+    session_id = secrets.token_urlsafe(12)
+    _save(session_id, state, None)
+    return _view(session_id, state)
+
+
+def _ensure_current(state: dict):
+    """Index new rows if another worker served the current question; raises SessionGone."""
+    current = state["current"]
+    if current is not None and current not in bank.questions:
+        bank.refresh()
+        if current not in bank.questions:
+            raise SessionGone("The current question is no longer available; start a new session")
+
+
+def get_session(session_id: str) -> Optional[dict]:
+    state = _load(session_id)
+    if state is None:
+        return None
+    _ensure_current(state)
+    return _view(session_id, state)
+
+
+def answer_question(session_id: str, selected_index: Optional[int]) -> Optional[dict]:
+    """
+    Grade the current question, adapt the level and serve the next one.
+    Returns None for an unknown session.
+    """
+    state = _load(session_id)
+    if state is None:
+        return None
+    if state["current"] is None:
+        raise SessionConflict("Session is finished")
+    _ensure_current(state)
+
+    question = bank.questions[state["current"]]
+    # Stats are written by _save, so a conflicting answer is not counted
+    graded = grade_submission(
+        [{"question_id": question["id"], "selected_index": selected_index}],
+        record=False
+    )
+    result = graded["results"][0]
+    correct = bool(result.get("correct"))
+
+    state["asked"] += 1
+    state["correct"] += correct
+    if correct:
+        state["streak"] += 1
+        if state["streak"] >= STEP_UP_STREAK:
+            state["level"] = min(state["level"] + 1, len(LEVELS) - 1)
+            state["streak"] = 0
+    else:
+        state["streak"] = 0
+        state["level"] = max(state["level"] - 1, 0)
+
+    _serve(state)
+    _save(session_id, state, state["version"], stats=graded["topics"])
+    return {"result": result, **_view(session_id, state)}
@@ -0,0 +1,240 @@
+"""
+Rate Limiting
+
+Token buckets keyed by user (JWT "sub") or client IP. Each route spends a
+cost that reflects how heavy it is (PDF parsing, LLM calls, bcrypt), and
+buckets refill continuously.
+
+- Default backend: in-memory, per worker process
+- RATE_LIMIT_BACKEND=sqlite shares buckets between workers on one host
+  through a small WAL-mode SQLite file
+- Implemented as plain ASGI middleware so an allowed request costs one
+  dict lookup and a bucket update; the SQLite backend runs in the
+  threadpool so a busy file never stalls the event loop
+- Buckets idle long enough to have refilled are dropped (they would read
+  as full anyway), and the in-memory table is capped
+- If the shared store errors, requests are let through and logged
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from jose import JWTError, jwt
+from starlette.concurrency import run_in_threadpool
+
+from .auth import SECRET_KEY, ALGORITHM
+
+logger = logging.getLogger(__name__)
+
+# ---------------- CONFIG ----------------
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_CAPACITY = float(os.getenv("RATE_LIMIT_CAPACITY", "60"))
+RATE_LIMIT_REFILL_PER_SEC = float(os.getenv("RATE_LIMIT_REFILL_PER_SEC", "1"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+RATE_LIMIT_SQLITE_PATH = Path(os.getenv(
+    "RATE_LIMIT_SQLITE_PATH",
+    Path(__file__).resolve().parent.parent / "db" / "ratelimit.db"
+))
+
+DEFAULT_COST = 1.0
+
+# Relative weight of each route (CPU-heavy parsing, LLM round-trips, bcrypt)
+ROUTE_COSTS = {
+    "/analyze/resume/analyze": 10.0,
+    "/resume/parse": 5.0,
+    "/resume/upload": 2.0,
+    "/selfintro/generate": 5.0,
+    "/aptitude/questions": 5.0,
+    "/aptitude/evaluate": 5.0,
+    "/aptitude/evaluate/batch": 15.0,
+    "/bulk/screen": 50.0,
+    "/auth/login": 5.0,
+    "/auth/signup": 5.0,
+}
+
+_TOKEN_CACHE_SIZE = 4096
+_PURGE_EVERY_TAKES = 1000
+
+
+def _refill_seconds(capacity: float, rate: float) -> float:
+    return capacity / rate if rate > 0 else float("inf")
+
+
+# ---------------- BACKENDS ----------------
+class MemoryBackend:
+    blocking = False
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self._lock = threading.Lock()
+        # Least recently used first, so idle buckets sit at the front
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._max_keys = max_keys
+
+    def take(self, key: str, cost: float, capacity: float, rate: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            buckets = self._buckets
+            tokens, last = buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            buckets[key] = (tokens, now)
+            self._evict(now - _refill_seconds(capacity, rate))
+
+        if allowed:
+            return True, 0.0
+        return False, (cost - tokens) / rate if rate > 0 else 60.0
+
+    def _evict(self, idle_before: float):
+        buckets = self._buckets
+        while buckets:
+            oldest, (_, last) = next(iter(buckets.items()))
+            if last > idle_before and len(buckets) <= self._max_keys:
+                break
+            del buckets[oldest]
+
+
+class SQLiteBackend:
+    """Buckets shared by every worker on the host via one WAL SQLite file."""
+    blocking = True
+
+    def __init__(self, path: Path = RATE_LIMIT_SQLITE_PATH):
+        self._path = str(path)
+        self._local = threading.local()
+        self._takes = 0
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, ts REAL NOT NULL)"
+        )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=1.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, cost: float, capacity: float, rate: float) -> Tuple[bool, float]:
+        # Wall clock: monotonic clocks are not comparable across processes
+        now = time.time()
+        try:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tokens, ts FROM buckets WHERE key = ?", (key,)).fetchone()
+                tokens = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+                allowed = tokens >= cost
+                if allowed:
+                    tokens -= cost
+                conn.execute(
+                    "INSERT OR REPLACE INTO buckets (key, tokens, ts) VALUES (?, ?, ?)",
+                    (key, tokens, now),
+                )
+                self._takes += 1
+                if self._takes % _PURGE_EVERY_TAKES == 0:
+                    conn.execute("DELETE FROM buckets WHERE ts < ?", (now - _refill_seconds(capacity, rate),))
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    try:
+                        conn.execute("ROLLBACK")
+                    except sqlite3.Error:
+                        pass  # keep the original error
+                raise
+        except sqlite3.Error:
+            # Fail open: a locked or broken limiter must not turn into 500s
+            logger.warning("rate limiter store unavailable; allowing request", exc_info=True)
+            return True, 0.0
+        if allowed:
+            return True, 0.0
+        return False, (cost - tokens) / rate if rate > 0 else 60.0
+
+
+def make_backend(name: str = RATE_LIMIT_BACKEND):
+    if name == "sqlite":
+        return SQLiteBackend()
+    return MemoryBackend()
+
+
+# ---------------- IDENTITY ----------------
+_token_subjects = {}
+
+
+def _subject_from_token(token: str) -> Optional[str]:
+    cached = _token_subjects.get(token)
+    if cached is not None:
+        sub, exp = cached
+        return sub if exp is None or exp > time.time() else None
+
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+
+    sub = claims.get("sub")
+    if sub:
+        if len(_token_subjects) >= _TOKEN_CACHE_SIZE:
+            _token_subjects.clear()
+        _token_subjects[token] = (sub, claims.get("exp"))
+    return sub
+
+
+def client_key(scope) -> str:
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                sub = _subject_from_token(token)
+                if sub:
+                    return f"user:{sub}"
+            break
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+# ---------------- MIDDLEWARE ----------------
+class RateLimitMiddleware:
+    def __init__(self, app, backend=None, capacity: float = RATE_LIMIT_CAPACITY,
+                 refill_per_sec: float = RATE_LIMIT_REFILL_PER_SEC, route_costs=None):
+        self.app = app
+        self.backend = backend or make_backend()
+        self.capacity = capacity
+        self.rate = refill_per_sec
+        self.route_costs = ROUTE_COSTS if route_costs is None else route_costs
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        cost = self.route_costs.get(scope["path"], DEFAULT_COST)
+        args = (client_key(scope), cost, self.capacity, self.rate)
+        if self.backend.blocking:
+            allowed, retry_after = await run_in_threadpool(self.backend.take, *args)
+        else:
+            allowed, retry_after = self.backend.take(*args)
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Rate limit exceeded"}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(max(1, int(retry_after + 0.999))).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,209 @@
+"""
+Analysis Store & Incremental Re-scoring
+
+Every analysis is persisted with the intermediate features its score was
+computed from:
+
+- skills: resume skills matched under the current taxonomy
+- text_length: drives the format score
+- token_overlap / jd_token_count: drive the keyword score
+
+When the scoring weights version changes, stale analyses are re-scored
+from those features alone. When the skill taxonomy changes, resume skills
+are re-matched from the cached extracted text and the JD is re-parsed from
+its stored text; raw PDFs/DOCX are never re-extracted. Analyses whose text
+is no longer cached are left as they are.
+"""
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Optional
+
+from db.database import get_connection
+from . import storage
+from .jd_profiles import JDProfile, get_profile, reparse_profile
+from .resume_parser import match_skill_spans
+from .scorer import WEIGHTS_VERSION, compute_score_from_features, format_score_for_length, \
+    keyword_score_for_counts, tokenize
+from .skill_registry import TAXONOMY_VERSION, SkillSet
+
+logger = logging.getLogger(__name__)
+
+# ---------------- CONFIG ----------------
+RESCORE_ON_START = os.getenv("RESCORE_ON_START", "1") == "1"
+RESCORE_BATCH_SIZE = int(os.getenv("RESCORE_BATCH_SIZE", "500"))
+
+_rescore_thread = None
+
+
+# ---------------- FEATURES ----------------
+def extract_features(resume_skills: SkillSet, resume_text: str, profile: JDProfile) -> dict:
+    overlap = len(profile.tokens & tokenize(resume_text)) if resume_text else 0
+    return {
+        "skills": resume_skills.names(),
+        "text_length": len(resume_text or ""),
+        "token_overlap": overlap,
+        "jd_token_count": profile.token_count
+    }
+
+
+def score_features(resume_skills: SkillSet, features: dict, profile: JDProfile, spans=None) -> dict:
+    """
+    Match and score one resume's features against a JD profile. With the
+    matcher's `spans`, matched skills also get their evidence offsets.
+    """
+    matched = resume_skills & profile.skill_set
+    missing = profile.skill_set - resume_skills
+
+    breakdown, total_score = compute_score_from_features(
+        jd_skills=profile.skills,
+        matched=matched,
+        missing=missing,
+        keyword_score=keyword_score_for_counts(features["token_overlap"], features["jd_token_count"]),
+        format_score=format_score_for_length(features["text_length"])
+    )
+
+    result = {
+        "total_score": total_score,
+        "breakdown": breakdown,
+        "matched_skills": matched.names(),
+        "missing_skills": missing.names()
+    }
+    if spans is not None:
+        result["skill_evidence"] = {skill: spans[skill] for skill in result["matched_skills"] if skill in spans}
+    return result
+
+
+# ---------------- STORE ----------------
+def record_result(resume_id: str, jd_id: str, role: Optional[str], features: dict, result: dict) -> int:
+    conn = get_connection()
+    try:
+        cur = conn.execute(
+            """
+            INSERT INTO analyses (resume_id, jd_id, role, created_at, taxonomy_version,
+                                  weights_version, features, total_score, result)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                resume_id, jd_id, role, datetime.utcnow().isoformat(),
+                TAXONOMY_VERSION, WEIGHTS_VERSION, json.dumps(features),
+                result["total_score"], json.dumps(result),
+            ),
+        )
+        conn.commit()
+        return cur.lastrowid
+    finally:
+        conn.close()
+
+
+def stale_count() -> int:
+    conn = get_connection()
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM analyses WHERE weights_version != ? OR taxonomy_version != ?",
+            (WEIGHTS_VERSION, TAXONOMY_VERSION),
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+
+# ---------------- RE-SCORING ----------------
+def _rescore_row(row, profiles: dict):
+    """Return (features, result) for a stale row, or None if it cannot be redone."""
+    features = json.loads(row["features"])
+    retaxonomize = row["taxonomy_version"] != TAXONOMY_VERSION
+
+    jd_id = row["jd_id"]
+    if jd_id not in profiles:
+        profiles[jd_id] = reparse_profile(jd_id) if retaxonomize else get_profile(jd_id)
+    profile = profiles[jd_id]
+    if profile is None:
+        return None
+
+    if retaxonomize:
+        text = storage.read_text(row["resume_id"])
+        if text is None:
+            return None
+        skills, spans = match_skill_spans(text)
+        features["skills"] = skills.names()
+    else:
+        skills = SkillSet.from_names(features["skills"])
+        spans = json.loads(row["result"]).get("skill_evidence")
+
+    return features, score_features(skills, features, profile, spans)
+
+
+def rescore_pending(batch_size: int = RESCORE_BATCH_SIZE) -> dict:
+    """
+    Re-score every analysis recorded under an older weights or taxonomy
+    version. Returns counts for logging.
+    """
+    rescored = skipped = 0
+    last_id = 0
+    profiles = {}
+
+    while True:
+        conn = get_connection()
+        try:
+            rows = conn.execute(
+                """
+                SELECT id, resume_id, jd_id, taxonomy_version, features, result FROM analyses
+                WHERE id > ? AND (weights_version != ? OR taxonomy_version != ?)
+                ORDER BY id LIMIT ?
+                """,
+                (last_id, WEIGHTS_VERSION, TAXONOMY_VERSION, batch_size),
+            ).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            break
+
+        # Re-scoring reads (and may update) JD profiles and the text cache,
+        # so the batch is computed before this pass takes the write lock
+        updates = []
+        for row in rows:
+            last_id = row["id"]
+            redone = _rescore_row(row, profiles)
+            if redone is None:
+                skipped += 1
+                continue
+            features, result = redone
+            updates.append((
+                TAXONOMY_VERSION, WEIGHTS_VERSION, json.dumps(features),
+                result["total_score"], json.dumps(result), row["id"],
+            ))
+
+        conn = get_connection()
+        try:
+            conn.executemany(
+                """
+                UPDATE analyses SET taxonomy_version = ?, weights_version = ?,
+                    features = ?, total_score = ?, result = ?
+                WHERE id = ?
+                """,
+                updates,
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        rescored += len(updates)
+
+    return {"rescored": rescored, "skipped": skipped}
+
+
+def _rescore_job():
+    try:
+        stats = rescore_pending()
+        if stats["rescored"] or stats["skipped"]:
+            logger.info("rescore (weights %s, taxonomy %s): %s", WEIGHTS_VERSION, TAXONOMY_VERSION, stats)
+    except Exception:
+        logger.exception("rescore failed")
+
+
+def start_rescore_thread():
+    global _rescore_thread
+    if _rescore_thread is None and RESCORE_ON_START:
+        _rescore_thread = threading.Thread(target=_rescore_job, name="rescore", daemon=True)
+        _rescore_thread.start()
@@ -1,40 +1,51 @@
-import os, uuid
-from pathlib import Path
-import pdfplumber
-from docx import Document
+import bisect
+import os
+import re
+from typing import Dict, Tuple
+
 from rapidfuzz import fuzz
 
+from .cache_tier import TieredCache
+from .skill_registry import CANONICAL_SKILLS, TAXONOMY_VERSION, SkillSet, category_of
+from . import extractors, semantic, storage
+from .singleflight import SingleFlight
+
 # ---------------- CONFIG ----------------
-DATA_DIR = Path(os.getenv("STORAGE_PATH", "./data"))
-DATA_DIR.mkdir(parents=True, exist_ok=True)
+DATA_DIR = storage.DATA_DIR
+
+TEXT_CACHE_SIZE = int(os.getenv("TEXT_CACHE_SIZE", "1024"))
+
+# Concurrent parses of the same upload share one extraction
+_flights = SingleFlight()
+
+# Fuzzy skill matches per upload digest, shared across workers
+_skill_cache = TieredCache("resume_skills", TEXT_CACHE_SIZE)
 
-CANONICAL_SKILLS = [
-    "Python", "JavaScript", "React", "Node.js", "TypeScript", "SQL",
-    "Machine Learning", "Data Analysis", "Communication",
-    "Git", "Docker", "AWS"
-]
+# Resume headings -> section name used for span attribution
+SECTION_HEADINGS = {
+    "summary": "summary", "profile": "summary", "objective": "summary", "about me": "summary",
+    "experience": "experience", "work experience": "experience",
+    "professional experience": "experience", "employment": "experience",
+    "employment history": "experience", "internships": "experience",
+    "education": "education", "academics": "education",
+    "skills": "skills", "technical skills": "skills", "core skills": "skills",
+    "projects": "projects", "personal projects": "projects",
+    "certifications": "certifications", "certificates": "certifications",
+    "achievements": "achievements", "awards": "achievements",
+}
+DEFAULT_SECTION = "header"
+
+_HEADING_RE = re.compile(
+    r"^[ \t]*(" + "|".join(sorted(map(re.escape, SECTION_HEADINGS), key=len, reverse=True)) + r")[ \t]*(?::|$)",
+    re.IGNORECASE | re.MULTILINE,
+)
 
 # ---------------- STORAGE ----------------
-def save_uploaded_file(file_bytes: bytes, filename: str) -> str:
-    rid = str(uuid.uuid4())
-    dest = DATA_DIR / f"{rid}__{filename}"
-    with open(dest, "wb") as f:
-        f.write(file_bytes)
-    return dest.name
-
-# ---------------- TEXT EXTRACTION ----------------
-def extract_text_from_pdf(path: Path) -> str:
-    text = []
-    with pdfplumber.open(path) as pdf:
-        for p in pdf.pages:
-            page_text = p.extract_text()
-            if page_text:
-                text.append(page_text)
-    return "\n".join(text)
-
-def extract_text_from_docx(path: Path) -> str:
-    doc = Document(path)
-    return "\n".join(p.text for p in doc.paragraphs if p.text)
+def save_uploaded_file(file_bytes: bytes, filename: str, owner: str = None) -> str:
+    return storage.put(file_bytes, filename, owner)
+
+def save_uploaded_stream(fileobj, filename: str, owner: str = None) -> str:
+    return storage.put_stream(fileobj, filename, owner)
 
 # ---------------- SKILL EXTRACTION ----------------
 def extract_skills(text: str, threshold=75):
@@ -45,37 +56,147 @@ def extract_skills(text: str, threshold=75):
             matches.append(skill)
     return sorted(set(matches))
 
+def extract_skill_set(text: str, threshold=75) -> SkillSet:
+    return match_skill_spans(text, threshold)[0]
+
+def match_skill_spans(text: str, threshold=75) -> Tuple[SkillSet, Dict[str, dict]]:
+    """
+    Fuzzy-match the canonical skills and keep where each one was found.
+
+    partial_ratio_alignment scores exactly like partial_ratio but also
+    returns the aligned window, so the offsets come with the match. Spans
+    are {"start", "end", "section"} character offsets into `text`.
+    """
+    text_lower = text.lower()
+    spans = {}
+    for skill in CANONICAL_SKILLS:
+        alignment = fuzz.partial_ratio_alignment(skill.lower(), text_lower, score_cutoff=threshold)
+        if alignment is not None:
+            spans[skill] = {"start": alignment.dest_start, "end": alignment.dest_end}
+
+    if spans:
+        starts, names = [], []
+        for m in _HEADING_RE.finditer(text):
+            starts.append(m.start())
+            names.append(SECTION_HEADINGS[m.group(1).lower()])
+        for span in spans.values():
+            i = bisect.bisect_right(starts, span["start"]) - 1
+            span["section"] = names[i] if i >= 0 else DEFAULT_SECTION
+
+    return SkillSet.from_names(spans), spans
+
+# ---------------- TEXT CACHE ----------------
+# resume_id -> utf-8 bytes; parsed records keep a reference to the cached
+# object rather than holding their own copy of the text.
+_text_cache = {}
+
+def cache_text(resume_id: str, text: str) -> bytes:
+    raw = _text_cache.get(resume_id)
+    if raw is None:
+        raw = text.encode("utf-8")
+        if len(_text_cache) >= TEXT_CACHE_SIZE:
+            _text_cache.pop(next(iter(_text_cache)))
+        _text_cache[resume_id] = raw
+    return raw
+
+def _cached_skill_spans(filepath: str, txt: str) -> Tuple[SkillSet, Dict[str, dict]]:
+    digest, _ = storage.split_resume_id(filepath)
+    if digest is None:
+        return match_skill_spans(txt)
+
+    key = _skill_cache.key(digest, TAXONOMY_VERSION)
+    cached = _skill_cache.get(key)
+    if cached is None:
+        skills, spans = match_skill_spans(txt)
+        _skill_cache.put(key, {"skills": skills.names(), "spans": spans})
+        return skills, spans
+    return SkillSet.from_names(cached["skills"]), cached["spans"]
+
 # ---------------- BASIC PARSER (USED BY UI) ----------------
-def parse_resume(filepath: str) -> dict:
-    p = DATA_DIR / filepath
+def _extract_text(filepath: str) -> str:
+    digest, _ = storage.split_resume_id(filepath)
+    return _flights.do(("text", digest or filepath), _extract_text_uncoalesced, filepath)
+
+def _extract_text_uncoalesced(filepath: str) -> str:
+    cached = storage.read_text(filepath)
+    if cached is not None:
+        return cached
 
-    if filepath.lower().endswith(".pdf"):
-        txt = extract_text_from_pdf(p)
-    elif filepath.lower().endswith(".docx"):
-        txt = extract_text_from_docx(p)
-    else:
-        with open(p, "r", encoding="utf-8", errors="ignore") as f:
-            txt = f.read()
+    _, filename = storage.split_resume_id(filepath)
+    with storage.open_buffer(filepath) as buf:
+        txt = extractors.extract(buf, storage.resolve(filepath), filename)
 
-    skills_found = extract_skills(txt)
+    storage.write_text(filepath, txt)
+    return txt
+
+def parse_resume(filepath: str) -> dict:
+    txt = _extract_text(filepath)
+    skills_found, _ = _cached_skill_spans(filepath, txt)
 
     return {
         "text": txt,
-        "skills": skills_found
+        "skills": skills_found.names()
     }
 
 # ---------------- STRUCTURED PARSER (USED BY ANALYZER) ----------------
-def parse_resume_structured(filepath: str) -> dict:
+class ParsedResume:
+    """
+    Compact parsed resume for batch screening.
+
+    Skills are a SkillSet bitmask and the text is a reference to the shared
+    cached bytes; sections the parser does not fill yet are class defaults.
+    """
+    __slots__ = ("resume_id", "skills", "_raw", "spans")
+
+    confidence = 0.9
+    projects = ()
+    experience = ()
+    education = ()
+    summary = ""
+
+    def __init__(self, resume_id: str, skills: SkillSet, raw: bytes, spans=None):
+        self.resume_id = resume_id
+        self.skills = skills
+        self._raw = raw
+        self.spans = spans or {}
+
+    @property
+    def raw_text(self) -> str:
+        return self._raw.decode("utf-8")
+
+    def to_dict(self) -> dict:
+        """Legacy dict shape of the structured parser."""
+        return {
+            "raw_text": self.raw_text,
+            "skills": {
+                skill: {"confidence": self.confidence, "category": category_of(skill)}
+                for skill in self.skills
+            },
+            "projects": list(self.projects),
+            "experience": list(self.experience),
+            "education": list(self.education),
+            "summary": self.summary
+        }
+
+
+def parse_resume_structured(filepath: str, semantic_budget_ms: float = 0) -> ParsedResume:
     """
     Canonical structured output for analyzer pipeline.
+
+    With a positive `semantic_budget_ms` the semantic matcher is tried first;
+    fuzzy matching is used when it is unavailable or runs over budget. Only
+    fuzzy matches carry span offsets.
     """
-    base = parse_resume(filepath)
+    txt = _extract_text(filepath)
 
-    return {
-        "raw_text": base["text"],
-        "skills": {skill: {"confidence": 0.9, "category": ""} for skill in base["skills"]},
-        "projects": [],
-        "experience": [],
-        "education": [],
-        "summary": ""
-    }
+    spans = None
+    skills = semantic.match_skills(txt, semantic_budget_ms)
+    if skills is None:
+        skills, spans = _cached_skill_spans(filepath, txt)
+
+    return ParsedResume(
+        resume_id=filepath,
+        skills=skills,
+        raw=cache_text(filepath, txt),
+        spans=spans
+    )
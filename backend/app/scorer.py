@@ -8,28 +8,84 @@ Responsibilities:
 - Add basic resume format quality signal
 
 This module is intentionally deterministic and explainable.
+
+Weights and penalties are versioned configuration in
+data/scoring_weights.json; bump "version" whenever they change so stored
+analyses get re-scored.
 """
+import json
+import os
+from pathlib import Path
+
+SCORING_WEIGHTS_PATH = Path(os.getenv(
+    "SCORING_WEIGHTS_PATH",
+    Path(__file__).resolve().parent.parent / "data" / "scoring_weights.json"
+))
+
+DEFAULT_WEIGHTS = {
+    "version": 1,
+    "components": {"skills": 0.50, "keywords": 0.20, "experience": 0.20, "format": 0.05},
+    "priority_weights": {"must": 2.0, "preferred": 1.5, "nice-to-have": 1.0},
+    "missing_penalties": {"must": 15, "preferred": 7, "nice-to-have": 3},
+    "penalty_cap": 40
+}
+
+
+def _merge(base: dict, override: dict) -> dict:
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+def load_weights(path: Path = SCORING_WEIGHTS_PATH) -> dict:
+    """Read the weights file; missing sections and keys fall back to the defaults."""
+    weights = json.loads(json.dumps(DEFAULT_WEIGHTS))
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            _merge(weights, json.load(f))
+    except (OSError, ValueError):
+        pass
+    weights["version"] = str(weights["version"])
+    return weights
+
+
+WEIGHTS = load_weights()
+WEIGHTS_VERSION = WEIGHTS["version"]
+PRIORITY_WEIGHTS = WEIGHTS["priority_weights"]
+
 
-def compute_skill_score(jd_skills, matched, missing):
+def priority_weight(priority, weights=None):
+    table = (weights or WEIGHTS)["priority_weights"]
+    return table.get(priority or "preferred", 1.0)
+
+
+def skill_weight(entry, weights=None):
+    """
+    Weight of one JD skill entry: the one JD profiles precompute when
+    present (0 included), else its priority's weight under `weights`.
+    """
+    weight = entry.get("weight")
+    if weight is not None:
+        return weight
+    return priority_weight(entry.get("priority", "preferred"), weights)
+
+
+def compute_skill_score(jd_skills, matched, missing, weights=None):
     """
     Compute weighted skill score.
     Must-have = 2x
     Preferred = 1.5x
     Nice-to-have = 1x
     """
-    weight_map = {
-        "must": 2.0,
-        "preferred": 1.5,
-        "nice-to-have": 1.0
-    }
-
     total_weight = 0.0
     matched_weight = 0.0
 
     for entry in jd_skills:
         skill = entry.get("skill")
-        priority = entry.get("priority", "preferred")
-        weight = weight_map.get(priority, 1.0)
+        weight = skill_weight(entry, weights)
 
         total_weight += weight
 
@@ -74,11 +130,13 @@ def compute_experience_score(jd_skills):
         return 60.0
 
 
-def compute_missing_penalty(jd_skills, missing):
+def compute_missing_penalty(jd_skills, missing, weights=None):
     """
     Penalize missing skills.
     Missing must-have skills hurt the score significantly.
     """
+    weights = weights or WEIGHTS
+    penalties = weights["missing_penalties"]
     penalty = 0
 
     for entry in jd_skills:
@@ -86,25 +144,54 @@ def compute_missing_penalty(jd_skills, missing):
         priority = entry.get("priority", "preferred")
 
         if skill in missing:
-            if priority == "must":
-                penalty += 15
-            elif priority == "preferred":
-                penalty += 7
-            else:
-                penalty += 3
+            penalty += penalties.get(priority, penalties["nice-to-have"])
+
+    return min(penalty, weights["penalty_cap"])  # hard cap
 
-    return min(penalty, 40)  # hard cap
+
+def compute_skill_contributions(jd_skills, matched, missing, weights=None):
+    """
+    Per-skill share of `skills_match` and `missing_penalty`. Each column
+    sums to its breakdown value; when the penalty cap applies, the missing
+    skills' penalties are scaled down pro rata.
+    """
+    weights = weights or WEIGHTS
+    penalties = weights["missing_penalties"]
+    total_weight = sum(skill_weight(entry, weights) for entry in jd_skills)
+
+    rows = []
+    raw_penalty = 0
+    for entry in jd_skills:
+        skill = entry.get("skill")
+        priority = entry.get("priority", "preferred")
+        weight = skill_weight(entry, weights)
+        is_matched = skill in matched
+        penalty = penalties.get(priority, penalties["nice-to-have"]) if skill in missing else 0
+        raw_penalty += penalty
+        rows.append({
+            "skill": skill,
+            "priority": priority,
+            "weight": weight,
+            "matched": is_matched,
+            "skills_match": (weight / total_weight * 100.0) if is_matched and total_weight else 0.0,
+            "missing_penalty": penalty
+        })
+
+    scale = min(1.0, weights["penalty_cap"] / raw_penalty) if raw_penalty else 1.0
+    for row in rows:
+        row["skills_match"] = round(row["skills_match"], 2)
+        row["missing_penalty"] = round(row["missing_penalty"] * scale, 2)
+    return rows
 
 
 def compute_format_score(resume_text):
     """
     Very lightweight proxy for resume structure/quality.
     """
-    if not resume_text:
-        return 50.0
+    return format_score_for_length(len(resume_text) if resume_text else 0)
 
-    length = len(resume_text)
 
+def format_score_for_length(length: int) -> float:
     if length > 500:
         return 100.0
     elif length > 200:
@@ -112,40 +199,64 @@ def compute_format_score(resume_text):
     else:
         return 50.0
 
-def compute_keyword_score(jd_text: str, resume_text: str) -> float:
-    if not jd_text or not resume_text:
-        return 0.0
+def tokenize(text: str) -> frozenset:
+    return frozenset(text.lower().split())
 
-    jd_tokens = set(jd_text.lower().split())
-    resume_tokens = set(resume_text.lower().split())
 
-    if not jd_tokens:
+def compute_keyword_score(jd_text: str, resume_text: str, jd_tokens=None) -> float:
+    if jd_tokens is None:
+        jd_tokens = tokenize(jd_text) if jd_text else frozenset()
+    if not jd_tokens or not resume_text:
         return 0.0
 
+    resume_tokens = tokenize(resume_text)
+
     overlap = jd_tokens & resume_tokens
-    return round((len(overlap) / len(jd_tokens)) * 100.0, 2)
+    return keyword_score_for_counts(len(overlap), len(jd_tokens))
 
 
-def compute_score(jd_skills, matched, missing, resume_text="", jd_text=""):
+def keyword_score_for_counts(overlap: int, jd_token_count: int) -> float:
+    if not jd_token_count:
+        return 0.0
+    return round((overlap / jd_token_count) * 100.0, 2)
+
+
+def compute_score(jd_skills, matched, missing, resume_text="", jd_text="", jd_tokens=None, weights=None):
     """
     Main scoring function.
 
+    `matched` / `missing` may be plain name sets or compact SkillSets.
+    Pass `jd_tokens` (e.g. from a JD profile) to skip re-tokenizing `jd_text`.
+
     Returns:
     - breakdown (dict)
     - total_score (0–100)
     """
-    skill_score = compute_skill_score(jd_skills, matched, missing)
-    experience_score = compute_experience_score(jd_skills)
-    format_score = compute_format_score(resume_text)
-    penalty = compute_missing_penalty(jd_skills, missing)
-    keyword_score = compute_keyword_score(jd_text, resume_text)
+    return compute_score_from_features(
+        jd_skills, matched, missing,
+        keyword_score=compute_keyword_score(jd_text, resume_text, jd_tokens),
+        format_score=compute_format_score(resume_text),
+        weights=weights
+    )
 
 
+def compute_score_from_features(jd_skills, matched, missing, keyword_score, format_score, weights=None):
+    """
+    Combine precomputed text features with the skill sets, so stored
+    analyses can be re-scored under new weights without the resume text.
+    """
+    weights = weights or WEIGHTS
+    components = weights["components"]
+
+    skill_score = compute_skill_score(jd_skills, matched, missing, weights)
+    experience_score = compute_experience_score(jd_skills)
+    penalty = compute_missing_penalty(jd_skills, missing, weights)
+
     total = (
-    (skill_score * 0.50) +
-    (keyword_score * 0.20) +
-    (experience_score * 0.20) +
-    (format_score * 0.05)
+    (skill_score * components["skills"]) +
+    (keyword_score * components["keywords"]) +
+    (experience_score * components["experience"]) +
+    (format_score * components["format"])
 )
 
 
@@ -157,7 +268,8 @@ def compute_score(jd_skills, matched, missing, resume_text="", jd_text=""):
         "skills_match": round(skill_score, 2),
         "experience_relevance": round(experience_score, 2),
         "format_quality": round(format_score, 2),
-        "missing_penalty": penalty
+        "missing_penalty": penalty,
+        "per_skill": compute_skill_contributions(jd_skills, matched, missing, weights)
     }
 
 
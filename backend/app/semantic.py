@@ -0,0 +1,210 @@
+"""
+Semantic Skill Matching (optional)
+
+Matches resume phrases to registry skills by embedding similarity instead
+of fuzzy substring ratios, so "ML" finds Machine Learning and
+"Communication" no longer fires inside unrelated words.
+
+- Needs `numpy` and `sentence-transformers` with a locally cached model;
+  without them `match_skills` returns None and callers keep fuzzy matching
+- Runs on CPU, from locally cached model files only unless
+  EMBEDDING_OFFLINE=0
+- Skill/alias embeddings are built once and memory-mapped from
+  data/embeddings/
+- The model and index load in a background thread (started at app
+  startup); until they are ready every call returns None, so no request
+  pays for the load
+- Every call gets a latency budget; when it is exceeded the call returns
+  None instead of blocking the request
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # optional dependency
+    SentenceTransformer = None
+
+from .skill_registry import SKILL_NAMES, SkillSet, skill_id
+
+logger = logging.getLogger(__name__)
+
+# ---------------- CONFIG ----------------
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+EMBEDDING_OFFLINE = os.getenv("EMBEDDING_OFFLINE", "1") == "1"
+SEMANTIC_WARMUP = os.getenv("SEMANTIC_WARMUP", "1") == "1"
+EMBEDDING_DIR = Path(__file__).resolve().parent.parent / "data" / "embeddings"
+SEMANTIC_THRESHOLD = float(os.getenv("SEMANTIC_THRESHOLD", "0.62"))
+BATCH_SIZE = 64
+MAX_PHRASES = 2000
+MAX_NGRAM = 3
+
+# Short forms that embeddings alone do not resolve reliably
+SKILL_ALIASES = {
+    "Machine Learning": ["ML"],
+    "Deep Learning": ["DL"],
+    "NLP": ["Natural Language Processing"],
+    "JavaScript": ["JS", "ECMAScript"],
+    "TypeScript": ["TS"],
+    "Node.js": ["Node", "NodeJS"],
+    "PostgreSQL": ["Postgres", "psql"],
+    "Kubernetes": ["K8s"],
+    "AWS": ["Amazon Web Services"],
+    "GCP": ["Google Cloud", "Google Cloud Platform"],
+    "Azure": ["Microsoft Azure"],
+    "Data Analysis": ["Data Analytics"],
+    "Computer Vision": ["CV", "Image Recognition"],
+    "Communication": ["Communication Skills", "Verbal Communication", "Written Communication"],
+}
+
+_PHRASE_SPLIT_RE = re.compile(r"[\n\r,;|•●:()\[\]/]+")
+_WORD_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9.+#\-]*")
+
+_model = None
+_index = None        # (matrix, row -> skill id)
+
+_ready = threading.Event()
+_warm_lock = threading.Lock()
+_warm_thread = None
+
+
+def is_available() -> bool:
+    return np is not None and SentenceTransformer is not None
+
+
+def _get_model():
+    global _model
+    if _model is None:
+        _model = SentenceTransformer(EMBEDDING_MODEL, device="cpu", local_files_only=EMBEDDING_OFFLINE)
+    return _model
+
+
+def _warm():
+    try:
+        _load_index()
+        _get_model()
+        _ready.set()
+    except Exception:
+        logger.exception("semantic matcher unavailable; fuzzy matching only")
+
+
+def start_warmup() -> bool:
+    """Load the model and index in the background (once); True when ready."""
+    global _warm_thread
+    if not is_available():
+        return False
+    with _warm_lock:
+        if _warm_thread is None:
+            _warm_thread = threading.Thread(target=_warm, name="semantic-warmup", daemon=True)
+            _warm_thread.start()
+    return _ready.is_set()
+
+
+def _embed(phrases: List[str]):
+    return _get_model().encode(
+        phrases,
+        batch_size=BATCH_SIZE,
+        normalize_embeddings=True,
+        convert_to_numpy=True,
+    ).astype(np.float32)
+
+
+# ---------------- INDEX ----------------
+def _index_rows():
+    rows, labels = [], []
+    for name in SKILL_NAMES:
+        rows.append(name)
+        labels.append(name)
+        for alias in SKILL_ALIASES.get(name, []):
+            rows.append(alias)
+            labels.append(name)
+    return rows, labels
+
+
+def build_index(directory: Optional[Path] = None):
+    """Embed every registry skill (and alias) and write the index files."""
+    directory = directory or EMBEDDING_DIR
+    rows, labels = _index_rows()
+    directory.mkdir(parents=True, exist_ok=True)
+    np.save(directory / "skills.npy", _embed(rows))
+    with open(directory / "skills.json", "w", encoding="utf-8") as f:
+        json.dump({"model": EMBEDDING_MODEL, "rows": rows, "labels": labels}, f)
+
+
+def _load_index():
+    global _index
+    if _index is not None:
+        return _index
+
+    meta_path = EMBEDDING_DIR / "skills.json"
+    rows, _ = _index_rows()
+    meta = None
+    if meta_path.exists():
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    if meta is None or meta["model"] != EMBEDDING_MODEL or meta["rows"] != rows:
+        build_index()
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+    matrix = np.load(EMBEDDING_DIR / "skills.npy", mmap_mode="r")
+    row_ids = np.array([skill_id(label) for label in meta["labels"]], dtype=np.int32)
+    _index = (matrix, row_ids)
+    return _index
+
+
+# ---------------- PHRASES ----------------
+def candidate_phrases(text: str) -> List[str]:
+    """Short segments of the text plus their 1..3-word n-grams, deduplicated."""
+    seen = {}
+    for segment in _PHRASE_SPLIT_RE.split(text):
+        words = _WORD_RE.findall(segment)
+        if not words:
+            continue
+        for n in range(1, MAX_NGRAM + 1):
+            for i in range(len(words) - n + 1):
+                phrase = " ".join(words[i:i + n])
+                seen.setdefault(phrase.lower(), phrase)
+                if len(seen) >= MAX_PHRASES:
+                    return list(seen.values())
+    return list(seen.values())
+
+
+# ---------------- MATCHING ----------------
+def match_skills(text: str, budget_ms: float, threshold: float = SEMANTIC_THRESHOLD) -> Optional[SkillSet]:
+    """
+    Return the registry skills semantically present in `text`, or None when
+    the matcher is unavailable or cannot finish within `budget_ms`.
+    """
+    if budget_ms <= 0 or not start_warmup():
+        return None
+
+    deadline = time.perf_counter() + budget_ms / 1000.0
+    matrix, row_ids = _index
+
+    phrases = candidate_phrases(text)
+    best = np.full(len(row_ids), -1.0, dtype=np.float32)
+
+    for start in range(0, len(phrases), BATCH_SIZE):
+        if time.perf_counter() > deadline:
+            return None
+        vectors = _embed(phrases[start:start + BATCH_SIZE])
+        # Vocabulary is a few hundred rows: an exact product over the
+        # memory-mapped matrix beats building an ANN structure
+        np.maximum(best, (vectors @ matrix.T).max(axis=0), out=best)
+
+    mask = 0
+    for sid in row_ids[best >= threshold]:
+        mask |= 1 << int(sid)
+    return SkillSet(mask)
@@ -0,0 +1,68 @@
+"""
+Single-flight request coalescing
+
+Concurrent calls with the same key share one execution: the first caller
+runs the function, the others block until it finishes and receive the
+same result (or exception). Nothing is cached once the call completes.
+
+Every caller gets a result it may mutate: the leader keeps the original
+and followers each get a deep copy of a snapshot taken before the leader
+returns.
+"""
+import threading
+from copy import deepcopy
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return deepcopy(call.result)
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+            raise
+
+        with self._lock:
+            del self._calls[key]
+            shared = call.waiters > 0
+        # The key is gone, so nobody else can join; snapshot for those
+        # already waiting before the leader can touch the result
+        if shared:
+            call.result = deepcopy(result)
+        call.event.set()
+        return result
+
+    def inflight(self) -> int:
+        with self._lock:
+            return len(self._calls)
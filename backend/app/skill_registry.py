@@ -0,0 +1,137 @@
+"""
+Skill Registry
+
+Interns every known skill name to a small integer id so that skill sets can
+be held as int bitmasks instead of per-skill dicts.
+
+- CANONICAL_SKILLS are the skills the matchers scan for; they get ids 0..n-1
+- The rest of skills_master.json is interned after them (for categories/ids)
+- TAXONOMY_VERSION fingerprints CANONICAL_SKILLS (what the matchers scan),
+  so stored analyses can tell when their skill matches were made against
+  an older taxonomy
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+# ---------------- CONFIG ----------------
+SKILLS_MASTER_PATH = Path(__file__).resolve().parent.parent / "data" / "skills_master.json"
+
+CANONICAL_SKILLS = [
+    "Python", "JavaScript", "React", "Node.js", "TypeScript", "SQL",
+    "Machine Learning", "Data Analysis", "Communication",
+    "Git", "Docker", "AWS"
+]
+
+# ---------------- REGISTRY ----------------
+SKILL_NAMES: List[str] = []
+SKILL_IDS: Dict[str, int] = {}
+SKILL_CATEGORIES: List[str] = []
+
+
+def _intern(name: str, category: str = "") -> int:
+    sid = SKILL_IDS.get(name)
+    if sid is None:
+        sid = len(SKILL_NAMES)
+        SKILL_NAMES.append(name)
+        SKILL_CATEGORIES.append(category)
+        SKILL_IDS[name] = sid
+    elif category and not SKILL_CATEGORIES[sid]:
+        SKILL_CATEGORIES[sid] = category
+    return sid
+
+
+def _load_master():
+    try:
+        with open(SKILLS_MASTER_PATH, "r", encoding="utf-8") as f:
+            master = json.load(f)
+    except (OSError, ValueError):
+        return
+
+    for category, skills in master.get("technical_skills", {}).items():
+        for skill in skills:
+            _intern(skill, category)
+    for skill in master.get("soft_skills", []):
+        _intern(skill, "soft_skills")
+    for skills in master.get("roles", {}).values():
+        for skill in skills:
+            _intern(skill)
+
+
+for _skill in CANONICAL_SKILLS:
+    _intern(_skill)
+_load_master()
+
+TAXONOMY_VERSION = hashlib.sha1("\n".join(CANONICAL_SKILLS).encode("utf-8")).hexdigest()[:12]
+
+
+def skill_id(name: str) -> int:
+    """Return the interned id for a skill, registering it if unseen."""
+    return _intern(name)
+
+
+def category_of(name: str) -> str:
+    sid = SKILL_IDS.get(name)
+    return SKILL_CATEGORIES[sid] if sid is not None else ""
+
+
+# ---------------- COMPACT SKILL SET ----------------
+class SkillSet:
+    """
+    Immutable set of skills stored as a single int bitmask.
+
+    Supports `name in skills`, iteration (in registry order), len and the
+    usual set operators, so scorer code written against sets of names works
+    on it unchanged.
+    """
+    __slots__ = ("mask",)
+
+    def __init__(self, mask: int = 0):
+        self.mask = mask
+
+    @classmethod
+    def from_names(cls, names: Iterable[str]) -> "SkillSet":
+        mask = 0
+        for name in names:
+            mask |= 1 << _intern(name)
+        return cls(mask)
+
+    def __contains__(self, name) -> bool:
+        sid = SKILL_IDS.get(name)
+        return sid is not None and bool(self.mask >> sid & 1)
+
+    def __iter__(self):
+        mask, sid = self.mask, 0
+        while mask:
+            if mask & 1:
+                yield SKILL_NAMES[sid]
+            mask >>= 1
+            sid += 1
+
+    def __len__(self) -> int:
+        return bin(self.mask).count("1")
+
+    def __bool__(self) -> bool:
+        return bool(self.mask)
+
+    def __and__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self.mask & other.mask)
+
+    def __or__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self.mask | other.mask)
+
+    def __sub__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self.mask & ~other.mask)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SkillSet) and self.mask == other.mask
+
+    def __hash__(self) -> int:
+        return hash(self.mask)
+
+    def __repr__(self) -> str:
+        return f"SkillSet({list(self)!r})"
+
+    def names(self) -> List[str]:
+        return sorted(self)
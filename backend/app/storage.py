@@ -0,0 +1,401 @@
+"""
+Resume Blob Storage
+
+Content-addressed, reference-counted storage for uploaded resumes.
+
+- Raw uploads live at blobs/<aa>/<bb>/<sha256>, so identical files are
+  stored once and no directory grows unbounded
+- Extracted text is cached next to them under text/<aa>/<bb>/<sha256>.txt
+- Resume ids are "<sha256>__<original filename>"; the filename keeps the
+  extension used for parser dispatch. Ids issued before the blob store
+  ("<uuid>__<filename>" files in the data dir) are imported on first use
+  and mapped to their digest; anything else is an unknown id
+- Uploads made while signed in take a reference per owner, and only the
+  owner can release it; the last release deletes the blob
+- Anonymous and transient uploads (analyze, bulk screening) take no
+  reference: their blobs expire once unread for the retention window
+- Reference changes and the file writes/deletes they imply run under one
+  SQLite write lock, so an upload never races a release into a dangling id
+- A background GC drops raw files older than the retention window once
+  their text is cached, and removes blobs nobody references any more
+"""
+import hashlib
+import logging
+import mmap
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, Optional, Tuple
+
+from db.database import get_connection
+
+logger = logging.getLogger(__name__)
+
+# ---------------- CONFIG ----------------
+DATA_DIR = Path(os.getenv("STORAGE_PATH", "./data"))
+DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+BLOB_DIR = DATA_DIR / "blobs"
+TEXT_DIR = DATA_DIR / "text"
+
+TMP_DIR = DATA_DIR / "tmp"
+CHUNK_SIZE = 1 << 16
+
+RETENTION_DAYS = float(os.getenv("STORAGE_RETENTION_DAYS", "30"))
+GC_INTERVAL_SECONDS = float(os.getenv("STORAGE_GC_INTERVAL_SECONDS", "3600"))
+
+# Raw reads refresh last_access at most this often per blob
+_TOUCH_INTERVAL = timedelta(hours=1)
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+# "<uuid4>__<filename>" as issued by the pre-blob-store upload route
+_LEGACY_ID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}__[^/\\\x00]+$")
+
+_gc_thread = None
+
+
+# ---------------- PATHS ----------------
+def _shard(root: Path, digest: str, suffix: str = "") -> Path:
+    return root / digest[:2] / digest[2:4] / f"{digest}{suffix}"
+
+
+def blob_path(digest: str) -> Path:
+    return _shard(BLOB_DIR, digest)
+
+
+def text_path(digest: str) -> Path:
+    return _shard(TEXT_DIR, digest, ".txt")
+
+
+def split_resume_id(resume_id: str) -> Tuple[Optional[str], str]:
+    """Return (digest, filename); digest is None for ids that are not ours."""
+    head, sep, filename = resume_id.partition("__")
+    if sep and _DIGEST_RE.match(head):
+        return head, filename
+    if sep and filename and _LEGACY_ID_RE.match(resume_id):
+        digest = _legacy_digest(resume_id)
+        if digest is not None:
+            return digest, filename
+    return None, resume_id
+
+
+def _digest_of(resume_id: str) -> str:
+    digest, _ = split_resume_id(resume_id)
+    if digest is None:
+        raise FileNotFoundError(resume_id)
+    return digest
+
+
+def _write_atomic(dest: Path, data: bytes):
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, dest)
+
+
+# ---------------- BLOBS ----------------
+@contextmanager
+def _write_lock():
+    """A connection holding SQLite's write lock until commit or rollback."""
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def _add_ref(conn, digest: str, size: int, owner: Optional[str]):
+    """Record a stored copy; only an owner's upload counts as a reference."""
+    now = datetime.utcnow().isoformat()
+    refs = 1 if owner else 0
+    conn.execute(
+        """
+        INSERT INTO blobs (digest, size, refcount, raw_present, created_at, last_access)
+        VALUES (?, ?, ?, 1, ?, ?)
+        ON CONFLICT (digest) DO UPDATE SET
+            refcount = refcount + excluded.refcount, raw_present = 1, last_access = excluded.last_access
+        """,
+        (digest, size, refs, now, now),
+    )
+    if owner:
+        conn.execute(
+            """
+            INSERT INTO blob_owners (digest, owner, refs) VALUES (?, ?, 1)
+            ON CONFLICT (digest, owner) DO UPDATE SET refs = refs + 1
+            """,
+            (digest, owner),
+        )
+
+
+def _resume_id(digest: str, filename: str) -> str:
+    return f"{digest}__{Path(filename or 'resume').name}"
+
+
+def put(file_bytes: bytes, filename: str, owner: Optional[str] = None) -> str:
+    """Store an upload (deduplicated by content) and return its resume id."""
+    digest = hashlib.sha256(file_bytes).hexdigest()
+    dest = blob_path(digest)
+    with _write_lock() as conn:
+        _add_ref(conn, digest, len(file_bytes), owner)
+        # Checked under the lock: a concurrent release cannot delete it now
+        if not dest.exists():
+            _write_atomic(dest, file_bytes)
+    return _resume_id(digest, filename)
+
+
+def put_stream(fileobj: BinaryIO, filename: str, owner: Optional[str] = None) -> str:
+    """
+    Like put(), but hashes and writes the upload chunk by chunk so the
+    whole file is never held in memory.
+    """
+    TMP_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = TMP_DIR / f"{os.getpid()}.{threading.get_ident()}.{time.monotonic_ns()}"
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp, "wb") as out:
+            while True:
+                chunk = fileobj.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+
+        digest = hasher.hexdigest()
+        dest = blob_path(digest)
+        with _write_lock() as conn:
+            _add_ref(conn, digest, size, owner)
+            if not dest.exists():
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp, dest)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return _resume_id(digest, filename)
+
+
+def release(resume_id: str, owner: str) -> bool:
+    """
+    Drop one of `owner`'s references; the blob and its cached text go with
+    the last reference. Returns False if the owner holds none.
+    """
+    digest, _ = split_resume_id(resume_id)
+    if digest is None or not owner:
+        return False
+
+    with _write_lock() as conn:
+        owned = conn.execute(
+            "UPDATE blob_owners SET refs = refs - 1 WHERE digest = ? AND owner = ? AND refs > 0",
+            (digest, owner),
+        )
+        if owned.rowcount == 0:
+            return False
+        conn.execute("DELETE FROM blob_owners WHERE digest = ? AND owner = ? AND refs <= 0", (digest, owner))
+        conn.execute(
+            "UPDATE blobs SET refcount = refcount - 1 WHERE digest = ? AND refcount > 0",
+            (digest,),
+        )
+        row = conn.execute("SELECT refcount FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        if row is not None and row["refcount"] <= 0:
+            conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            conn.execute("DELETE FROM blob_owners WHERE digest = ?", (digest,))
+            _delete_files(digest)
+    return True
+
+
+# ---------------- LEGACY IDS ----------------
+def _legacy_digest(legacy_id: str) -> Optional[str]:
+    """
+    Digest for an id issued before the blob store. The old file (directly
+    under DATA_DIR, never a path built from anything else) is imported on
+    first use and removed; the mapping is kept for later lookups.
+    """
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            "SELECT digest FROM legacy_resumes WHERE legacy_id = ?", (legacy_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+    if row is not None:
+        return row["digest"]
+
+    path = DATA_DIR / legacy_id
+    if path.parent != DATA_DIR or not path.is_file():
+        return None
+    return _import_legacy_file(path)
+
+
+def _import_legacy_file(path: Path) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            digest, _ = split_resume_id(put_stream(f, path.name))
+    except FileNotFoundError:
+        # Imported concurrently: the file is removed only after its mapping
+        return _legacy_digest(path.name)
+
+    conn = get_connection()
+    try:
+        conn.execute(
+            "INSERT OR IGNORE INTO legacy_resumes (legacy_id, digest) VALUES (?, ?)",
+            (path.name, digest),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    return digest
+
+
+def import_legacy() -> int:
+    """Move every pre-blob-store upload into the store; returns the count."""
+    imported = 0
+    for path in DATA_DIR.iterdir():
+        if path.is_file() and _LEGACY_ID_RE.match(path.name):
+            imported += _import_legacy_file(path) is not None
+    return imported
+
+
+def resolve(resume_id: str) -> Path:
+    """Path of the raw upload; raises FileNotFoundError once compacted away."""
+    path = blob_path(_digest_of(resume_id))
+    if not path.exists():
+        raise FileNotFoundError(resume_id)
+    return path
+
+
+def _touch(digest: str):
+    """Refresh last_access so the GC keeps raw files that are still read."""
+    now = datetime.utcnow()
+    conn = get_connection()
+    try:
+        conn.execute(
+            "UPDATE blobs SET last_access = ? WHERE digest = ? AND last_access < ?",
+            (now.isoformat(), digest, (now - _TOUCH_INTERVAL).isoformat()),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@contextmanager
+def open_buffer(resume_id: str):
+    """
+    Yield a read-only memory map of the raw upload (b"" for empty files),
+    so parsers read the bytes straight from the page cache.
+    """
+    path = resolve(resume_id)
+    _touch(_digest_of(resume_id))
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield buf
+        finally:
+            buf.close()
+
+
+# ---------------- TEXT CACHE ----------------
+def read_text(resume_id: str) -> Optional[str]:
+    digest, _ = split_resume_id(resume_id)
+    if digest is None:
+        return None
+    try:
+        with open(text_path(digest), "r", encoding="utf-8") as f:
+            text = f.read()
+    except FileNotFoundError:
+        return None
+    _touch(digest)
+    return text
+
+
+def write_text(resume_id: str, text: str):
+    digest, _ = split_resume_id(resume_id)
+    if digest is not None:
+        _write_atomic(text_path(digest), text.encode("utf-8"))
+
+
+# ---------------- GC ----------------
+def _delete_files(digest: str):
+    for path in (blob_path(digest), text_path(digest)):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def gc(now: Optional[datetime] = None) -> dict:
+    """
+    Remove unreferenced blobs unread for the retention window, and raw
+    files past retention whose text is already cached. Returns counts for
+    logging.
+    """
+    now = now or datetime.utcnow()
+    cutoff = (now - timedelta(days=RETENTION_DAYS)).isoformat()
+    removed = compacted = 0
+
+    with _write_lock() as conn:
+        expired = conn.execute(
+            "SELECT digest FROM blobs WHERE refcount <= 0 AND last_access < ?", (cutoff,)
+        ).fetchall()
+        for row in expired:
+            conn.execute("DELETE FROM blobs WHERE digest = ?", (row["digest"],))
+            _delete_files(row["digest"])
+            removed += 1
+
+        rows = conn.execute(
+            "SELECT digest FROM blobs WHERE raw_present = 1 AND last_access < ?",
+            (cutoff,),
+        ).fetchall()
+        for row in rows:
+            digest = row["digest"]
+            if not text_path(digest).exists():
+                continue
+            try:
+                blob_path(digest).unlink()
+            except FileNotFoundError:
+                pass
+            conn.execute("UPDATE blobs SET raw_present = 0 WHERE digest = ?", (digest,))
+            compacted += 1
+
+    return {"removed": removed, "compacted": compacted}
+
+
+def _gc_loop():
+    try:
+        imported = import_legacy()
+        if imported:
+            logger.info("storage: imported %d legacy uploads", imported)
+    except Exception:
+        logger.exception("storage legacy import failed")
+    while True:
+        time.sleep(GC_INTERVAL_SECONDS)
+        try:
+            stats = gc()
+            if stats["removed"] or stats["compacted"]:
+                logger.info("storage gc: %s", stats)
+        except Exception:
+            logger.exception("storage gc failed")
+
+
+def start_gc_thread():
+    global _gc_thread
+    if _gc_thread is None and GC_INTERVAL_SECONDS > 0:
+        _gc_thread = threading.Thread(target=_gc_loop, name="storage-gc", daemon=True)
+        _gc_thread.start()
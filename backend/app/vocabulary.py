@@ -0,0 +1,462 @@
+"""
+Vocabulary Evaluator
+
+Local, LLM-free analysis of a spoken or typed answer's transcript. Every
+metric is gathered in a single pass over the tokens, so a re-score on
+each keystroke or speech-to-text chunk stays well under a millisecond
+per hundred words.
+
+- Lexical diversity: moving-average type/token ratio (MATTR) over a
+  sliding window, which unlike the plain ratio does not fall as the
+  answer gets longer
+- Rare-word ratio: words outside the precomputed common-word table
+  (data/common_words.txt), after stripping regular inflections
+- Sentence-length statistics: mean, standard deviation and maximum
+- Domain-term coverage: skills from skills_master.json, multi-word terms
+  included, optionally measured against one role's skill list
+- Filler words and transition phrases, for fluency and coherence
+
+Pronunciation cannot be judged from text and is returned as None; pace
+is only scored when the answer's duration is given.
+"""
+import copy
+import json
+import math
+import os
+import re
+from collections import Counter, deque
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .skill_registry import SKILL_NAMES, SKILLS_MASTER_PATH
+
+# ---------------- CONFIG ----------------
+COMMON_WORDS_PATH = Path(os.getenv(
+    "COMMON_WORDS_PATH",
+    Path(__file__).resolve().parent.parent / "data" / "common_words.txt"
+))
+VOCAB_MAX_CHARS = int(os.getenv("VOCAB_MAX_CHARS", "20000"))
+VOCAB_MIN_WORDS = int(os.getenv("VOCAB_MIN_WORDS", "25"))
+
+MATTR_WINDOW = 50
+FUNCTION_WORDS_RANK = 150       # top of the table: left out of the word cloud
+WORD_CLOUD_SIZE = 8
+LONG_SENTENCE_WORDS = 30
+
+# Target bands: (low, high, falloff outside the band)
+RARE_BAND = (0.10, 0.35, 0.20)
+SENTENCE_MEAN_BAND = (10, 22, 12)
+SENTENCE_STD_BAND = (3, 10, 8)
+PACE_WPM_BAND = (120, 160, 60)
+
+FILLER_PHRASES = [
+    "um", "uh", "erm", "er", "ah", "hmm", "basically", "literally",
+    "you know", "i mean", "kind of", "sort of", "like i said",
+]
+CONNECTIVE_PHRASES = [
+    "because", "therefore", "however", "although", "moreover", "furthermore",
+    "additionally", "consequently", "hence", "thus", "whereas", "meanwhile",
+    "firstly", "secondly", "finally", "overall", "for example", "for instance",
+    "as a result", "in addition", "on the other hand", "in contrast", "such as",
+]
+
+# Words keep inner . ' - + # so "node.js", "c++", "don't" stay one token
+_TOKEN_RE = re.compile(r"(?P<word>[A-Za-z0-9][A-Za-z0-9+#]*(?:[.'\-][A-Za-z0-9+#]+)*[+#]*)|(?P<end>[.!?]+)")
+_SUFFIXES = ("ies", "es", "s", "ed", "ing", "ly", "er")
+
+
+# ---------------- TABLES ----------------
+def _load_common_words(path: Path = COMMON_WORDS_PATH) -> List[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return [line.strip().lower() for line in f if line.strip() and not line.startswith("#")]
+    except OSError:
+        return []
+
+
+def _load_role_skills() -> Dict[str, List[str]]:
+    try:
+        with open(SKILLS_MASTER_PATH, "r", encoding="utf-8") as f:
+            return json.load(f).get("roles", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _tokens(text: str) -> List[str]:
+    return [m.group("word") for m in _TOKEN_RE.finditer(text) if m.group("word")]
+
+
+def _phrase_table(phrases) -> Dict[tuple, str]:
+    return {tuple(_tokens(p.lower())): p for p in phrases}
+
+
+COMMON_WORDS = _load_common_words()
+COMMON_RANK = {w: i for i, w in enumerate(COMMON_WORDS)}
+ROLE_SKILLS = _load_role_skills()
+
+# Lowercased token n-gram -> skill name. One- and two-letter names ("C",
+# "R") only match exactly as written, or every "a"/"r" would be a skill.
+DOMAIN_TERMS: Dict[tuple, str] = {}
+CASED_TERMS: Dict[str, str] = {}
+for _name in SKILL_NAMES:
+    _key = tuple(_tokens(_name.lower()))
+    if not _key:
+        continue
+    if len(_key) == 1 and len(_key[0]) <= 2:
+        CASED_TERMS[_name] = _name
+    else:
+        DOMAIN_TERMS[_key] = _name
+
+FILLERS = _phrase_table(FILLER_PHRASES)
+CONNECTIVES = _phrase_table(CONNECTIVE_PHRASES)
+
+_MAX_NGRAM = max(map(len, [*DOMAIN_TERMS, *FILLERS, *CONNECTIVES]), default=1)
+# Only tokens that can end a phrase pay for the n-gram lookups
+_PHRASE_ENDS = {key[-1] for key in [*DOMAIN_TERMS, *FILLERS, *CONNECTIVES]}
+
+_common_memo: Dict[str, bool] = {}
+
+
+def _is_common(word: str) -> bool:
+    known = _common_memo.get(word)
+    if known is None:
+        known = _common_memo[word] = _is_inflected_common(word)
+        if len(_common_memo) > 100_000:
+            _common_memo.clear()
+    return known
+
+
+def _is_inflected_common(word: str) -> bool:
+    if word in COMMON_RANK:
+        return True
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            stem = word[:-len(suffix)]
+            if stem in COMMON_RANK or stem + "e" in COMMON_RANK or (suffix == "ies" and stem + "y" in COMMON_RANK):
+                return True
+            # running -> run, stopped -> stop
+            if len(stem) > 3 and stem[-1] == stem[-2] and stem[:-1] in COMMON_RANK:
+                return True
+    return False
+
+
+# ---------------- ANALYZER ----------------
+class VocabularyAnalyzer:
+    """
+    Streaming accumulator: feed() text chunks as they arrive (a trailing
+    partial word is held back until the next chunk), then metrics(). An
+    interim metrics() call reads a snapshot and leaves the stream as is.
+    """
+
+    def __init__(self, role: Optional[str] = None):
+        self.role = role
+        self._tail = ""
+
+        self.tokens = 0
+        self.alpha_tokens = 0
+        self.rare = 0
+        self.types = Counter()
+
+        self._window = deque()
+        self._window_counts = Counter()
+        self._mattr_sum = 0.0
+        self._mattr_windows = 0
+
+        self._recent = deque(maxlen=_MAX_NGRAM)
+        self.domain = Counter()
+        self.fillers = Counter()
+        self.connectives = 0
+
+        self.sentences = 0
+        self._sentence_words = 0
+        self._len_mean = 0.0
+        self._len_m2 = 0.0
+        self.max_sentence = 0
+        self.long_sentences = 0
+
+    def feed(self, chunk: str):
+        text = self._tail + chunk
+        cut = len(text)
+        while cut and not text[cut - 1].isspace():
+            cut -= 1
+        self._tail = text[cut:]
+        self._scan(text[:cut])
+
+    def _scan(self, text: str):
+        for m in _TOKEN_RE.finditer(text):
+            word = m.group("word")
+            if word is None:
+                self._end_sentence()
+            else:
+                self._add_word(word)
+
+    def _add_word(self, word: str):
+        lower = word.lower()
+        self.tokens += 1
+        self._sentence_words += 1
+        self.types[lower] += 1
+
+        if lower.isalpha() or "'" in lower:
+            self.alpha_tokens += 1
+            if not _is_common(lower):
+                self.rare += 1
+
+        # MATTR: distinct-word share of each full window of tokens
+        window, counts = self._window, self._window_counts
+        window.append(lower)
+        counts[lower] += 1
+        if len(window) > MATTR_WINDOW:
+            dropped = window.popleft()
+            counts[dropped] -= 1
+            if not counts[dropped]:
+                del counts[dropped]
+        if len(window) == MATTR_WINDOW:
+            self._mattr_sum += len(counts) / MATTR_WINDOW
+            self._mattr_windows += 1
+
+        # Phrases ending at this token; the longest match wins
+        if word in CASED_TERMS:
+            self.domain[CASED_TERMS[word]] += 1
+        recent = self._recent
+        recent.append(lower)
+        if lower not in _PHRASE_ENDS:
+            return
+        gram = tuple(recent)
+        for n in range(len(gram), 0, -1):
+            key = gram[-n:]
+            if key in DOMAIN_TERMS:
+                self.domain[DOMAIN_TERMS[key]] += 1
+                break
+            if key in FILLERS:
+                self.fillers[FILLERS[key]] += 1
+                break
+            if key in CONNECTIVES:
+                self.connectives += 1
+                break
+
+    def _end_sentence(self):
+        self._recent.clear()
+        words = self._sentence_words
+        if not words:
+            return
+        self._sentence_words = 0
+        self.sentences += 1
+        delta = words - self._len_mean
+        self._len_mean += delta / self.sentences
+        self._len_m2 += delta * (words - self._len_mean)
+        self.max_sentence = max(self.max_sentence, words)
+        self.long_sentences += words > LONG_SENTENCE_WORDS
+
+    def snapshot(self) -> "VocabularyAnalyzer":
+        """The stream as if it ended now (tail scanned, sentence closed)."""
+        if not self._tail and not self._sentence_words:
+            return self
+        snap = copy.copy(self)
+        snap.types = self.types.copy()
+        snap._window = self._window.copy()
+        snap._window_counts = self._window_counts.copy()
+        snap._recent = self._recent.copy()
+        snap.domain = self.domain.copy()
+        snap.fillers = self.fillers.copy()
+        snap._tail = ""
+        snap._scan(self._tail)
+        snap._end_sentence()
+        return snap
+
+    def metrics(self, duration_seconds: Optional[float] = None) -> dict:
+        return self.snapshot()._metrics(duration_seconds)
+
+    def _metrics(self, duration_seconds: Optional[float]) -> dict:
+        tokens = self.tokens
+        if self._mattr_windows:
+            mattr = self._mattr_sum / self._mattr_windows
+        else:
+            mattr = len(self.types) / tokens if tokens else 0.0
+
+        role_coverage = None
+        if self.role in ROLE_SKILLS:
+            expected = ROLE_SKILLS[self.role]
+            covered = [s for s in expected if s in self.domain]
+            role_coverage = {
+                "role": self.role,
+                "coverage": round(len(covered) / len(expected), 3) if expected else 0.0,
+                "covered": covered,
+                "missing": [s for s in expected if s not in self.domain]
+            }
+
+        return {
+            "words": tokens,
+            "unique_words": len(self.types),
+            "type_token_ratio": round(len(self.types) / tokens, 3) if tokens else 0.0,
+            "mattr": round(mattr, 3),
+            "rare_word_ratio": round(self.rare / self.alpha_tokens, 3) if self.alpha_tokens else 0.0,
+            "sentences": self.sentences,
+            "sentence_length": {
+                "mean": round(self._len_mean, 1),
+                "std": round(math.sqrt(self._len_m2 / self.sentences), 1) if self.sentences else 0.0,
+                "max": self.max_sentence,
+                "long": self.long_sentences
+            },
+            "domain_terms": dict(self.domain.most_common()),
+            "domain_term_ratio": round(sum(self.domain.values()) / tokens, 3) if tokens else 0.0,
+            "role_coverage": role_coverage,
+            "fillers": dict(self.fillers.most_common()),
+            "filler_rate": round(sum(self.fillers.values()) / tokens, 3) if tokens else 0.0,
+            "connective_rate": round(self.connectives / tokens, 3) if tokens else 0.0,
+            "words_per_minute": round(tokens * 60 / duration_seconds, 1) if duration_seconds else None,
+            "reliable": tokens >= VOCAB_MIN_WORDS
+        }
+
+    def word_cloud(self, size: int = WORD_CLOUD_SIZE) -> List[str]:
+        """Most used content words; rarer words first among equal counts."""
+        candidates = [
+            (count, COMMON_RANK.get(word, len(COMMON_RANK)), word)
+            for word, count in self.types.items()
+            if len(word) >= 4 and word.isalpha() and COMMON_RANK.get(word, FUNCTION_WORDS_RANK) >= FUNCTION_WORDS_RANK
+            and word not in FILLER_PHRASES
+        ]
+        candidates.sort(reverse=True)
+        return [word for _, _, word in candidates[:size]]
+
+
+# ---------------- SCORING ----------------
+def _band(x: float, band) -> float:
+    """1.0 inside [low, high], falling linearly to 0 `falloff` outside it."""
+    low, high, falloff = band
+    if x < low:
+        return max(0.0, 1 - (low - x) / falloff)
+    if x > high:
+        return max(0.0, 1 - (x - high) / falloff)
+    return 1.0
+
+
+def _clamp(x: float) -> float:
+    return min(1.0, max(0.0, x))
+
+
+def _verdict(score: int) -> str:
+    if score >= 85:
+        return "Excellent"
+    if score >= 70:
+        return "Good"
+    if score >= 55:
+        return "Average"
+    return "Needs Improvement"
+
+
+def _feedback(m: dict):
+    strengths, improvements = [], []
+    lengths = m["sentence_length"]
+
+    if m["mattr"] >= 0.72:
+        strengths.append("Varied word choice with little repetition")
+    elif m["mattr"] < 0.6:
+        improvements.append("Repeats the same words often; vary your phrasing")
+
+    low, high, _ = RARE_BAND
+    if low <= m["rare_word_ratio"] <= high:
+        strengths.append("Precise vocabulary beyond everyday words")
+    elif m["rare_word_ratio"] < low:
+        improvements.append("Mostly everyday words; use more precise terms")
+    else:
+        improvements.append("Many uncommon words; make sure the meaning stays clear")
+
+    if len(m["domain_terms"]) >= 3:
+        strengths.append("Uses domain terminology: " + ", ".join(list(m["domain_terms"])[:5]))
+    elif not m["domain_terms"]:
+        improvements.append("Name the specific tools and skills you have worked with")
+
+    coverage = m["role_coverage"]
+    if coverage and coverage["coverage"] < 0.5 and coverage["missing"]:
+        improvements.append(
+            f"Mention more of the skills a {coverage['role']} needs, e.g. " + ", ".join(coverage["missing"][:3])
+        )
+
+    if m["filler_rate"] > 0.05:
+        improvements.append("Cut filler words (" + ", ".join(list(m["fillers"])[:3]) + ")")
+    elif m["reliable"] and m["filler_rate"] < 0.02:
+        strengths.append("Few filler words")
+
+    low, high, _ = SENTENCE_MEAN_BAND
+    if lengths["mean"] > high:
+        improvements.append("Break long sentences into shorter ones")
+    elif m["sentences"] > 1 and lengths["mean"] < low:
+        improvements.append("Join short sentences into fuller thoughts")
+    elif m["sentences"]:
+        strengths.append("Sentences are a comfortable length")
+
+    if m["connective_rate"] >= 0.02:
+        strengths.append("Ideas are linked with clear transitions")
+    elif m["reliable"] and not m["connective_rate"]:
+        improvements.append("Link ideas with transitions (because, for example, as a result)")
+
+    if not m["reliable"]:
+        improvements.append(f"Say a bit more; scores settle after about {VOCAB_MIN_WORDS} words")
+
+    return strengths, improvements
+
+
+def evaluate(analyzer: VocabularyAnalyzer, duration_seconds: Optional[float] = None) -> dict:
+    """Score the stream so far; raises ValueError for a non-positive duration."""
+    if duration_seconds is not None and duration_seconds <= 0:
+        raise ValueError("duration_seconds must be positive")
+    analyzer = analyzer.snapshot()
+    m = analyzer.metrics(duration_seconds)
+    lengths = m["sentence_length"]
+
+    diversity = _clamp((m["mattr"] - 0.45) / (0.80 - 0.45))
+    domain = _clamp(len(m["domain_terms"]) / 3)
+    vocabulary = 0.6 * diversity + 0.25 * _band(m["rare_word_ratio"], RARE_BAND) + 0.15 * domain
+
+    fluency = 0.6 * (1 - _clamp(m["filler_rate"] / 0.08)) + 0.4 * _band(lengths["mean"], SENTENCE_MEAN_BAND)
+
+    long_share = lengths["long"] / m["sentences"] if m["sentences"] else 0.0
+    coherence = (
+        0.5 * _clamp(m["connective_rate"] / 0.03)
+        + 0.3 * (_band(lengths["std"], SENTENCE_STD_BAND) if m["sentences"] > 1 else 0.5)
+        + 0.2 * (1 - long_share)
+    )
+
+    pace = _band(m["words_per_minute"], PACE_WPM_BAND) if m["words_per_minute"] else None
+
+    # Nothing said: every sub-score is 0, not just the total
+    if not m["words"]:
+        vocabulary = fluency = coherence = 0.0
+
+    parts = [vocabulary, fluency, coherence] + ([pace] if pace is not None else [])
+    score = round(100 * sum(parts) / len(parts))
+    strengths, improvements = _feedback(m)
+
+    summary = (
+        f"{m['words']} words in {m['sentences']} sentences; lexical diversity (MATTR) {m['mattr']:.2f}, "
+        f"{m['rare_word_ratio']:.0%} less common words, {len(m['domain_terms'])} domain terms."
+    )
+    if strengths:
+        summary += f" Strongest point: {strengths[0].lower()}."
+    if improvements:
+        summary += f" Focus next on: {improvements[0][0].lower() + improvements[0][1:]}."
+
+    return {
+        "score": score,
+        "verdict": _verdict(score),
+        "strengths": strengths,
+        "improvements": improvements,
+        "interviewer_feedback": summary,
+        "word_cloud": analyzer.word_cloud(),
+        "fluency_score": round(100 * fluency),
+        "vocabulary_score": round(100 * vocabulary),
+        "coherence_score": round(100 * coherence),
+        "pronunciation_score": None,
+        "pace_score": round(100 * pace) if pace is not None else None,
+        "metrics": m
+    }
+
+
+def evaluate_vocabulary(text: str, role: Optional[str] = None,
+                        duration_seconds: Optional[float] = None) -> dict:
+    """Score a transcript in one pass; raises ValueError if it is too long."""
+    if len(text) > VOCAB_MAX_CHARS:
+        raise ValueError(f"Transcript exceeds {VOCAB_MAX_CHARS} characters")
+    analyzer = VocabularyAnalyzer(role)
+    analyzer.feed(text)
+    return evaluate(analyzer, duration_seconds)
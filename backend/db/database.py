@@ -1,13 +1,21 @@
+import os
 import sqlite3
 from pathlib import Path
 
-DB_PATH = Path(__file__).parent / "users.db"
+DB_PATH = Path(os.getenv("DB_PATH", Path(__file__).parent / "users.db"))
 
 def get_connection():
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     return conn
 
+def _add_missing_columns(cur, table, columns):
+    """Bring tables created by an older release up to the current schema."""
+    existing = {row[1] for row in cur.execute(f"PRAGMA table_info({table})")}
+    for name, decl in columns:
+        if name not in existing:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
 def init_db():
     conn = get_connection()
     cur = conn.cursor()
@@ -19,5 +27,113 @@ def init_db():
             name TEXT
         )
     """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS analysis_counts (
+            role TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (role, bucket)
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS skill_gap_counts (
+            role TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            skill TEXT NOT NULL,
+            missing INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (role, bucket, skill)
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS jd_profiles (
+            jd_id TEXT PRIMARY KEY,
+            title TEXT,
+            profile TEXT NOT NULL,
+            jd_text TEXT,
+            created_at TEXT NOT NULL
+        )
+    """)
+    _add_missing_columns(cur, "jd_profiles", [("jd_text", "TEXT")])
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS blobs (
+            digest TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            refcount INTEGER NOT NULL DEFAULT 0,
+            raw_present INTEGER NOT NULL DEFAULT 1,
+            created_at TEXT NOT NULL,
+            last_access TEXT NOT NULL
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS blob_owners (
+            digest TEXT NOT NULL,
+            owner TEXT NOT NULL,
+            refs INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (digest, owner)
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS legacy_resumes (
+            legacy_id TEXT PRIMARY KEY,
+            digest TEXT NOT NULL
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS aptitude_questions (
+            question_id TEXT PRIMARY KEY,
+            topic TEXT,
+            correct_index INTEGER NOT NULL,
+            explanation TEXT,
+            difficulty TEXT,
+            body TEXT
+        )
+    """)
+    _add_missing_columns(cur, "aptitude_questions", [("difficulty", "TEXT"), ("body", "TEXT")])
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS aptitude_topic_stats (
+            user TEXT NOT NULL,
+            topic TEXT NOT NULL,
+            attempted INTEGER NOT NULL DEFAULT 0,
+            correct INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user, topic)
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS aptitude_sessions (
+            session_id TEXT PRIMARY KEY,
+            user TEXT NOT NULL,
+            state TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    """)
+    # Bitmaps keyed by rowid (pre per-topic positions) cannot be remapped
+    if "topic" not in {row[1] for row in cur.execute("PRAGMA table_info(aptitude_seen)")}:
+        cur.execute("DROP TABLE IF EXISTS aptitude_seen")
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS aptitude_seen (
+            user TEXT NOT NULL,
+            topic TEXT NOT NULL,
+            seen BLOB NOT NULL,
+            PRIMARY KEY (user, topic)
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS analyses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            resume_id TEXT NOT NULL,
+            jd_id TEXT NOT NULL,
+            role TEXT,
+            created_at TEXT NOT NULL,
+            taxonomy_version TEXT NOT NULL,
+            weights_version TEXT NOT NULL,
+            features TEXT NOT NULL,
+            total_score REAL NOT NULL,
+            result TEXT NOT NULL
+        )
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_analyses_versions
+        ON analyses (weights_version, taxonomy_version)
+    """)
     conn.commit()
     conn.close()
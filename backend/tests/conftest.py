@@ -0,0 +1,33 @@
+"""
+Tests run against a throwaway database and storage directory; the
+environment is set before any app module reads its config.
+"""
+import os
+import tempfile
+
+_scratch = tempfile.mkdtemp(prefix="careerai-tests-")
+os.environ["DB_PATH"] = os.path.join(_scratch, "users.db")
+os.environ["STORAGE_PATH"] = os.path.join(_scratch, "data")
+os.environ["CACHE_ENABLED"] = "0"
+os.environ["RATE_LIMIT_ENABLED"] = "0"
+os.environ["RESCORE_ON_START"] = "0"
+os.environ["OCR_ENABLED"] = "0"
+os.environ["GROK_API_KEY"] = ""
+# Nothing listens here: every provider call fails fast and goes offline
+os.environ["LLM_BASE_URL"] = "http://127.0.0.1:9/v1"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import auth  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def bearer(email: str) -> dict:
+    return {"Authorization": f"Bearer {auth.create_access_token({'sub': email})}"}
@@ -0,0 +1,47 @@
+import json
+
+from app import llm_client
+from app.llm_client import EVALUATION_FIELDS, evaluate_answers_batch
+
+ITEMS = [{"question": f"Q{i}", "answer": f"A{i}"} for i in range(3)]
+
+
+def _entry(i, score=7):
+    return {"id": i, "score": score, "technical_accuracy": "High"}
+
+
+def test_unparsable_batch_falls_back_per_item(monkeypatch):
+    def fake_call(prompt, cache=False):
+        if "[Item " in prompt:
+            return "not json at all"
+        return json.dumps({"score": 5, "clarity": "Good"})
+
+    monkeypatch.setattr(llm_client, "_call_grok", fake_call)
+    results = evaluate_answers_batch(ITEMS)["evaluations"]
+    assert [r["score"] for r in results] == [5, 5, 5]
+    assert all(r["mode"] == llm_client.MODE_LLM for r in results)
+
+
+def test_every_path_has_the_same_shape(monkeypatch):
+    def fake_call(prompt, cache=False):
+        if "[Item " in prompt:
+            # Item 1 left out: re-evaluated singly, and that reply is prose
+            return json.dumps({"evaluations": [_entry(0), _entry(2)]})
+        return "Solid answer overall."
+
+    monkeypatch.setattr(llm_client, "_call_grok", fake_call)
+    results = evaluate_answers_batch(ITEMS)["evaluations"]
+    keys = set(EVALUATION_FIELDS) | {"mode"}
+    assert all(set(r) == keys for r in results)
+    assert results[1]["detailed_feedback"] == "Solid answer overall."
+    assert results[0]["score"] == 7
+
+
+def test_provider_failure_uses_offline(monkeypatch):
+    def failing(prompt, cache=False):
+        raise RuntimeError("down")
+
+    monkeypatch.setattr(llm_client, "_call_grok", failing)
+    results = evaluate_answers_batch(ITEMS)["evaluations"]
+    assert all(r["mode"] == llm_client.MODE_OFFLINE for r in results)
+    assert all(set(r) == set(EVALUATION_FIELDS) | {"mode"} for r in results)
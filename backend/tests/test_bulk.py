@@ -0,0 +1,48 @@
+import io
+import json
+import zipfile
+
+from app import bulk
+
+JD = "Requirements:\n- Python, SQL\n"
+
+
+def _zip(entries, stored=True) -> bytes:
+    buf = io.BytesIO()
+    method = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(buf, "w", method) as zf:
+        for name, body in entries.items():
+            zf.writestr(name, body)
+    return buf.getvalue()
+
+
+def _screen(client, archive: bytes):
+    return client.post(
+        "/bulk/screen",
+        data={"job_description": JD},
+        files={"archive": ("cohort.zip", io.BytesIO(archive))},
+    )
+
+
+def test_corrupt_entry_becomes_an_error_row(client):
+    good = b"Skills: Python, SQL, Docker " * 4
+    bad = b"Skills: broken entry payload " * 4
+    archive = bytearray(_zip({"bad.txt": bad, "good.txt": good}))
+    # Flip bytes inside bad.txt's stored data so its CRC check fails
+    offset = archive.index(bad)
+    archive[offset:offset + 6] = b"XXXXXX"
+
+    r = _screen(client, bytes(archive))
+    assert r.status_code == 200
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    by_file = {row["file"]: row for row in rows}
+    assert "unreadable entry" in by_file["bad.txt"]["error"]
+    assert by_file["good.txt"]["total_score"] >= 0
+
+
+def test_too_many_files_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(bulk, "BULK_MAX_FILES", 2)
+    archive = _zip({f"r{i}.txt": f"Skills: Python {i}" for i in range(3)})
+    r = _screen(client, archive)
+    assert r.status_code == 413
+    assert "3 resumes" in r.json()["detail"]
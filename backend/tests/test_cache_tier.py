@@ -0,0 +1,65 @@
+import pytest
+
+from app import cache_tier
+from app.cache_tier import SharedStore, _MISSING
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def _store(tmp_path, clock, max_bytes=10_000):
+    return SharedStore(tmp_path / "cache.db", max_bytes=max_bytes, clock=clock)
+
+
+def test_entries_expire_at_their_ttl(tmp_path, clock):
+    store = _store(tmp_path, clock)
+    store.put("k", "ns", {"v": 1}, expires=clock.now + 60)
+    store.put("forever", "ns", "v")
+
+    clock.now += 59
+    assert store.get("k") == ({"v": 1}, clock.now + 1)
+    assert {key for key, _, _ in store.recent("ns", 10)} == {"forever", "k"}
+
+    clock.now += 1
+    assert store.get("k") is _MISSING
+    assert [key for key, _, _ in store.recent("ns", 10)] == ["forever"]
+    assert store.get("forever") == ("v", None)
+
+
+def test_evict_drops_expired_then_least_recent_to_target(tmp_path, clock):
+    value = "x" * 998                       # 1000 bytes once JSON-encoded
+    store = _store(tmp_path, clock, max_bytes=5_000)
+    store.put("stale", "ns", value, expires=clock.now + 1)
+    for i in range(6):
+        clock.now += 1
+        store.put(f"k{i}", "ns", value)
+
+    # A read older than the touch interval refreshes recency
+    clock.now += cache_tier._TOUCH_INTERVAL_SECONDS + 1
+    store.get("k0")
+
+    store.evict()
+
+    kept = {key for key, _, _ in store.recent("ns", 100)}
+    total = store._conn().execute("SELECT SUM(size) FROM cache").fetchone()[0]
+    assert "stale" not in kept
+    assert total <= 5_000 * cache_tier._EVICT_TARGET
+    assert "k0" in kept and "k5" in kept
+    assert "k1" not in kept and "k2" not in kept
+
+
+def test_oversized_entries_are_not_stored(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(cache_tier, "CACHE_MAX_ENTRY_BYTES", 100)
+    store = _store(tmp_path, clock)
+    store.put("big", "ns", "x" * 200)
+    assert store.get("big") is _MISSING
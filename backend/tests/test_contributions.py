@@ -0,0 +1,51 @@
+import pytest
+
+from app import scorer
+
+SKILLS = [
+    {"skill": "Python", "priority": "must"},
+    {"skill": "SQL", "priority": "must"},
+    {"skill": "Docker", "priority": "must"},
+    {"skill": "AWS", "priority": "preferred"},
+    {"skill": "React", "priority": "nice-to-have"},
+]
+
+
+def _columns(matched, missing):
+    breakdown, _ = scorer.compute_score_from_features(SKILLS, matched, missing, keyword_score=50, format_score=100)
+    return breakdown, breakdown["per_skill"]
+
+
+def test_columns_sum_to_breakdown_below_the_cap():
+    breakdown, rows = _columns({"Python", "SQL", "Docker"}, {"AWS", "React"})
+    penalties = scorer.WEIGHTS["missing_penalties"]
+
+    assert breakdown["missing_penalty"] < scorer.WEIGHTS["penalty_cap"]
+    assert sum(r["skills_match"] for r in rows) == pytest.approx(breakdown["skills_match"], abs=0.05)
+    by_skill = {r["skill"]: r for r in rows}
+    assert by_skill["AWS"]["missing_penalty"] == penalties["preferred"]
+    assert by_skill["React"]["missing_penalty"] == penalties["nice-to-have"]
+    assert by_skill["Python"]["missing_penalty"] == 0
+
+
+def test_penalties_scale_pro_rata_under_the_cap():
+    missing = {s["skill"] for s in SKILLS}
+    breakdown, rows = _columns(set(), missing)
+    penalties = scorer.WEIGHTS["missing_penalties"]
+    cap = scorer.WEIGHTS["penalty_cap"]
+    raw = {r["skill"]: penalties[r["priority"]] for r in rows}
+
+    assert sum(raw.values()) > cap
+    assert breakdown["missing_penalty"] == cap
+    assert sum(r["missing_penalty"] for r in rows) == pytest.approx(cap, abs=0.05)
+    # Each skill keeps its share of the raw penalty
+    for r in rows:
+        assert r["missing_penalty"] == pytest.approx(raw[r["skill"]] * cap / sum(raw.values()), abs=0.01)
+    assert all(r["skills_match"] == 0 for r in rows)
+
+
+def test_no_penalty_and_no_skills():
+    assert scorer.compute_skill_contributions([], set(), set()) == []
+    rows = scorer.compute_skill_contributions(SKILLS, {s["skill"] for s in SKILLS}, set())
+    assert sum(r["skills_match"] for r in rows) == pytest.approx(100.0, abs=0.05)
+    assert all(r["missing_penalty"] == 0 for r in rows)
@@ -0,0 +1,40 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import bulk, extractors
+
+
+def _in_pool_worker():
+    return extractors._in_pool_worker
+
+
+def test_only_our_pool_workers_ocr_inline():
+    assert extractors._in_pool_worker is False
+    assert bulk._get_pool().submit(_in_pool_worker).result(timeout=60) is True
+
+
+def _nap(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def test_overrun_is_bounded_by_one_deadline(monkeypatch):
+    monkeypatch.setattr(extractors, "OCR_WORKERS", 2)
+    jobs = {0: (0.1,), 1: (30,), 2: (30,)}
+
+    started = time.monotonic()
+    results = extractors._run_with_deadline(_nap, jobs, 5)
+
+    # Two rounds of two workers: one 10 s bound, not 5 s per stuck job
+    assert time.monotonic() - started < 20
+    assert results == {0: 0.1}
+
+
+def test_concurrent_runs_have_separate_pools(monkeypatch):
+    monkeypatch.setattr(extractors, "OCR_WORKERS", 1)
+    with ThreadPoolExecutor(max_workers=2) as threads:
+        stuck = threads.submit(extractors._run_with_deadline, _nap, {0: (30,)}, 2)
+        quick = threads.submit(extractors._run_with_deadline, _nap, {0: (4,)}, 20)
+        # Killing the overrunning run must not take the other one down
+        assert stuck.result(timeout=60) == {}
+        assert quick.result(timeout=60) == {0: 4}
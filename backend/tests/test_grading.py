@@ -0,0 +1,51 @@
+from app import grading
+from tests.conftest import bearer
+
+
+def _questions(client, topic="Data Analysis", count=3):
+    r = client.post("/aptitude/questions", data={"topic": topic, "count": count})
+    assert r.status_code == 200
+    return r.json()["questions"]
+
+
+def test_served_questions_carry_no_answer_key(client):
+    for q in _questions(client):
+        assert q["id"]
+        assert "correct_index" not in q and "explanation" not in q
+
+
+def test_submit_grades_against_stored_keys(client):
+    questions = _questions(client)
+    answers = [
+        {"question_id": q["id"], "selected_index": grading._answer_keys[q["id"]][1]}
+        for q in questions
+    ]
+    graded = client.post("/aptitude/submit", json={"answers": answers}).json()
+    assert graded["correct"] == graded["total"] == len(questions)
+    assert all("correct_index" in r for r in graded["results"])
+
+
+def test_stats_are_written_for_the_token_user_only(client):
+    questions = _questions(client, topic="Logical Reasoning", count=2)
+    answers = [{"question_id": q["id"], "selected_index": 0} for q in questions]
+
+    # A user named in the body is ignored
+    client.post("/aptitude/submit", json={"answers": answers, "user": "victim@example.com"})
+    assert client.get("/aptitude/stats", headers=bearer("victim@example.com")).json()["topics"] == {}
+
+    client.post("/aptitude/submit", json={"answers": answers}, headers=bearer("me@example.com"))
+    stats = client.get("/aptitude/stats", headers=bearer("me@example.com")).json()["topics"]
+    assert stats["Logical Reasoning"]["attempted"] == 2
+
+
+def test_submission_size_is_capped(client):
+    answers = [{"question_id": f"q{i}", "selected_index": 0} for i in range(201)]
+    assert client.post("/aptitude/submit", json={"answers": answers}).status_code == 400
+
+
+def test_stats_need_a_token_and_ignore_the_query_user(client):
+    assert client.get("/aptitude/stats", params={"user": "me@example.com"}).status_code == 401
+
+    r = client.get("/aptitude/stats", params={"user": "me@example.com"}, headers=bearer("nobody@example.com"))
+    assert r.json() == {"user": "nobody@example.com", "topics": {}}
+    assert "user" not in client.get("/aptitude/stats/overall").json()
@@ -0,0 +1,13 @@
+from app.jd_parser import parse_jd
+
+
+def test_required_years_is_the_highest_stated():
+    parsed = parse_jd("Requirements:\n- 3+ years SQL\n- 6+ years Python\n- 1 year Docker\n")
+    assert parsed["required_years"] == 6
+    assert parsed["level"] == "senior"
+
+
+def test_no_years_falls_back_to_title_cue():
+    parsed = parse_jd("Senior Backend Engineer\nRequirements:\n- Python, Docker\n")
+    assert parsed["required_years"] is None
+    assert parsed["level"] == "senior"
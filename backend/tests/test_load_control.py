@@ -0,0 +1,100 @@
+from contextlib import nullcontext
+
+import pytest
+
+from app import load_control
+from app.load_control import DegradationController, MODE_LLM, MODE_OFFLINE
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def ctl(clock):
+    return DegradationController(clock)
+
+
+def _call(ctl, clock, seconds=0.1, fail=False):
+    assert ctl.allow()
+    with pytest.raises(RuntimeError) if fail else nullcontext():
+        with ctl.track():
+            clock.now += seconds
+            if fail:
+                raise RuntimeError("provider down")
+
+
+def _degrade(ctl, clock):
+    for _ in range(load_control.MIN_SAMPLES):
+        _call(ctl, clock, fail=True)
+    assert ctl.mode == MODE_OFFLINE
+
+
+def test_error_rate_degrades_only_after_min_samples(ctl, clock):
+    for _ in range(load_control.MIN_SAMPLES - 1):
+        _call(ctl, clock, fail=True)
+    assert ctl.mode == MODE_LLM
+    _call(ctl, clock, fail=True)
+    assert ctl.mode == MODE_OFFLINE
+
+
+def test_latency_ewma_degrades(ctl, clock):
+    for _ in range(load_control.MIN_SAMPLES):
+        _call(ctl, clock, seconds=load_control.ENTER_LATENCY_S * 2)
+    assert ctl.mode == MODE_OFFLINE
+
+
+def test_healthy_calls_stay_online(ctl, clock):
+    for _ in range(load_control.WINDOW * 2):
+        _call(ctl, clock)
+    assert ctl.mode == MODE_LLM
+
+
+def test_inflight_cap_sheds_calls(ctl):
+    for _ in range(load_control.MAX_INFLIGHT):
+        assert ctl.allow()
+    assert not ctl.allow()
+    assert ctl.snapshot()["inflight"] == load_control.MAX_INFLIGHT
+
+
+def test_probe_interval_and_hysteresis_before_recovery(ctl, clock):
+    _degrade(ctl, clock)
+    assert not ctl.allow()
+
+    clock.now += load_control.PROBE_INTERVAL_S
+    assert ctl.allow()
+    # One probe at a time
+    assert not ctl.allow()
+    with ctl.track():
+        clock.now += 0.1
+    assert ctl.mode == MODE_OFFLINE
+
+    # A good probe is followed up right away, the streak completes recovery
+    for _ in range(load_control.PROBE_SUCCESSES - 1):
+        _call(ctl, clock)
+    assert ctl.mode == MODE_LLM
+    assert ctl.snapshot()["window"] == 0
+
+
+def test_slow_probe_resets_the_streak(ctl, clock):
+    _degrade(ctl, clock)
+    clock.now += load_control.PROBE_INTERVAL_S
+    _call(ctl, clock)
+    _call(ctl, clock, seconds=load_control.EXIT_LATENCY_S + 1)
+    assert ctl.mode == MODE_OFFLINE
+
+    # Back to waiting a full interval for the next probe
+    assert not ctl.allow()
+    clock.now += load_control.PROBE_INTERVAL_S
+    for _ in range(load_control.PROBE_SUCCESSES):
+        _call(ctl, clock)
+    assert ctl.mode == MODE_LLM
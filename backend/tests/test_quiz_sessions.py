@@ -0,0 +1,154 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app import grading, quiz_sessions
+from app.llm_client import OFFLINE_QUESTION_BANK, generate_aptitude_questions
+from db.database import get_connection
+from tests.conftest import bearer
+
+TOPIC = "Software Engineering"
+
+
+def _key(qid):
+    grading._load_keys([qid])
+    return grading._answer_keys[qid][1]
+
+
+def _answer(client, session_id, selected_index):
+    r = client.post(f"/aptitude/session/{session_id}/answer", json={"selected_index": selected_index})
+    assert r.status_code == 200
+    return r.json()
+
+
+def test_offline_questions_keep_their_id_options_and_level():
+    first = {q["id"]: q for q in generate_aptitude_questions("ALL", 50)["questions"]}
+    again = {q["id"]: q for q in generate_aptitude_questions("ALL", 50)["questions"]}
+    stems = sum(len(qs) for qs in OFFLINE_QUESTION_BANK.values())
+
+    assert len(first) == stems
+    assert all(first[qid]["options"] == q["options"] for qid, q in again.items())
+    assert {q["difficulty"] for q in first.values()} == set(quiz_sessions.LEVELS)
+
+
+def test_repeated_stem_is_served_as_stored():
+    original = {
+        "topic": "Registry", "difficulty": "Medium", "question": "Which is the odd one out?",
+        "options": ["2", "4", "7", "8"], "correct_index": 2, "explanation": "Only 7 is odd."
+    }
+    reshuffled = dict(original, question="  which is the ODD one out? ", options=["7", "8", "2", "4"], correct_index=0)
+    grading.register_questions([original])
+    grading.register_questions([reshuffled])
+
+    assert reshuffled["id"] == original["id"]
+    assert reshuffled["options"] == original["options"]
+    assert _key(original["id"]) == 2
+
+
+def test_staircase_and_no_repeats_across_sessions(client):
+    headers = bearer("quiz@example.com")
+    start = client.post("/aptitude/session", json={"topic": TOPIC, "length": 2, "level": "Easy"}, headers=headers).json()
+    assert start["level"] == "Easy"
+
+    first_q = start["question"]
+    step = _answer(client, start["session_id"], _key(first_q["id"]))
+    assert step["result"]["correct"] is True
+    second_q = step["question"]
+    done = _answer(client, start["session_id"], _key(second_q["id"]))
+    assert done["level"] == "Medium"
+    assert done["finished"] is True
+
+    later = client.post("/aptitude/session", json={"topic": TOPIC, "length": 2}, headers=headers).json()
+    served = {first_q["id"], second_q["id"]}
+    assert later["question"]["id"] not in served
+    wrong = (_key(later["question"]["id"]) + 1) % 4
+    step = _answer(client, later["session_id"], wrong)
+    assert step["result"]["correct"] is False
+    assert step["question"]["id"] not in served
+
+
+def test_seen_bits_are_dense_per_topic():
+    quiz_sessions.bank.refresh()
+    positions = [bit for topic, bit in quiz_sessions.bank.positions.values() if topic == TOPIC]
+    assert sorted(positions) == list(range(quiz_sessions.bank.topic_sizes[TOPIC]))
+
+
+def test_vanished_current_question_is_gone_not_500(client):
+    session = client.post("/aptitude/session", json={"topic": TOPIC}).json()
+    conn = get_connection()
+    try:
+        row = conn.execute("SELECT state FROM aptitude_sessions WHERE session_id = ?", (session["session_id"],)).fetchone()
+        state = json.loads(row["state"])
+        state["current"] = "0000000000000000"
+        conn.execute("UPDATE aptitude_sessions SET state = ? WHERE session_id = ?",
+                     (json.dumps(state), session["session_id"]))
+        conn.commit()
+    finally:
+        conn.close()
+
+    assert client.get(f"/aptitude/session/{session['session_id']}").status_code == 410
+    r = client.post(f"/aptitude/session/{session['session_id']}/answer", json={"selected_index": 0})
+    assert r.status_code == 410
+
+
+def test_new_session_starts_at_medium_and_unknown_labels_are_explicit(client):
+    session = client.post("/aptitude/session", json={"topic": TOPIC}).json()
+    assert session["level"] == "Medium"
+    assert quiz_sessions.level_of("legendary") == quiz_sessions.UNKNOWN_LEVEL
+    assert quiz_sessions.level_of(None) == quiz_sessions.UNKNOWN_LEVEL
+
+
+def test_conflicting_answer_is_not_counted(client, monkeypatch):
+    user = "conflict@example.com"
+    session = client.post("/aptitude/session", json={"topic": TOPIC}, headers=bearer(user)).json()
+    sid = session["session_id"]
+    key = _key(session["question"]["id"])
+
+    # Another worker answers first, but this one already loaded the old state
+    stale = quiz_sessions._load(sid)
+    conn = get_connection()
+    try:
+        conn.execute(
+            "UPDATE aptitude_sessions SET state = json_set(state, '$.version', ?) WHERE session_id = ?",
+            (stale["version"] + 1, sid),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    with monkeypatch.context() as m:
+        m.setattr(quiz_sessions, "_load", lambda _sid: json.loads(json.dumps(stale)))
+        with pytest.raises(quiz_sessions.SessionConflict):
+            quiz_sessions.answer_question(sid, key)
+    assert grading.topic_stats(user) == {}
+
+    _answer(client, sid, key)
+    assert grading.topic_stats(user)[TOPIC]["attempted"] == 1
+
+
+def test_concurrent_sessions_keep_each_others_seen_bits(client):
+    user = "parallel@example.com"
+    sessions = [
+        client.post("/aptitude/session", json={"topic": TOPIC, "length": 6}, headers=bearer(user)).json()
+        for _ in range(2)
+    ]
+
+    def play(session_id):
+        while True:
+            state = quiz_sessions._load(session_id)
+            if state["current"] is None:
+                return quiz_sessions._decode(state["seen"])[TOPIC]
+            try:
+                quiz_sessions.answer_question(session_id, 0)
+            except quiz_sessions.SessionConflict:
+                continue
+
+    with ThreadPoolExecutor(max_workers=2) as threads:
+        seen = list(threads.map(play, [s["session_id"] for s in sessions]))
+
+    conn = get_connection()
+    try:
+        stored = quiz_sessions._load_user_seen(conn, user, TOPIC)[TOPIC]
+    finally:
+        conn.close()
+    assert stored == seen[0] | seen[1]
@@ -0,0 +1,60 @@
+import sqlite3
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import ratelimit
+from app.ratelimit import MemoryBackend, RateLimitMiddleware, SQLiteBackend
+
+
+def _app(backend, capacity=3, rate=0.001):
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, backend=backend, capacity=capacity,
+                       refill_per_sec=rate, route_costs={})
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_bucket_empties_then_429(backend, tmp_path):
+    store = MemoryBackend() if backend == "memory" else SQLiteBackend(tmp_path / "rl.db")
+    client = _app(store)
+    assert [client.get("/ping").status_code for _ in range(4)] == [200, 200, 200, 429]
+    assert int(client.get("/ping").headers["retry-after"]) >= 1
+
+
+def test_memory_backend_drops_refilled_buckets(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: clock[0])
+    backend = MemoryBackend()
+    for i in range(50):
+        backend.take(f"ip:{i}", 1, capacity=10, rate=1)
+    clock[0] += 11          # every bucket has refilled to capacity
+    backend.take("ip:new", 1, capacity=10, rate=1)
+    assert list(backend._buckets) == ["ip:new"]
+
+
+def test_memory_backend_is_capped():
+    backend = MemoryBackend(max_keys=10)
+    for i in range(100):
+        backend.take(f"ip:{i}", 1, capacity=10, rate=0.001)
+    assert len(backend._buckets) == 10
+    assert "ip:99" in backend._buckets
+
+
+def test_sqlite_backend_fails_open_when_locked(tmp_path):
+    path = tmp_path / "rl.db"
+    backend = SQLiteBackend(path)
+    backend._conn().execute("PRAGMA busy_timeout = 0")
+    holder = sqlite3.connect(str(path), isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    try:
+        assert backend.take("ip:1", 1, capacity=1, rate=1) == (True, 0.0)
+    finally:
+        holder.execute("ROLLBACK")
+        holder.close()
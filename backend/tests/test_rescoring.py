@@ -0,0 +1,89 @@
+import io
+import json
+import zipfile
+
+from app import rescoring, scorer, storage
+from app.jd_profiles import register_jd
+from app.resume_parser import match_skill_spans
+from db.database import get_connection
+
+JD = "Requirements:\n- Python, SQL, Docker\nNice to have: React\n"
+RESUME = "Built Python services and SQL reports, shipped with Docker."
+
+
+def _analysis(resume_text=RESUME, body=None):
+    resume_id = storage.put(body or resume_text.encode(), "cv.txt")
+    storage.write_text(resume_id, resume_text)
+    profile = register_jd(JD)
+    skills, spans = match_skill_spans(resume_text)
+    features = rescoring.extract_features(skills, resume_text, profile)
+    result = rescoring.score_features(skills, features, profile, spans)
+    return rescoring.record_result(resume_id, profile.jd_id, None, features, result), resume_id
+
+
+def _row(analysis_id):
+    conn = get_connection()
+    try:
+        return conn.execute("SELECT * FROM analyses WHERE id = ?", (analysis_id,)).fetchone()
+    finally:
+        conn.close()
+
+
+def test_weights_change_rescores_from_features(monkeypatch):
+    analysis_id, _ = _analysis()
+    before = _row(analysis_id)
+
+    weights = json.loads(json.dumps(scorer.WEIGHTS))
+    weights["components"] = {"skills": 1.0, "keywords": 0.0, "experience": 0.0, "format": 0.0}
+    weights["version"] = "test-2"
+    monkeypatch.setattr(scorer, "WEIGHTS", weights)
+    monkeypatch.setattr(rescoring, "WEIGHTS_VERSION", "test-2")
+
+    stats = rescoring.rescore_pending(batch_size=2)
+    after = _row(analysis_id)
+    assert stats["rescored"] >= 1
+    assert after["weights_version"] == "test-2"
+    assert after["total_score"] != before["total_score"]
+    assert json.loads(after["result"])["matched_skills"] == json.loads(before["result"])["matched_skills"]
+    assert rescoring.rescore_pending()["rescored"] == 0
+
+
+def test_taxonomy_change_rematches_from_cached_text(monkeypatch):
+    analysis_id, _ = _analysis(body=b"taxonomy test one")
+    uncached_id, uncached_resume = _analysis(body=b"taxonomy test two")
+    storage.text_path(storage.split_resume_id(uncached_resume)[0]).unlink()
+
+    monkeypatch.setattr(rescoring, "TAXONOMY_VERSION", "tax-2")
+    stats = rescoring.rescore_pending()
+
+    assert stats["skipped"] >= 1
+    assert _row(analysis_id)["taxonomy_version"] == "tax-2"
+    # No cached text: left as recorded, not guessed
+    assert _row(uncached_id)["taxonomy_version"] != "tax-2"
+
+
+def test_bulk_screening_is_recorded_for_rescoring(client):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("bulk_rescore.txt", "Skills: Python, SQL, Docker for bulk rescoring")
+    r = client.post("/bulk/screen", data={"job_description": JD},
+                    files={"archive": ("a.zip", io.BytesIO(buf.getvalue()))})
+    row = json.loads(r.text.splitlines()[0])
+
+    stored = _row(row["analysis_id"])
+    assert stored["resume_id"] == row["resume_id"]
+    assert stored["jd_id"] == row["jd_id"]
+
+
+def test_explicit_zero_weight_is_respected():
+    skills = [
+        {"skill": "Python", "priority": "must", "weight": 0},
+        {"skill": "SQL", "priority": "must"},
+    ]
+    assert scorer.compute_skill_score(skills, {"Python"}, {"SQL"}) == 0.0
+    assert scorer.compute_skill_score(skills, {"SQL"}, {"Python"}) == 100.0
+
+    custom = json.loads(json.dumps(scorer.WEIGHTS))
+    custom["priority_weights"]["must"] = 3.0
+    mixed = [{"skill": "Python", "priority": "must"}, {"skill": "Git", "priority": "nice-to-have"}]
+    assert scorer.compute_skill_score(mixed, {"Python"}, {"Git"}, custom) == 75.0
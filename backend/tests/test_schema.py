@@ -0,0 +1,50 @@
+import json
+import sqlite3
+
+from app import jd_profiles, scorer
+from db import database
+
+
+def _columns(path, table):
+    conn = sqlite3.connect(path)
+    try:
+        return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    finally:
+        conn.close()
+
+
+def test_init_db_upgrades_tables_from_older_releases(tmp_path, monkeypatch):
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE jd_profiles (jd_id TEXT PRIMARY KEY, title TEXT, profile TEXT NOT NULL, created_at TEXT NOT NULL)")
+    conn.execute("CREATE TABLE aptitude_questions (question_id TEXT PRIMARY KEY, topic TEXT, correct_index INTEGER NOT NULL, explanation TEXT)")
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(database, "DB_PATH", path)
+    database.init_db()
+    database.init_db()
+
+    assert "jd_text" in _columns(path, "jd_profiles")
+    assert {"difficulty", "body"} <= _columns(path, "aptitude_questions")
+
+
+def test_partial_weights_override_keeps_other_defaults(tmp_path):
+    path = tmp_path / "weights.json"
+    path.write_text(json.dumps({"version": 7, "components": {"skills": 0.6}}))
+
+    weights = scorer.load_weights(path)
+    assert weights["version"] == "7"
+    assert weights["components"]["skills"] == 0.6
+    assert weights["components"]["keywords"] == scorer.DEFAULT_WEIGHTS["components"]["keywords"]
+    assert weights["priority_weights"] == scorer.DEFAULT_WEIGHTS["priority_weights"]
+
+
+def test_profile_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(jd_profiles, "JD_PROFILE_CACHE_SIZE", 2)
+    ids = [jd_profiles.register_jd(f"Requirements:\n- Python {i}\n").jd_id for i in range(3)]
+
+    assert len(jd_profiles._profiles) <= 2
+    assert ids[0] not in jd_profiles._profiles
+    # Evicted profiles still load from the database
+    assert jd_profiles.get_profile(ids[0]).jd_id == ids[0]
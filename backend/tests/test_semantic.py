@@ -0,0 +1,8 @@
+from app import semantic
+
+
+def test_not_ready_falls_back_without_blocking(monkeypatch):
+    monkeypatch.setattr(semantic, "is_available", lambda: True)
+    monkeypatch.setattr(semantic, "_warm_thread", object())  # warm-up "in flight"
+    monkeypatch.setattr(semantic, "_ready", semantic.threading.Event())
+    assert semantic.match_skills("Python and ML", budget_ms=50) is None
@@ -0,0 +1,48 @@
+import threading
+
+from app import llm_client
+from app.singleflight import SingleFlight
+
+
+def test_leader_and_followers_get_independent_results():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    results = {}
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return {"items": [1, 2]}
+
+    def run(name):
+        results[name] = flights.do("k", slow)
+
+    leader = threading.Thread(target=run, args=("leader",))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=run, args=(f"f{i}",)) for i in range(3)]
+    for t in followers:
+        t.start()
+    while flights._calls["k"].waiters < 3:
+        pass
+    release.set()
+    for t in [leader, *followers]:
+        t.join(5)
+
+    results["leader"]["items"].append(3)
+    assert [results[f"f{i}"]["items"] for i in range(3)] == [[1, 2]] * 3
+    assert len({id(r) for r in results.values()}) == 4
+
+
+def test_self_intro_prompt_carries_the_real_name(monkeypatch):
+    prompts = []
+
+    def fake_call(prompt, cache=False):
+        prompts.append((prompt, cache))
+        return "Hello, I am Asha."
+
+    monkeypatch.setattr(llm_client, "_call_grok", fake_call)
+    result = llm_client.generate_self_intro("Asha", "Data Analyst", "30s", "Formal")
+    assert result["result"] == "Hello, I am Asha."
+    prompt, cache = prompts[0]
+    assert "Name: Asha" in prompt and not cache
@@ -0,0 +1,123 @@
+import io
+import threading
+
+import pytest
+
+from app import storage
+from tests.conftest import bearer
+
+
+def _upload(client, body: bytes, name="cv.txt", headers=None):
+    r = client.post("/resume/upload", files={"file": (name, io.BytesIO(body))}, headers=headers or {})
+    assert r.status_code == 200
+    return r.json()["resume_id"]
+
+
+def test_delete_requires_auth(client):
+    resume_id = _upload(client, b"Skills: Python", headers=bearer("a@example.com"))
+    assert client.delete(f"/resume/{resume_id}").status_code == 401
+
+
+def test_owner_can_delete_once(client):
+    headers = bearer("owner@example.com")
+    resume_id = _upload(client, b"Skills: SQL, Docker", headers=headers)
+    path = storage.resolve(resume_id)
+
+    assert client.delete(f"/resume/{resume_id}", headers=headers).status_code == 200
+    assert not path.exists()
+    assert client.delete(f"/resume/{resume_id}", headers=headers).status_code == 404
+
+
+def test_other_user_cannot_delete(client):
+    resume_id = _upload(client, b"Skills: AWS", headers=bearer("mine@example.com"))
+    r = client.delete(f"/resume/{resume_id}", headers=bearer("thief@example.com"))
+    assert r.status_code == 404
+    assert storage.resolve(resume_id).exists()
+
+
+def test_shared_blob_survives_one_owner_deleting(client):
+    body = b"Skills: React, Git"
+    first = _upload(client, body, headers=bearer("one@example.com"))
+    _upload(client, body, headers=bearer("two@example.com"))
+
+    assert client.delete(f"/resume/{first}", headers=bearer("one@example.com")).status_code == 200
+    assert storage.resolve(first).exists()
+
+
+def test_non_digest_ids_never_touch_data_dir(client):
+    headers = bearer("a@example.com")
+    decoy = storage.DATA_DIR / "skills_master.json"
+    decoy.write_text("{}")
+    for resume_id in ("skills_master.json", "blobs", "text"):
+        assert client.delete(f"/resume/{resume_id}", headers=headers).status_code == 404
+    assert decoy.exists()
+    assert client.post("/resume/parse", data={"resume_id": "skills_master.json"}).status_code == 404
+
+
+def test_raw_read_refreshes_last_access(client):
+    resume_id = _upload(client, b"Skills: Linux")
+    digest, _ = storage.split_resume_id(resume_id)
+    conn = storage.get_connection()
+    conn.execute("UPDATE blobs SET last_access = '2000-01-01T00:00:00' WHERE digest = ?", (digest,))
+    conn.commit()
+    conn.close()
+
+    with storage.open_buffer(resume_id):
+        pass
+
+    conn = storage.get_connection()
+    row = conn.execute("SELECT last_access FROM blobs WHERE digest = ?", (digest,)).fetchone()
+    conn.close()
+    assert row["last_access"] > "2000-01-01T00:00:00"
+
+
+def _age(digest: str):
+    conn = storage.get_connection()
+    conn.execute("UPDATE blobs SET last_access = '2000-01-01T00:00:00' WHERE digest = ?", (digest,))
+    conn.commit()
+    conn.close()
+
+
+def test_anonymous_upload_expires_once_unread(client):
+    anonymous = _upload(client, b"Skills: Kotlin")
+    owned = _upload(client, b"Skills: Swift", headers=bearer("keeper@example.com"))
+    for resume_id in (anonymous, owned):
+        _age(storage.split_resume_id(resume_id)[0])
+
+    storage.gc()
+
+    with pytest.raises(FileNotFoundError):
+        storage.resolve(anonymous)
+    assert storage.resolve(owned).exists()
+
+
+def test_legacy_ids_are_imported_and_still_parse(client):
+    legacy_id = "123e4567-e89b-12d3-a456-426614174000__old_cv.txt"
+    (storage.DATA_DIR / legacy_id).write_bytes(b"Skills: Python, Docker")
+
+    for _ in range(2):
+        r = client.post("/resume/parse", data={"resume_id": legacy_id})
+        assert r.status_code == 200
+        assert "Python" in r.json()["skills"]
+    assert not (storage.DATA_DIR / legacy_id).exists()
+
+    escaped = "123e4567-e89b-12d3-a456-426614174000__..\\users.db"
+    assert client.post("/resume/parse", data={"resume_id": escaped}).status_code == 404
+
+
+def test_concurrent_upload_and_release_never_dangle(client):
+    body = b"Skills: Rust, Go"
+
+    def churn(owner):
+        for _ in range(20):
+            resume_id = storage.put(body, "cv.txt", owner)
+            storage.release(resume_id, owner)
+
+    threads = [threading.Thread(target=churn, args=(f"u{i}@example.com",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    resume_id = storage.put(body, "cv.txt", "last@example.com")
+    assert storage.resolve(resume_id).exists()
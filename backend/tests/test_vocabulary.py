@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from app import vocabulary
+from app.vocabulary import VocabularyAnalyzer, evaluate, evaluate_vocabulary
+
+TRANSCRIPT = (
+    "I built data pipelines in Python for the team. Um, basically we moved the nightly jobs "
+    "to Docker on AWS, because the old cron host kept failing. As a result, the reports were "
+    "ready by eight! For example, the SQL models now run in parallel; however, I mean, we still "
+    "review every change. You know, Machine Learning features come next"
+)
+
+
+def test_interim_metrics_do_not_change_the_stream():
+    analyzer = VocabularyAnalyzer()
+    analyzer.feed("I built data pipel")
+    analyzer.metrics()
+    analyzer.feed("ines in Python for the team.")
+
+    m = analyzer.metrics()
+    assert m["words"] == 9
+    assert m["sentences"] == 1
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_chunked_stream_matches_whole_text(seed):
+    rng = random.Random(seed)
+    whole = evaluate_vocabulary(TRANSCRIPT, role="Data Analyst", duration_seconds=40)
+
+    analyzer = VocabularyAnalyzer("Data Analyst")
+    pos = 0
+    while pos < len(TRANSCRIPT):
+        step = rng.randint(1, 12)
+        analyzer.feed(TRANSCRIPT[pos:pos + step])
+        pos += step
+        if rng.random() < 0.5:
+            analyzer.metrics(40)
+            evaluate(analyzer, 40)
+
+    assert evaluate(analyzer, 40) == whole
+
+
+def test_empty_transcript_scores_zero_throughout():
+    result = evaluate_vocabulary("   ", duration_seconds=30)
+    assert result["score"] == 0
+    assert result["fluency_score"] == result["vocabulary_score"] == result["coherence_score"] == 0
+    assert result["pace_score"] is None
+
+
+def test_non_positive_duration_is_rejected(client):
+    with pytest.raises(ValueError):
+        evaluate_vocabulary(TRANSCRIPT, duration_seconds=0)
+
+    for duration in ("0", "-5"):
+        r = client.post("/vocab/evaluate", data={"transcript": TRANSCRIPT, "duration_seconds": duration})
+        assert r.status_code == 422
+    r = client.post("/vocab/evaluate", data={"transcript": TRANSCRIPT, "duration_seconds": "45"})
+    assert r.status_code == 200
+    assert r.json()["pace_score"] is not None
+
+
+def test_too_long_transcript_is_rejected():
+    with pytest.raises(ValueError):
+        evaluate_vocabulary("word " * (vocabulary.VOCAB_MAX_CHARS // 5 + 1))
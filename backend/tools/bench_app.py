@@ -0,0 +1,164 @@
+"""
+App Startup / Request Overhead Benchmark
+
+Measures, in-process and without a network socket:
+- cold import + create_app() time (in a fresh interpreter)
+- per-request latency of a trivial route through each middleware stack
+- response size of a full aptitude question set with/without compression;
+  questions come from tools/mock_llm.py (started here, zero latency), so
+  no provider is called; the response cache is off and the app writes to a
+  throwaway database
+
+Usage (from backend/):
+    python -m tools.bench_app [--requests 2000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+STARTUP_SNIPPET = (
+    "import time; t = time.perf_counter(); "
+    "from app.main import create_app; t1 = time.perf_counter(); create_app(); "
+    "print(t1 - t, time.perf_counter() - t1)"
+)
+
+STACKS = {
+    "bare": dict(cors_origins=[], compression="none", timing=False, rate_limit=False),
+    "cors": dict(compression="none", timing=False, rate_limit=False),
+    "cors+gzip": dict(compression="gzip", timing=False, rate_limit=False),
+    "full": dict(),
+}
+
+
+async def _call(app, method, path, body=b"", headers=()):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"origin", b"http://localhost:5173"), *headers],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    sent = False
+    size = 0
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal size
+        if message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return size
+
+
+def bench_startup(runs: int):
+    imports, builds = [], []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", STARTUP_SNIPPET],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        imports.append(float(out[-2]) * 1000)
+        builds.append(float(out[-1]) * 1000)
+    print(f"startup   import {statistics.median(imports):8.1f} ms   create_app {statistics.median(builds):6.2f} ms")
+
+
+async def bench_requests(n: int):
+    from app.main import create_app
+
+    print(f"\n{'stack':<12}{'p50 us':>10}{'p95 us':>10}{'mean us':>10}")
+    for name, kwargs in STACKS.items():
+        app = create_app(**kwargs)
+        for _ in range(50):
+            await _call(app, "GET", "/health/llm")
+        samples = []
+        for _ in range(n):
+            t = time.perf_counter()
+            await _call(app, "GET", "/health/llm")
+            samples.append((time.perf_counter() - t) * 1e6)
+        samples.sort()
+        print(f"{name:<12}{samples[len(samples) // 2]:>10.1f}{samples[int(len(samples) * 0.95)]:>10.1f}"
+              f"{statistics.fmean(samples):>10.1f}")
+
+
+async def bench_payload():
+    from app.main import create_app
+
+    body = b"topic=ALL&count=25"
+    form = [(b"content-type", b"application/x-www-form-urlencoded")]
+    print()
+    for name in ("cors", "cors+gzip"):
+        app = create_app(**STACKS[name])
+        size = await _call(app, "POST", "/aptitude/questions", body,
+                           [*form, (b"accept-encoding", b"gzip, br")])
+        print(f"{name:<12}/aptitude/questions (25) -> {size} bytes")
+
+
+def spawn_mock(port: int):
+    """Start the mock LLM and point the app at it (must run before app import)."""
+    mock_url = f"http://127.0.0.1:{port}"
+    mock = subprocess.Popen(
+        [sys.executable, "-m", "tools.mock_llm", "--port", str(port),
+         "--latency-ms", "0", "--latency-dist", "fixed"],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    os.environ["LLM_BASE_URL"] = f"{mock_url}/v1"
+    os.environ["GROK_API_KEY"] = "mock"
+    os.environ["CACHE_ENABLED"] = "0"
+    os.environ["DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="bench-app-"), "bench.db")
+    deadline = time.time() + 30
+    while True:
+        try:
+            urllib.request.urlopen(f"{mock_url}/docs", timeout=1)
+            return mock
+        except (urllib.error.URLError, OSError):
+            if time.time() > deadline or mock.poll() is not None:
+                mock.terminate()
+                raise RuntimeError(f"mock LLM did not come up on {mock_url}")
+            time.sleep(0.2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--startup-runs", type=int, default=5)
+    parser.add_argument("--mock-port", type=int, default=8089)
+    args = parser.parse_args()
+
+    os.environ.setdefault("RATE_LIMIT_CAPACITY", str(args.requests * 10))
+    mock = spawn_mock(args.mock_port)
+    try:
+        bench_startup(args.startup_runs)
+        asyncio.run(bench_requests(args.requests))
+        asyncio.run(bench_payload())
+    finally:
+        mock.terminate()
+        mock.wait()
+
+
+if __name__ == "__main__":
+    main()
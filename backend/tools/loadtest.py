@@ -0,0 +1,211 @@
+"""
+Load-Test Scenario Suite
+
+Drives the API's routes concurrently with a weighted scenario mix and
+reports throughput plus p50/p95/p99 latency per scenario.
+
+With --spawn it starts tools/mock_llm.py and the app itself (uvicorn with
+--workers N, rate limiting off, LLM_BASE_URL pointed at the mock), so
+worker counts and connection pools can be capacity-planned offline.
+
+Usage (from backend/):
+    python -m tools.loadtest --spawn --workers 2 --concurrency 32 --duration 30
+    python -m tools.loadtest --base-url http://127.0.0.1:8000 --scenarios selfintro,questions
+"""
+import argparse
+import io
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+import requests
+
+ROLES = ["Data Analyst", "Backend Engineer", "Frontend Developer", "ML Engineer", "Product Manager"]
+TOPICS = ["ALL", "Data Analysis", "Software Engineering", "Logical Reasoning", "Business Analysis"]
+LENGTHS = ["15s", "30s", "60s"]
+TONES = ["Formal", "Confident", "Friendly"]
+
+JD_TEXT = (
+    "Requirements:\n- 3+ years Python and SQL\n- Docker, AWS\n"
+    "Nice to have: React, Machine Learning\n"
+)
+
+
+def _resume_bytes() -> bytes:
+    skills = random.sample(["Python", "SQL", "Docker", "AWS", "React", "Git", "Communication"], 4)
+    return (f"Candidate {random.random()}\nSkills: {', '.join(skills)}\n" * 10).encode()
+
+
+# name -> (weight, request builder); builders return (method, path, kwargs)
+SCENARIOS = {
+    "selfintro": (3, lambda: ("POST", "/selfintro/generate", {"data": {
+        "name": "Load Test", "role": random.choice(ROLES),
+        "length": random.choice(LENGTHS), "tone": random.choice(TONES)}})),
+    "questions": (3, lambda: ("POST", "/aptitude/questions", {"data": {
+        "topic": random.choice(TOPICS), "count": random.choice([5, 10, 25])}})),
+    "evaluate": (3, lambda: ("POST", "/aptitude/evaluate", {"data": {
+        "question": f"Explain CAP theorem trade-offs ({random.random()})",
+        "answer": "Consistency, availability and partition tolerance cannot all hold at once."}})),
+    "evaluate_batch": (1, lambda: ("POST", "/aptitude/evaluate/batch", {"json": {"items": [
+        {"question": f"Question {i} ({random.random()})", "answer": "An answer of moderate length."}
+        for i in range(random.randint(2, 8))]}})),
+    "analyze": (2, lambda: ("POST", "/analyze/resume/analyze", {
+        "data": {"job_description": JD_TEXT},
+        "files": {"file": ("resume.txt", io.BytesIO(_resume_bytes()))}})),
+    "health": (1, lambda: ("GET", "/health/llm", {})),
+}
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.elapsed = 0.0
+
+    def add(self, name: str, seconds: float, status):
+        with self.lock:
+            self.latencies[name].append(seconds)
+            self.statuses[name][status] += 1
+
+
+def _percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _worker(base_url, mix, deadline, remaining, recorder, timeout):
+    names, weights = zip(*mix)
+    session = requests.Session()
+    while time.perf_counter() < deadline:
+        if remaining is not None:
+            with remaining["lock"]:
+                if remaining["n"] <= 0:
+                    return
+                remaining["n"] -= 1
+        name = random.choices(names, weights)[0]
+        method, path, kwargs = SCENARIOS[name][1]()
+        start = time.perf_counter()
+        try:
+            status = session.request(method, base_url + path, timeout=timeout, **kwargs).status_code
+        except requests.RequestException as e:
+            status = type(e).__name__
+        recorder.add(name, time.perf_counter() - start, status)
+
+
+def run(base_url, scenarios, concurrency, duration, total, timeout) -> Recorder:
+    mix = [(name, SCENARIOS[name][0]) for name in scenarios]
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+    remaining = {"n": total, "lock": threading.Lock()} if total else None
+
+    threads = [
+        threading.Thread(target=_worker, args=(base_url, mix, deadline, remaining, recorder, timeout), daemon=True)
+        for _ in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    recorder.elapsed = time.perf_counter() - start
+    return recorder
+
+
+def report(recorder: Recorder):
+    header = f"{'scenario':<16}{'reqs':>7}{'rps':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}  statuses"
+    print(header)
+    print("-" * len(header))
+    everything = []
+    for name in sorted(recorder.latencies):
+        values = sorted(recorder.latencies[name])
+        everything.extend(values)
+        _report_row(name, values, recorder.elapsed, dict(recorder.statuses[name]))
+    everything.sort()
+    total_statuses = sum(recorder.statuses.values(), Counter())
+    _report_row("TOTAL", everything, recorder.elapsed, dict(total_statuses))
+
+
+def _report_row(name, values, elapsed, statuses):
+    ms = lambda q: _percentile(values, q) * 1000
+    print(f"{name:<16}{len(values):>7}{len(values) / elapsed:>8.1f}{ms(0.50):>9.0f}{ms(0.95):>9.0f}"
+          f"{ms(0.99):>9.0f}{(values[-1] if values else 0) * 1000:>9.0f}  {statuses}")
+
+
+# ---------------- SPAWN ----------------
+def _wait_ready(url, timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+
+def spawn(args):
+    """Start the mock LLM and the app; returns the processes to stop."""
+    mock_url = f"http://127.0.0.1:{args.mock_port}"
+    mock = subprocess.Popen([
+        sys.executable, "-m", "tools.mock_llm", "--port", str(args.mock_port),
+        "--latency-ms", str(args.mock_latency_ms), "--error-rate", str(args.mock_error_rate),
+    ])
+    env = dict(
+        os.environ,
+        LLM_BASE_URL=f"{mock_url}/v1",
+        GROK_API_KEY=os.getenv("GROK_API_KEY", "mock"),
+        LLM_STREAM="1" if args.stream else "0",
+        RATE_LIMIT_ENABLED="0",
+    )
+    api = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+        "--workers", str(args.workers), "--log-level", "warning",
+    ], env=env)
+    _wait_ready(f"{mock_url}/docs")
+    _wait_ready(f"http://127.0.0.1:{args.port}/health/llm")
+    return [api, mock]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test over the API routes")
+    parser.add_argument("--base-url", default=None, help="running API (default: spawned one)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds")
+    parser.add_argument("--requests", type=int, default=0, help="stop after N requests (0: duration only)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--spawn", action="store_true", help="start mock LLM + app locally")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--stream", action="store_true", help="app requests streamed completions")
+    parser.add_argument("--mock-port", type=int, default=8089)
+    parser.add_argument("--mock-latency-ms", type=float, default=500.0)
+    parser.add_argument("--mock-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    procs = spawn(args) if args.spawn else []
+    base_url = (args.base_url or f"http://127.0.0.1:{args.port}").rstrip("/")
+    try:
+        recorder = run(base_url, scenarios, args.concurrency, args.duration, args.requests, args.timeout)
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait()
+
+    print(f"{args.concurrency} clients, {recorder.elapsed:.1f}s against {base_url}\n")
+    report(recorder)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Local LLM Stand-in
+
+An OpenAI-compatible /v1/chat/completions server for offline load tests.
+It recognises the app's prompts and answers in the shape llm_client
+expects: question JSON, (batch) evaluation JSON, or intro text.
+
+Tunables:
+- latency: fixed, uniform (0..2x median) or lognormal around --latency-ms
+- --error-rate / --error-status: fail a fraction of calls
+- --hang-rate / --hang-seconds: never answer within the client timeout
+- streaming: honoured when the request sets "stream": true; chunk size and
+  inter-chunk delay are configurable
+
+Usage (from backend/):
+    python -m tools.mock_llm --port 8089 --latency-ms 800 --error-rate 0.02
+    LLM_BASE_URL=http://127.0.0.1:8089/v1 uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+_COUNT_RE = re.compile(r"Generate (\d+) multiple-choice")
+_TOPIC_RE = re.compile(r"aptitude questions for topic: (.+)")
+_ITEM_RE = re.compile(r"\[Item (\d+)\]")
+_NAME_RE = re.compile(r"^Name: (.+)$", re.MULTILINE)
+_LEVELS = ["Easy", "Medium", "Advanced", "Expert"]
+
+
+class Settings:
+    latency_ms = 500.0
+    latency_dist = "lognormal"
+    sigma = 0.5
+    error_rate = 0.0
+    error_status = 503
+    hang_rate = 0.0
+    hang_seconds = 60.0
+    chunk_chars = 24
+    chunk_ms = 20.0
+
+
+settings = Settings()
+app = FastAPI(title="Mock LLM")
+
+
+def _latency() -> float:
+    median = settings.latency_ms / 1000.0
+    if settings.latency_dist == "fixed":
+        return median
+    if settings.latency_dist == "uniform":
+        return random.uniform(0, 2 * median)
+    return median * math.exp(random.gauss(0, settings.sigma))
+
+
+def _evaluation() -> dict:
+    return {
+        "score": random.randint(4, 9),
+        "technical_accuracy": random.choice(["High", "Medium", "Low"]),
+        "completeness": random.choice(["Comprehensive", "Partial", "Minimal"]),
+        "clarity": random.choice(["Excellent", "Good", "Fair"]),
+        "key_strengths": ["Clear structure"],
+        "areas_for_improvement": ["Cover edge cases"],
+        "detailed_feedback": "Mock evaluation.",
+        "suggested_improvement": "Add a concrete example."
+    }
+
+
+def _reply(prompt: str) -> str:
+    if "multiple-choice aptitude questions" in prompt:
+        count = int((_COUNT_RE.search(prompt) or [0, 5])[1])
+        match = _TOPIC_RE.search(prompt)
+        topic = match.group(1).strip() if match else "General"
+        return json.dumps({"questions": [
+            {
+                "topic": topic,
+                "difficulty": _LEVELS[i % len(_LEVELS)],
+                "question": f"Mock question {i} on {topic} ({random.random():.6f})?",
+                "options": ["A", "B", "C", "D"],
+                "correct_index": random.randint(0, 3),
+                "explanation": "Mock explanation."
+            }
+            for i in range(count)
+        ]})
+    if "[Item " in prompt:
+        return json.dumps({"evaluations": [
+            {"id": int(i), **_evaluation()} for i in _ITEM_RE.findall(prompt)
+        ]})
+    if "Critically evaluate this technical answer" in prompt:
+        return json.dumps(_evaluation())
+    match = _NAME_RE.search(prompt)
+    return (
+        f"Good morning, I am {match.group(1).strip() if match else 'the candidate'}. This is a mock "
+        "self-introduction covering my core competencies, key achievements and the value I bring."
+    )
+
+
+async def _stream(content: str, model: str):
+    created = int(time.time())
+    for start in range(0, len(content), settings.chunk_chars):
+        chunk = {
+            "id": "mock", "object": "chat.completion.chunk", "created": created, "model": model,
+            "choices": [{"index": 0, "delta": {"content": content[start:start + settings.chunk_chars]}}]
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+        await asyncio.sleep(settings.chunk_ms / 1000.0)
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    prompt = body["messages"][-1]["content"]
+    model = body.get("model", "mock")
+
+    roll = random.random()
+    if roll < settings.hang_rate:
+        await asyncio.sleep(settings.hang_seconds)
+    await asyncio.sleep(_latency())
+    if roll >= 1 - settings.error_rate:
+        return JSONResponse({"error": {"message": "mock failure"}}, status_code=settings.error_status)
+
+    content = _reply(prompt)
+    if body.get("stream"):
+        return StreamingResponse(_stream(content, model), media_type="text/event-stream")
+
+    return {
+        "id": "mock",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible LLM stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=settings.latency_ms, help="median latency")
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "lognormal"], default=settings.latency_dist)
+    parser.add_argument("--sigma", type=float, default=settings.sigma, help="lognormal spread")
+    parser.add_argument("--error-rate", type=float, default=settings.error_rate)
+    parser.add_argument("--error-status", type=int, default=settings.error_status)
+    parser.add_argument("--hang-rate", type=float, default=settings.hang_rate)
+    parser.add_argument("--hang-seconds", type=float, default=settings.hang_seconds)
+    parser.add_argument("--chunk-chars", type=int, default=settings.chunk_chars)
+    parser.add_argument("--chunk-ms", type=float, default=settings.chunk_ms)
+    args = parser.parse_args()
+
+    for name in vars(Settings):
+        if not name.startswith("_"):
+            setattr(settings, name, getattr(args, name))
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
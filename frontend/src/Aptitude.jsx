@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from "react";
-import { postForm } from "./api";
+import { postForm, postJson } from "./api";
 import "./Aptitude.css";
 
 const TOPICS = [
@@ -70,7 +70,7 @@ export default function Aptitude() {
     }));
   };
 
-  const handleSubmitAnswers = (e) => {
+  const handleSubmitAnswers = async (e) => {
     e.preventDefault();
     
     if (!questions || !questions.questions) {
@@ -78,33 +78,30 @@ export default function Aptitude() {
       return;
     }
 
-    // Calculate actual score based on correct answers
-    let correctCount = 0;
+    // Answer keys stay on the server: grade there and show its verdicts
     const questionsArray = formatQuestionsData(questions);
-    
-    questionsArray.forEach((question, index) => {
-      const userAnswer = userAnswers[index];
-      const correctAnswer = question.correct_answer || question.answer;
-      const correctIndex = question.correct_index;
-      
-      // Check if answer is correct (handle both string and index-based answers)
-      if (correctIndex !== undefined) {
-        // Index-based checking
-        const options = question.options || [];
-        if (userAnswer === options[correctIndex]) {
-          correctCount++;
-        }
-      } else if (correctAnswer && userAnswer === correctAnswer) {
-        // String-based checking
-        correctCount++;
-      }
-    });
-    
-    const totalQuestions = questionsArray.length;
-    const calculatedScore = totalQuestions > 0 ? Math.round((correctCount / totalQuestions) * 100) : 0;
-    
-    setSubmitted(true);
-    setScore(calculatedScore);
+    const answers = questionsArray.map((question, index) => ({
+      question_id: question.id,
+      selected_index: (question.options || []).indexOf(userAnswers[index])
+    }));
+
+    try {
+      const graded = await postJson("/aptitude/submit", { answers });
+      const results = graded.results || [];
+      setQuestions({
+        ...questions,
+        questions: questionsArray.map((question, index) => ({
+          ...question,
+          correct_index: results[index] ? results[index].correct_index : undefined,
+          explanation: results[index] ? results[index].explanation : undefined
+        }))
+      });
+      setSubmitted(true);
+      setScore(Math.round(graded.score || 0));
+    } catch (error) {
+      console.error("Error grading answers:", error);
+      alert(`Failed to grade answers: ${error.message}`);
+    }
   };
 
   const handleReset = () => {
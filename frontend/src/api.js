@@ -1,15 +1,25 @@
 const API_BASE = "http://localhost:8000";
 
+function authHeaders() {
+  const token = localStorage.getItem("token");
+  return token ? { Authorization: `Bearer ${token}` } : {};
+}
+
 export async function postForm(path, form) {
-  const res = await fetch(`${API_BASE}${path}`, { method: "POST", body: form });
+  const res = await fetch(`${API_BASE}${path}`, { method: "POST", headers: authHeaders(), body: form });
   return res.json();
 }
 
 export async function postJson(path, data) {
   const res = await fetch(`${API_BASE}${path}`, {
     method: "POST",
-    headers: {"Content-Type": "application/json"},
+    headers: {"Content-Type": "application/json", ...authHeaders()},
     body: JSON.stringify(data)
   });
-  return res.json();
+  const body = await res.json().catch(() => ({}));
+  if (!res.ok) {
+    const detail = typeof body.detail === "string" ? body.detail : `Request failed (${res.status})`;
+    throw new Error(detail);
+  }
+  return body;
 }